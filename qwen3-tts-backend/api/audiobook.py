@@ -4,12 +4,13 @@ import logging
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, status
 from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from api.auth import get_current_user
 from core.database import get_db
+from core.task_queue import register_task_handler
 from db import crud
 from db.models import User, AudiobookSegment
 from schemas.audiobook import (
@@ -28,6 +29,62 @@ from core.config import settings
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/audiobook", tags=["audiobook"])
 
+LOG_KEEPALIVE_SECONDS = 15.0
+LOG_BATCH_SECONDS = 0.05
+
+
+async def _run_project_task(service_func, project_id: int, user_id: int, **kwargs):
+    from core.database import SessionLocal
+
+    async_db = SessionLocal()
+    try:
+        db_user = crud.get_user_by_id(async_db, user_id)
+        await service_func(project_id, db_user, async_db, **kwargs)
+    finally:
+        async_db.close()
+
+
+async def run_analysis_task(project_id: int, user_id: int, turbo: bool = False):
+    from core.audiobook_service import analyze_project
+    await _run_project_task(analyze_project, project_id, user_id, turbo=turbo)
+
+
+async def run_parse_chapter_task(project_id: int, user_id: int, chapter_id: int):
+    from core.audiobook_service import parse_one_chapter
+
+    async def parse(project_id, user, db):
+        await parse_one_chapter(project_id, chapter_id, user, db)
+
+    await _run_project_task(parse, project_id, user_id)
+
+
+async def run_parse_all_task(project_id: int, user_id: int, statuses: list):
+    from core.audiobook_service import parse_all_chapters
+    await _run_project_task(parse_all_chapters, project_id, user_id, statuses=tuple(statuses))
+
+
+async def run_process_all_task(project_id: int, user_id: int):
+    from core.audiobook_service import process_all
+    await _run_project_task(process_all, project_id, user_id)
+
+
+async def run_generation_task(project_id: int, user_id: int, chapter_index: Optional[int] = None):
+    from core.audiobook_service import generate_project
+    await _run_project_task(generate_project, project_id, user_id, chapter_index=chapter_index)
+
+
+register_task_handler("audiobook.analyze", run_analysis_task)
+register_task_handler("audiobook.parse_chapter", run_parse_chapter_task)
+register_task_handler("audiobook.parse_all", run_parse_all_task)
+register_task_handler("audiobook.process_all", run_process_all_task)
+register_task_handler("audiobook.generate", run_generation_task)
+
+
+async def _enqueue(task_type: str, **payload):
+    from core.task_queue import TaskQueue
+    task_queue = await TaskQueue.get_instance()
+    await task_queue.enqueue(task_type, payload)
+
 
 def _project_to_response(project) -> AudiobookProjectResponse:
     return AudiobookProjectResponse(
@@ -176,20 +233,9 @@ async def analyze_project(
     if not current_user.llm_api_key or not current_user.llm_base_url or not current_user.llm_model:
         raise HTTPException(status_code=400, detail="LLM config not set. Please configure LLM API key first.")
 
-    from core.audiobook_service import analyze_project as _analyze
-    from core.database import SessionLocal
-
     turbo = data.turbo
 
-    async def run_analysis():
-        async_db = SessionLocal()
-        try:
-            db_user = crud.get_user_by_id(async_db, current_user.id)
-            await _analyze(project_id, db_user, async_db, turbo=turbo)
-        finally:
-            async_db.close()
-
-    asyncio.create_task(run_analysis())
+    await _enqueue("audiobook.analyze", project_id=project_id, user_id=current_user.id, turbo=turbo)
     return {"message": "Analysis started", "project_id": project_id, "turbo": turbo}
 
 
@@ -294,18 +340,7 @@ async def parse_chapter(
     if not current_user.llm_api_key or not current_user.llm_base_url or not current_user.llm_model:
         raise HTTPException(status_code=400, detail="LLM config not set")
 
-    from core.audiobook_service import parse_one_chapter
-    from core.database import SessionLocal
-
-    async def run():
-        async_db = SessionLocal()
-        try:
-            db_user = crud.get_user_by_id(async_db, current_user.id)
-            await parse_one_chapter(project_id, chapter_id, db_user, async_db)
-        finally:
-            async_db.close()
-
-    asyncio.create_task(run())
+    await _enqueue("audiobook.parse_chapter", project_id=project_id, user_id=current_user.id, chapter_id=chapter_id)
     return {"message": "Parsing started", "chapter_id": chapter_id}
 
 
@@ -325,20 +360,9 @@ async def parse_all_chapters_endpoint(
     if not current_user.llm_api_key or not current_user.llm_base_url or not current_user.llm_model:
         raise HTTPException(status_code=400, detail="LLM config not set")
 
-    from core.audiobook_service import parse_all_chapters
-    from core.database import SessionLocal
-
-    statuses = ("error",) if only_errors else ("pending", "error")
-
-    async def run():
-        async_db = SessionLocal()
-        try:
-            db_user = crud.get_user_by_id(async_db, current_user.id)
-            await parse_all_chapters(project_id, db_user, async_db, statuses=statuses)
-        finally:
-            async_db.close()
+    statuses = ["error"] if only_errors else ["pending", "error"]
 
-    asyncio.create_task(run())
+    await _enqueue("audiobook.parse_all", project_id=project_id, user_id=current_user.id, statuses=statuses)
     return {"message": "Batch parsing started", "project_id": project_id, "only_errors": only_errors}
 
 
@@ -357,18 +381,7 @@ async def process_all_endpoint(
     if not current_user.llm_api_key or not current_user.llm_base_url or not current_user.llm_model:
         raise HTTPException(status_code=400, detail="LLM config not set")
 
-    from core.audiobook_service import process_all
-    from core.database import SessionLocal
-
-    async def run():
-        async_db = SessionLocal()
-        try:
-            db_user = crud.get_user_by_id(async_db, current_user.id)
-            await process_all(project_id, db_user, async_db)
-        finally:
-            async_db.close()
-
-    asyncio.create_task(run())
+    await _enqueue("audiobook.process_all", project_id=project_id, user_id=current_user.id)
     return {"message": "Full processing started", "project_id": project_id}
 
 
@@ -449,20 +462,9 @@ async def generate_project(
     if project.status not in ("ready", "generating", "done", "error"):
         raise HTTPException(status_code=400, detail=f"Project must be in 'ready' state, current: {project.status}")
 
-    from core.audiobook_service import generate_project as _generate
-    from core.database import SessionLocal
-
     chapter_index = data.chapter_index
 
-    async def run_generation():
-        async_db = SessionLocal()
-        try:
-            db_user = crud.get_user_by_id(async_db, current_user.id)
-            await _generate(project_id, db_user, async_db, chapter_index=chapter_index)
-        finally:
-            async_db.close()
-
-    asyncio.create_task(run_generation())
+    await _enqueue("audiobook.generate", project_id=project_id, user_id=current_user.id, chapter_index=chapter_index)
     msg = f"Generation started for chapter {chapter_index}" if chapter_index is not None else "Generation started"
     return {"message": msg, "project_id": project_id, "chapter_index": chapter_index}
 
@@ -471,6 +473,7 @@ async def generate_project(
 async def stream_project_logs(
     project_id: int,
     chapter_id: Optional[int] = None,
+    since: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
 ):
     from core import progress_store as ps
@@ -478,29 +481,24 @@ async def stream_project_logs(
     log_key = f"ch_{chapter_id}" if chapter_id is not None else str(project_id)
 
     async def generator():
-        sent_complete = -1
-        last_streaming = ""
+        seq = since
         while True:
-            state = ps.get_snapshot(log_key)
-            lines = state["lines"]
-            n = len(lines)
-
-            for i in range(sent_complete + 1, max(0, n - 1)):
-                yield f"data: {json.dumps({'index': i, 'line': lines[i]})}\n\n"
-                sent_complete = i
-
-            if n > 0:
-                cur = lines[n - 1]
-                if cur != last_streaming or (sent_complete < n - 1):
-                    yield f"data: {json.dumps({'index': n - 1, 'line': cur})}\n\n"
-                    last_streaming = cur
-                    sent_complete = max(sent_complete, n - 2)
-
-            if state["done"]:
-                yield f"data: {json.dumps({'done': True})}\n\n"
+            # Sleeps until the log changes; the timeout only paces keepalives
+            delta = await ps.wait(log_key, since=seq, timeout=LOG_KEEPALIVE_SECONDS)
+            if delta["seq"] == seq and not delta["done"]:
+                yield ": keepalive\n\n"
+                continue
+
+            seq = delta["seq"]
+            for index, line in delta["lines"]:
+                yield f"data: {json.dumps({'index': index, 'line': line, 'seq': seq})}\n\n"
+
+            if delta["done"]:
+                yield f"data: {json.dumps({'done': True, 'seq': seq})}\n\n"
                 break
 
-            await asyncio.sleep(0.05)
+            # Let streamed tokens accumulate instead of resending the growing line for each one
+            await asyncio.sleep(LOG_BATCH_SECONDS)
 
     return StreamingResponse(
         generator(),
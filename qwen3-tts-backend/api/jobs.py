@@ -1,14 +1,19 @@
+import asyncio
+import json
 import logging
 from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from core.database import get_db
 from core.config import settings
+from core.admission import AdmissionController
+from core.cancellation import cancel, job_key
+from core.job_events import JobEventBroker, publish_job_deleted, serialize_job
 from core.security import decode_access_token
 from db.models import Job, JobStatus, User
 from db.crud import get_user_by_username
@@ -53,6 +58,35 @@ async def get_user_from_bearer_token(
     return user
 
 
+@router.get("/events")
+async def stream_job_events(
+    current_user: User = Depends(get_current_user),
+):
+    broker = await JobEventBroker.get_instance()
+    user_id = current_user.id
+    queue = broker.subscribe(user_id)
+
+    async def generator():
+        try:
+            yield f"data: {json.dumps({'type': 'ready'})}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.JOB_EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment lines keep proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{job_id}")
 @limiter.limit("30/minute")
 async def get_job(
@@ -69,23 +103,8 @@ async def get_job(
     if job.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    download_url = None
-    if job.status == JobStatus.COMPLETED and job.output_path:
-        output_file = Path(job.output_path)
-        if output_file.exists():
-            download_url = f"/jobs/{job.id}/download"
-
-    return {
-        "id": job.id,
-        "job_type": job.job_type,
-        "status": job.status,
-        "input_params": job.input_params,
-        "download_url": download_url,
-        "error_message": job.error_message,
-        "created_at": job.created_at.isoformat() + 'Z' if job.created_at else None,
-        "started_at": job.started_at.isoformat() + 'Z' if job.started_at else None,
-        "completed_at": job.completed_at.isoformat() + 'Z' if job.completed_at else None
-    }
+    admission = await AdmissionController.get_instance()
+    return serialize_job(job, admission.estimate_eta(db, job))
 
 
 @router.get("")
@@ -110,24 +129,9 @@ async def list_jobs(
     total = query.count()
     jobs = query.order_by(Job.created_at.desc()).offset(skip).limit(limit).all()
 
-    jobs_data = []
-    for job in jobs:
-        download_url = None
-        if job.status == JobStatus.COMPLETED and job.output_path:
-            output_file = Path(job.output_path)
-            if output_file.exists():
-                download_url = f"/jobs/{job.id}/download"
-
-        jobs_data.append({
-            "id": job.id,
-            "job_type": job.job_type,
-            "status": job.status,
-            "input_params": job.input_params,
-            "download_url": download_url,
-            "error_message": job.error_message,
-            "created_at": job.created_at.isoformat() + 'Z' if job.created_at else None,
-            "completed_at": job.completed_at.isoformat() + 'Z' if job.completed_at else None
-        })
+    admission = await AdmissionController.get_instance()
+    etas = admission.estimate_etas(db, jobs)
+    jobs_data = [serialize_job(job, etas[job.id]) for job in jobs]
 
     return {
         "total": total,
@@ -169,8 +173,13 @@ async def delete_job(
             except Exception as e:
                 logger.error(f"Failed to delete output file {output_file}: {e}")
 
+    running = job.status in (JobStatus.PENDING, JobStatus.PROCESSING)
     db.delete(job)
     db.commit()
+    if running:
+        # Stops the generation at its next decoding step, wherever it runs
+        cancel(job_key(job_id))
+    await publish_job_deleted(current_user.id, job_id)
 
     return {"message": "Job deleted successfully"}
 
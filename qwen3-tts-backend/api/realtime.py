@@ -0,0 +1,127 @@
+import asyncio
+import json
+import logging
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from core.cache_manager import VoiceCacheManager
+from core.database import SessionLocal
+from core.realtime_tts import RealtimeSession
+from core.security import decode_access_token
+from utils.metrics import cache_metrics
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/realtime", tags=["realtime"])
+
+AUTH_TIMEOUT_SECONDS = 10
+
+
+def _authenticate(token: str):
+    from db.crud import get_user_by_username, can_user_use_local_model
+
+    username = decode_access_token(token) if token else None
+    if username is None:
+        return None, "Invalid or expired token"
+
+    db = SessionLocal()
+    try:
+        user = get_user_by_username(db, username=username)
+    finally:
+        db.close()
+
+    if user is None or not user.is_active:
+        return None, "Invalid or expired token"
+    if not can_user_use_local_model(user):
+        return None, "Local model is not available. Please contact administrator."
+    return user, None
+
+
+async def _receive_authentication(websocket: WebSocket):
+    try:
+        message = await asyncio.wait_for(websocket.receive_text(), timeout=AUTH_TIMEOUT_SECONDS)
+        event = json.loads(message)
+    except asyncio.TimeoutError:
+        return None, "Authentication timed out"
+    except ValueError:
+        return None, "Invalid authentication event"
+
+    if not isinstance(event, dict) or event.get("type") != "session.authenticate":
+        return None, "The first event must be session.authenticate"
+    token = event.get("token")
+    return _authenticate(token if isinstance(token, str) else "")
+
+
+@router.websocket("/tts")
+async def realtime_tts(websocket: WebSocket):
+    # Browsers cannot set headers on WebSocket requests, and a token in the URL ends up in access logs, so the
+    # client authenticates with a session.authenticate event as its first message
+    await websocket.accept()
+    user, error = await _receive_authentication(websocket)
+    if user is None:
+        await websocket.send_json({"type": "error", "error": {"code": "unauthorized", "message": error}})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=error)
+        return
+
+    from core.tts_service import TTSServiceFactory
+
+    backend = await TTSServiceFactory.get_backend("local")
+    user_id = user.id
+
+    async def resolve_voice(voice_design_id: int):
+        from db.crud import get_voice_design
+
+        db = SessionLocal()
+        try:
+            design = get_voice_design(db, voice_design_id, user_id)
+            if not design:
+                raise ValueError("Voice design not found")
+            if design.backend_type != "local" or not design.voice_cache_id:
+                raise ValueError(
+                    "Voice design has no prepared clone prompt. Please call /voice-designs/{id}/prepare-clone first"
+                )
+
+            cache_manager = await VoiceCacheManager.get_instance()
+            cached = await cache_manager.get_cache_by_id(design.voice_cache_id, db)
+            if not cached:
+                raise ValueError(f"Cache {design.voice_cache_id} not found")
+            cache_metrics.record_hit(user_id)
+            return cached['data']
+        finally:
+            db.close()
+
+    session = RealtimeSession(backend, websocket.send_json, user_id=user_id, resolve_voice=resolve_voice)
+
+    async def receive():
+        while True:
+            message = await websocket.receive_text()
+            try:
+                event = json.loads(message)
+                if not isinstance(event, dict):
+                    raise ValueError("Event must be a JSON object")
+            except ValueError as e:
+                await websocket.send_json({"type": "error", "error": {"code": "invalid_json", "message": str(e)}})
+                continue
+            await session.handle(event)
+
+    receiver = None
+    finished = False
+    try:
+        await session.start()
+        receiver = asyncio.create_task(receive())
+        await asyncio.wait({receiver, session.done}, return_when=asyncio.FIRST_COMPLETED)
+        if receiver.done():
+            receiver.result()
+        finished = session.done.done() and session.done.exception() is None
+    except WebSocketDisconnect:
+        logger.info(f"Realtime session {session.id} disconnected")
+    except Exception as e:
+        logger.error(f"Realtime session {session.id} failed: {e}", exc_info=True)
+    finally:
+        if receiver is not None and not receiver.done():
+            receiver.cancel()
+            await asyncio.gather(receiver, return_exceptions=True)
+        await session.close()
+
+    if finished:
+        # session.finish drained every sentence; close normally
+        await websocket.close()
@@ -1,8 +1,12 @@
+import asyncio
 import logging
 import tempfile
+import time
+from contextlib import aclosing
 from datetime import datetime
 from pathlib import Path
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File, Form, Request, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 from slowapi import Limiter
@@ -10,10 +14,15 @@ from slowapi.util import get_remote_address
 
 from core.config import settings
 from core.database import get_db
-from core.model_manager import ModelManager
 from core.cache_manager import VoiceCacheManager
+from core.audio_cache import save_audio
+from core.batch_processor import TTSBatchProcessor
+from core.task_queue import NonRetryableError, register_task_handler
+from core.cancellation import GenerationCancelled, job_key
+from core.job_events import publish_job_deleted, publish_job_update
+from core.singleflight import get_singleflight
 from db.models import Job, JobStatus, User
-from schemas.tts import CustomVoiceRequest, VoiceDesignRequest
+from schemas.tts import CustomVoiceRequest, VoiceDesignRequest, VoiceCloneStreamRequest
 from api.auth import get_current_user
 from utils.validation import (
     validate_language,
@@ -23,7 +32,14 @@ from utils.validation import (
     get_supported_languages,
     get_supported_speakers
 )
-from utils.audio import save_audio_file, validate_ref_audio, process_ref_audio, extract_audio_features
+from utils.audio import (
+    save_audio_file,
+    validate_ref_audio,
+    process_ref_audio,
+    extract_audio_features,
+    streaming_wav_header,
+    write_pcm_wav
+)
 from utils.metrics import cache_metrics
 
 logger = logging.getLogger(__name__)
@@ -46,6 +62,77 @@ async def read_upload_with_size_limit(upload_file: UploadFile, max_size_bytes: i
     return b"".join(chunks)
 
 
+async def dispatch_job(
+    backend_type: str,
+    model_name: str,
+    job_id: int,
+    task_type: str,
+    payload: dict
+):
+    from core.task_queue import TaskQueue
+    task_queue = await TaskQueue.get_instance()
+    await task_queue.enqueue(
+        task_type,
+        payload,
+        model_name=model_name if backend_type == "local" else None,
+        job_id=job_id
+    )
+
+
+async def admit_job(db: Session, backend_type: str, model_name: str, text: str) -> Optional[float]:
+    if backend_type != "local":
+        return None
+
+    from core.admission import AdmissionController, QueueFullError
+    admission = await AdmissionController.get_instance()
+    try:
+        return admission.admit(db, model_name, text)
+    except QueueFullError as e:
+        logger.warning(f"Rejected {model_name} job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+async def record_job_throughput(backend_type: str, model_name: str, request_data: dict, job: Job):
+    if backend_type != "local":
+        return
+
+    from core.admission import AdmissionController
+    admission = await AdmissionController.get_instance()
+    admission.record_completion(model_name, request_data.get("text", ""), job.started_at, job.completed_at)
+
+
+def _remove_ref_audio(ref_audio_path: Optional[str], use_voice_design: bool):
+    if not use_voice_design and ref_audio_path and Path(ref_audio_path).exists():
+        Path(ref_audio_path).unlink()
+
+
+async def handle_job_failure(payload: dict, error: str, will_retry: bool):
+    from core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(Job.id == payload["job_id"]).first()
+        if job:
+            if will_retry:
+                job.status = JobStatus.PENDING
+                job.error_message = "Job processing failed, retrying"
+            else:
+                job.status = JobStatus.FAILED
+                job.error_message = "Job processing failed"
+                job.completed_at = datetime.utcnow()
+            db.commit()
+            await publish_job_update(db, job)
+    finally:
+        db.close()
+
+    if not will_retry:
+        _remove_ref_audio(payload.get("ref_audio_path"), payload.get("use_voice_design", False))
+
+
 async def process_custom_voice_job(
     job_id: int,
     user_id: int,
@@ -67,8 +154,10 @@ async def process_custom_voice_job(
         job.status = JobStatus.PROCESSING
         job.started_at = datetime.utcnow()
         db.commit()
+        await publish_job_update(db, job)
 
         logger.info(f"Processing custom-voice job {job_id} with backend {backend_type}")
+        request_data["cancel_key"] = job_key(job_id)
 
         user_api_key = None
         if backend_type == "aliyun":
@@ -84,25 +173,17 @@ async def process_custom_voice_job(
         filename = f"{user_id}_{job_id}_{timestamp}.wav"
         output_path = Path(settings.OUTPUT_DIR) / filename
 
-        with open(output_path, 'wb') as f:
-            f.write(audio_bytes)
+        save_audio(audio_bytes, output_path)
 
         job.status = JobStatus.COMPLETED
         job.output_path = str(output_path)
         job.completed_at = datetime.utcnow()
         db.commit()
+        await publish_job_update(db, job)
+        await record_job_throughput(backend_type, "custom-voice", request_data, job)
 
         logger.info(f"Job {job_id} completed successfully")
 
-    except Exception as e:
-        logger.error(f"Job {job_id} failed: {e}", exc_info=True)
-        job = db.query(Job).filter(Job.id == job_id).first()
-        if job:
-            job.status = JobStatus.FAILED
-            job.error_message = "Job processing failed"
-            job.completed_at = datetime.utcnow()
-            db.commit()
-
     finally:
         db.close()
 
@@ -129,8 +210,10 @@ async def process_voice_design_job(
         job.status = JobStatus.PROCESSING
         job.started_at = datetime.utcnow()
         db.commit()
+        await publish_job_update(db, job)
 
         logger.info(f"Processing voice-design job {job_id} with backend {backend_type}")
+        request_data["cancel_key"] = job_key(job_id)
 
         user_api_key = None
         if backend_type == "aliyun":
@@ -149,25 +232,17 @@ async def process_voice_design_job(
         filename = f"{user_id}_{job_id}_{timestamp}.wav"
         output_path = Path(settings.OUTPUT_DIR) / filename
 
-        with open(output_path, 'wb') as f:
-            f.write(audio_bytes)
+        save_audio(audio_bytes, output_path)
 
         job.status = JobStatus.COMPLETED
         job.output_path = str(output_path)
         job.completed_at = datetime.utcnow()
         db.commit()
+        await publish_job_update(db, job)
+        await record_job_throughput(backend_type, "voice-design", request_data, job)
 
         logger.info(f"Job {job_id} completed successfully")
 
-    except Exception as e:
-        logger.error(f"Job {job_id} failed: {e}", exc_info=True)
-        job = db.query(Job).filter(Job.id == job_id).first()
-        if job:
-            job.status = JobStatus.FAILED
-            job.error_message = "Job processing failed"
-            job.completed_at = datetime.utcnow()
-            db.commit()
-
     finally:
         db.close()
 
@@ -190,13 +265,16 @@ async def process_voice_clone_job(
         job = db.query(Job).filter(Job.id == job_id).first()
         if not job:
             logger.error(f"Job {job_id} not found")
+            _remove_ref_audio(ref_audio_path, use_voice_design)
             return
 
         job.status = JobStatus.PROCESSING
         job.started_at = datetime.utcnow()
         db.commit()
+        await publish_job_update(db, job)
 
         logger.info(f"Processing voice-clone job {job_id} with backend {backend_type}")
+        request_data["cancel_key"] = job_key(job_id)
 
         from core.security import decrypt_api_key
         user_api_key = None
@@ -215,11 +293,11 @@ async def process_voice_clone_job(
             from db.crud import get_voice_design
             design = get_voice_design(db, voice_design_id, user_id)
             if not design or not design.voice_cache_id:
-                raise RuntimeError(f"Voice design {voice_design_id} has no prepared clone prompt")
+                raise NonRetryableError(f"Voice design {voice_design_id} has no prepared clone prompt")
 
             cached = await cache_manager.get_cache_by_id(design.voice_cache_id, db)
             if not cached:
-                raise RuntimeError(f"Cache {design.voice_cache_id} not found")
+                raise NonRetryableError(f"Cache {design.voice_cache_id} not found")
 
             ref_audio_hash = f"voice_design_{voice_design_id}"
             cache_metrics.record_hit(user_id)
@@ -249,39 +327,50 @@ async def process_voice_clone_job(
             if x_vector is None:
                 cache_metrics.record_miss(user_id)
                 logger.info(f"Cache miss for job {job_id}, creating voice clone prompt")
-                ref_audio_array, ref_sr = process_ref_audio(ref_audio_data)
 
-                model_manager = await ModelManager.get_instance()
-                await model_manager.load_model("base")
-                _, tts = await model_manager.get_current_model()
+                # Shared by every job waiting on the same key, so it uses its own session and knows no job
+                async def create_cached_prompt(_):
+                    ref_audio_array, ref_sr = process_ref_audio(ref_audio_data)
 
-                if tts is None:
-                    raise RuntimeError("Failed to load base model")
+                    local_backend = await TTSServiceFactory.get_backend("local")
+                    prompt = await local_backend.create_voice_clone_prompt(
+                        ref_audio_data,
+                        ref_text=request_data.get('ref_text', ''),
+                        x_vector_only_mode=True
+                    )
 
-                x_vector = tts.create_voice_clone_prompt(
-                    ref_audio=(ref_audio_array, ref_sr),
-                    ref_text=request_data.get('ref_text', ''),
-                    x_vector_only_mode=True
+                    prompt_cache_id = None
+                    if request_data.get('use_cache', True):
+                        features = extract_audio_features(ref_audio_array, ref_sr)
+                        metadata = {
+                            'duration': features['duration'],
+                            'sample_rate': features['sample_rate'],
+                            'ref_text': request_data.get('ref_text', ''),
+                            'x_vector_only_mode': True
+                        }
+                        cache_db = SessionLocal()
+                        try:
+                            prompt_cache_id = await cache_manager.set_cache(
+                                user_id, ref_audio_hash, prompt, metadata, cache_db
+                            )
+                        finally:
+                            cache_db.close()
+                    return prompt, prompt_cache_id
+
+                # Concurrent jobs with the same reference audio create and store the prompt once
+                x_vector, cache_id = await get_singleflight("clone_cache").do(
+                    (user_id, ref_audio_hash, request_data.get('use_cache', True)), create_cached_prompt
                 )
-
-                if request_data.get('use_cache', True):
-                    features = extract_audio_features(ref_audio_array, ref_sr)
-                    metadata = {
-                        'duration': features['duration'],
-                        'sample_rate': features['sample_rate'],
-                        'ref_text': request_data.get('ref_text', ''),
-                        'x_vector_only_mode': True
-                    }
-                    cache_id = await cache_manager.set_cache(
-                        user_id, ref_audio_hash, x_vector, metadata, db
-                    )
-                    logger.info(f"Created cache for job {job_id}, cache_id={cache_id}")
+                if cache_id is not None:
+                    logger.info(f"Job {job_id} uses clone prompt cache_id={cache_id}")
 
             job.status = JobStatus.COMPLETED
             job.output_path = f"x_vector_cached_{cache_id}"
             job.completed_at = datetime.utcnow()
             db.commit()
+            await publish_job_update(db, job)
             logger.info(f"Job {job_id} completed (x_vector_only_mode)")
+            _remove_ref_audio(ref_audio_path, use_voice_design)
             return
 
         backend = await TTSServiceFactory.get_backend(backend_type, user_api_key)
@@ -302,37 +391,33 @@ async def process_voice_clone_job(
         filename = f"{user_id}_{job_id}_{timestamp}.wav"
         output_path = Path(settings.OUTPUT_DIR) / filename
 
-        with open(output_path, 'wb') as f:
-            f.write(audio_bytes)
+        save_audio(audio_bytes, output_path)
 
         job.status = JobStatus.COMPLETED
         job.output_path = str(output_path)
         job.completed_at = datetime.utcnow()
         db.commit()
+        await publish_job_update(db, job)
+        await record_job_throughput(backend_type, "base", request_data, job)
 
         logger.info(f"Job {job_id} completed successfully")
 
-    except Exception as e:
-        logger.error(f"Job {job_id} failed: {e}", exc_info=True)
-        job = db.query(Job).filter(Job.id == job_id).first()
-        if job:
-            job.status = JobStatus.FAILED
-            job.error_message = "Job processing failed"
-            job.completed_at = datetime.utcnow()
-            db.commit()
-
     finally:
-        if not use_voice_design and ref_audio_path and Path(ref_audio_path).exists():
-            Path(ref_audio_path).unlink()
         db.close()
 
+    _remove_ref_audio(ref_audio_path, use_voice_design)
+
+
+register_task_handler("tts.custom_voice", process_custom_voice_job, on_failure=handle_job_failure)
+register_task_handler("tts.voice_design", process_voice_design_job, on_failure=handle_job_failure)
+register_task_handler("tts.voice_clone", process_voice_clone_job, on_failure=handle_job_failure)
+
 
 @router.post("/custom-voice")
 @limiter.limit("10/minute")
 async def create_custom_voice_job(
     request: Request,
     req_data: CustomVoiceRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -368,12 +453,15 @@ async def create_custom_voice_job(
             'temperature': req_data.temperature,
             'top_k': req_data.top_k,
             'top_p': req_data.top_p,
-            'repetition_penalty': req_data.repetition_penalty
+            'repetition_penalty': req_data.repetition_penalty,
+            'seed': req_data.seed
         })
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    eta_seconds = await admit_job(db, backend_type, "custom-voice", req_data.text)
+
     job = Job(
         user_id=current_user.id,
         job_type="custom-voice",
@@ -397,22 +485,30 @@ async def create_custom_voice_job(
         "language": language,
         "speaker": speaker,
         "instruct": req_data.instruct or "",
+        "user_id": current_user.id,
         **params
     }
 
-    background_tasks.add_task(
-        process_custom_voice_job,
-        job.id,
-        current_user.id,
-        request_data,
+    await dispatch_job(
         backend_type,
-        str(settings.DATABASE_URL)
+        "custom-voice",
+        job.id,
+        "tts.custom_voice",
+        {
+            "job_id": job.id,
+            "user_id": current_user.id,
+            "request_data": request_data,
+            "backend_type": backend_type,
+            "db_url": str(settings.DATABASE_URL)
+        }
     )
+    await publish_job_update(db, job)
 
     return {
         "job_id": job.id,
         "status": job.status,
-        "message": "Job created successfully"
+        "message": "Job created successfully",
+        "eta_seconds": eta_seconds
     }
 
 
@@ -421,7 +517,6 @@ async def create_custom_voice_job(
 async def create_voice_design_job(
     request: Request,
     req_data: VoiceDesignRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -478,12 +573,15 @@ async def create_voice_design_job(
             'temperature': req_data.temperature,
             'top_k': req_data.top_k,
             'top_p': req_data.top_p,
-            'repetition_penalty': req_data.repetition_penalty
+            'repetition_penalty': req_data.repetition_penalty,
+            'seed': req_data.seed
         })
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    eta_seconds = await admit_job(db, backend_type, "voice-design", req_data.text)
+
     job = Job(
         user_id=current_user.id,
         job_type="voice-design",
@@ -505,23 +603,31 @@ async def create_voice_design_job(
         "text": req_data.text,
         "language": language,
         "instruct": req_data.instruct,
+        "user_id": current_user.id,
         **params
     }
 
-    background_tasks.add_task(
-        process_voice_design_job,
-        job.id,
-        current_user.id,
-        request_data,
+    await dispatch_job(
         backend_type,
-        str(settings.DATABASE_URL),
-        saved_voice_id
+        "voice-design",
+        job.id,
+        "tts.voice_design",
+        {
+            "job_id": job.id,
+            "user_id": current_user.id,
+            "request_data": request_data,
+            "backend_type": backend_type,
+            "db_url": str(settings.DATABASE_URL),
+            "saved_voice_id": saved_voice_id
+        }
     )
+    await publish_job_update(db, job)
 
     return {
         "job_id": job.id,
         "status": job.status,
-        "message": "Job created successfully"
+        "message": "Job created successfully",
+        "eta_seconds": eta_seconds
     }
 
 
@@ -541,8 +647,8 @@ async def create_voice_clone_job(
     top_k: Optional[int] = Form(default=50),
     top_p: Optional[float] = Form(default=1.0),
     repetition_penalty: Optional[float] = Form(default=1.05),
+    seed: Optional[int] = Form(default=None),
     backend: Optional[str] = Form(default=None),
-    background_tasks: BackgroundTasks = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -581,7 +687,8 @@ async def create_voice_clone_job(
             'temperature': temperature,
             'top_k': top_k,
             'top_p': top_p,
-            'repetition_penalty': repetition_penalty
+            'repetition_penalty': repetition_penalty,
+            'seed': seed
         })
 
         cache_manager = await VoiceCacheManager.get_instance()
@@ -619,6 +726,8 @@ async def create_voice_clone_job(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    eta_seconds = await admit_job(db, backend_type, "base", text)
+
     job = Job(
         user_id=current_user.id,
         job_type="voice-clone",
@@ -644,7 +753,10 @@ async def create_voice_clone_job(
         design = get_voice_design(db, voice_design_id, current_user.id)
         tmp_audio_path = design.ref_audio_path
     else:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
+        # Kept outside the system temp dir so a queued job still finds it after a restart
+        upload_dir = Path(settings.OUTPUT_DIR) / "uploads"
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav', dir=upload_dir) as tmp_file:
             tmp_file.write(ref_audio_data)
             tmp_audio_path = tmp_file.name
 
@@ -655,19 +767,26 @@ async def create_voice_clone_job(
         "use_cache": use_cache,
         "x_vector_only_mode": x_vector_only_mode,
         "voice_design_id": voice_design_id,
+        "user_id": current_user.id,
         **params
     }
 
-    background_tasks.add_task(
-        process_voice_clone_job,
-        job.id,
-        current_user.id,
-        request_data,
-        tmp_audio_path,
+    await dispatch_job(
         backend_type,
-        str(settings.DATABASE_URL),
-        use_voice_design
+        "base",
+        job.id,
+        "tts.voice_clone",
+        {
+            "job_id": job.id,
+            "user_id": current_user.id,
+            "request_data": request_data,
+            "ref_audio_path": tmp_audio_path,
+            "backend_type": backend_type,
+            "db_url": str(settings.DATABASE_URL),
+            "use_voice_design": use_voice_design
+        }
     )
+    await publish_job_update(db, job)
 
     existing_cache = await cache_manager.get_cache(current_user.id, ref_audio_hash, db)
     cache_info = {"cache_id": existing_cache['cache_id']} if existing_cache else None
@@ -676,10 +795,268 @@ async def create_voice_clone_job(
         "job_id": job.id,
         "status": job.status,
         "message": "Job created successfully",
+        "eta_seconds": eta_seconds,
         "cache_info": cache_info
     }
 
 
+def _stream_job(
+    job_id: int,
+    backend,
+    mode: str,
+    request_data: dict,
+    audio_format: str,
+    voice_clone_prompt=None
+) -> StreamingResponse:
+    from core.database import SessionLocal
+
+    async def body():
+        db = SessionLocal()
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if job is None:
+            db.close()
+            logger.info(f"Job {job_id} was deleted before streaming started")
+            return
+
+        request_data["cancel_key"] = job_key(job_id)
+        pcm_chunks = []
+        sample_rate = None
+        try:
+            job.status = JobStatus.PROCESSING
+            job.started_at = datetime.utcnow()
+            db.commit()
+            await publish_job_update(db, job)
+
+            started = time.perf_counter()
+            chunks = backend.stream(mode, request_data, voice_clone_prompt=voice_clone_prompt)
+            async with aclosing(chunks):
+                async for pcm, chunk_rate in chunks:
+                    if sample_rate is None:
+                        sample_rate = chunk_rate
+                        logger.info(f"Job {job_id} streamed first audio after {time.perf_counter() - started:.3f}s")
+                        if audio_format == "wav":
+                            yield streaming_wav_header(sample_rate)
+                    pcm_chunks.append(pcm)
+                    yield pcm
+
+            # Keep the complete result for the job history, like queued jobs
+            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+            output_path = Path(settings.OUTPUT_DIR) / f"{job.user_id}_{job_id}_{timestamp}.wav"
+            pcm = await asyncio.to_thread(b"".join, pcm_chunks)
+            await asyncio.to_thread(write_pcm_wav, pcm, sample_rate or 24000, output_path)
+
+            job.status = JobStatus.COMPLETED
+            job.output_path = str(output_path)
+            job.completed_at = datetime.utcnow()
+            db.commit()
+            await publish_job_update(db, job)
+            await record_job_throughput("local", TTSBatchProcessor.VARIANTS[mode], request_data, job)
+            logger.info(f"Job {job_id} streamed in {time.perf_counter() - started:.3f}s")
+        except GenerationCancelled:
+            # The job was deleted mid-stream, there is nothing left to update
+            logger.info(f"Job {job_id} stream cancelled")
+        except (asyncio.CancelledError, GeneratorExit):
+            # The client disconnected; generation has stopped and there is no result to keep, which is not a
+            # failure of the job, so it is dropped from the history instead
+            logger.info(f"Job {job_id} stream abandoned by the client")
+            db.rollback()
+            user_id = job.user_id
+            if db.query(Job).filter(Job.id == job_id).delete():
+                db.commit()
+                await publish_job_deleted(user_id, job_id)
+            raise
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error_message = str(e) or "Streaming failed"
+            job.completed_at = datetime.utcnow()
+            db.commit()
+            await publish_job_update(db, job)
+            raise
+        finally:
+            db.close()
+
+    media_type = "audio/wav" if audio_format == "wav" else "audio/L16;rate=24000;channels=1"
+    return StreamingResponse(body(), media_type=media_type, headers={"X-Job-Id": str(job_id)})
+
+
+async def _get_streaming_backend(current_user: User):
+    from core.tts_service import TTSServiceFactory
+    from db.crud import can_user_use_local_model
+
+    if not can_user_use_local_model(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Local model is not available. Please contact administrator."
+        )
+    return await TTSServiceFactory.get_backend("local")
+
+
+async def _create_streaming_job(db: Session, current_user: User, job_type: str, mode: str, input_params: dict) -> Job:
+    # Streams skip the task queue but take the device like a queued job, so a saturated server turns them away too
+    await admit_job(db, "local", TTSBatchProcessor.VARIANTS[mode], input_params["text"])
+    job = Job(
+        user_id=current_user.id,
+        job_type=job_type,
+        status=JobStatus.PENDING,
+        backend_type="local",
+        input_data="",
+        input_params={**input_params, "streaming": True}
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+@router.post("/custom-voice/stream")
+@limiter.limit("10/minute")
+async def stream_custom_voice(
+    request: Request,
+    req_data: CustomVoiceRequest,
+    audio_format: str = Query("wav", pattern="^(wav|pcm)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    backend = await _get_streaming_backend(current_user)
+
+    try:
+        validate_text_length(req_data.text)
+        language = validate_language(req_data.language)
+        speaker = validate_speaker(req_data.speaker, "local")
+
+        params = validate_generation_params({
+            'max_new_tokens': req_data.max_new_tokens,
+            'temperature': req_data.temperature,
+            'top_k': req_data.top_k,
+            'top_p': req_data.top_p,
+            'repetition_penalty': req_data.repetition_penalty,
+            'seed': req_data.seed
+        })
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    request_data = {
+        "text": req_data.text,
+        "language": language,
+        "speaker": speaker,
+        "instruct": req_data.instruct or "",
+        **params
+    }
+    job = await _create_streaming_job(db, current_user, "custom-voice", "custom_voice", request_data)
+    return _stream_job(job.id, backend, "custom_voice", {**request_data, "user_id": current_user.id}, audio_format)
+
+
+@router.post("/voice-design/stream")
+@limiter.limit("10/minute")
+async def stream_voice_design(
+    request: Request,
+    req_data: VoiceDesignRequest,
+    audio_format: str = Query("wav", pattern="^(wav|pcm)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    from db.crud import get_voice_design, update_voice_design_usage
+
+    backend = await _get_streaming_backend(current_user)
+
+    if req_data.saved_design_id:
+        saved_design = get_voice_design(db, req_data.saved_design_id, current_user.id)
+        if not saved_design:
+            raise HTTPException(status_code=404, detail="Saved voice design not found")
+        if saved_design.backend_type != "local":
+            raise HTTPException(status_code=400, detail="Streaming requires a local voice design")
+
+        req_data.instruct = saved_design.instruct
+        update_voice_design_usage(db, req_data.saved_design_id, current_user.id)
+
+    try:
+        validate_text_length(req_data.text)
+        language = validate_language(req_data.language)
+
+        if not req_data.instruct or not req_data.instruct.strip():
+            raise ValueError("Instruct parameter is required when saved_design_id is not provided")
+
+        params = validate_generation_params({
+            'max_new_tokens': req_data.max_new_tokens,
+            'temperature': req_data.temperature,
+            'top_k': req_data.top_k,
+            'top_p': req_data.top_p,
+            'repetition_penalty': req_data.repetition_penalty,
+            'seed': req_data.seed
+        })
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    request_data = {
+        "text": req_data.text,
+        "language": language,
+        "instruct": req_data.instruct,
+        **params
+    }
+    job = await _create_streaming_job(db, current_user, "voice-design", "voice_design", request_data)
+    return _stream_job(job.id, backend, "voice_design", {**request_data, "user_id": current_user.id}, audio_format)
+
+
+@router.post("/voice-clone/stream")
+@limiter.limit("10/minute")
+async def stream_voice_clone(
+    request: Request,
+    req_data: VoiceCloneStreamRequest,
+    audio_format: str = Query("wav", pattern="^(wav|pcm)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    from db.crud import get_voice_design
+
+    backend = await _get_streaming_backend(current_user)
+
+    design = get_voice_design(db, req_data.voice_design_id, current_user.id)
+    if not design:
+        raise HTTPException(status_code=404, detail="Voice design not found")
+    if design.backend_type != "local" or not design.voice_cache_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Voice design has no prepared clone prompt. Please call /voice-designs/{id}/prepare-clone first"
+        )
+
+    try:
+        validate_text_length(req_data.text)
+        language = validate_language(req_data.language)
+
+        params = validate_generation_params({
+            'max_new_tokens': req_data.max_new_tokens,
+            'temperature': req_data.temperature,
+            'top_k': req_data.top_k,
+            'top_p': req_data.top_p,
+            'repetition_penalty': req_data.repetition_penalty,
+            'seed': req_data.seed
+        })
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    cache_manager = await VoiceCacheManager.get_instance()
+    cached = await cache_manager.get_cache_by_id(design.voice_cache_id, db)
+    if not cached:
+        raise HTTPException(status_code=404, detail=f"Cache {design.voice_cache_id} not found")
+    cache_metrics.record_hit(current_user.id)
+
+    request_data = {
+        "text": req_data.text,
+        "language": language,
+        "ref_text": design.ref_text or "",
+        "voice_design_id": req_data.voice_design_id,
+        **params
+    }
+    job = await _create_streaming_job(db, current_user, "voice-clone", "voice_clone", request_data)
+    return _stream_job(
+        job.id, backend, "voice_clone", {**request_data, "user_id": current_user.id}, audio_format,
+        voice_clone_prompt=cached['data']
+    )
+
+
 @router.get("/speakers")
 @limiter.limit("30/minute")
 async def list_speakers(request: Request, backend: Optional[str] = "local"):
@@ -1,5 +1,6 @@
+from datetime import datetime, timedelta
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
 from sqlalchemy.orm import Session
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -15,9 +16,14 @@ from db.crud import (
     list_users,
     create_user_by_admin,
     update_user,
-    delete_user
+    delete_user,
+    get_usage_summary,
+    list_user_usage
+)
+from schemas.user import (
+    User, UserCreateByAdmin, UserUpdate, UserListResponse,
+    UserUsageListResponse, UserUsageDetailResponse
 )
-from schemas.user import User, UserCreateByAdmin, UserUpdate, UserListResponse
 
 router = APIRouter(prefix="/users", tags=["users"])
 limiter = Limiter(key_func=get_remote_address)
@@ -86,6 +92,43 @@ async def get_current_user_info(
 ):
     return current_user
 
+@router.get("/usage", response_model=UserUsageListResponse)
+@limiter.limit("30/minute")
+async def get_users_usage(
+    request: Request,
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_superuser)
+):
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    return {"since": since, "users": get_usage_summary(db, since)}
+
+@router.get("/{user_id}/usage", response_model=UserUsageDetailResponse)
+@limiter.limit("30/minute")
+async def get_user_usage(
+    request: Request,
+    user_id: int,
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_superuser)
+):
+    if not get_user_by_id(db, user_id=user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    rows = list_user_usage(db, user_id, since)
+    return {
+        "user_id": user_id,
+        "since": since,
+        "device_seconds": sum(row.device_seconds for row in rows),
+        "request_count": sum(row.request_count for row in rows),
+        "characters": sum(row.characters for row in rows),
+        "days": rows
+    }
+
 @router.get("/{user_id}", response_model=User)
 @limiter.limit("30/minute")
 async def get_user(
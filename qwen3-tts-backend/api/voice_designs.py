@@ -111,7 +111,9 @@ async def prepare_and_create_voice_design(
             "temperature": 0.3,
             "top_k": 10,
             "top_p": 0.5,
-            "repetition_penalty": 1.05
+            "repetition_penalty": 1.05,
+            "priority": "preview",
+            "user_id": current_user.id
         })
 
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
@@ -122,17 +124,7 @@ async def prepare_and_create_voice_design(
 
         ref_audio_array, ref_sr = process_ref_audio(ref_audio_bytes)
 
-        from core.model_manager import ModelManager
-        model_manager = await ModelManager.get_instance()
-        await model_manager.load_model("base")
-        _, tts = await model_manager.get_current_model()
-        if tts is None:
-            raise RuntimeError("Failed to load base model")
-
-        x_vector = tts.create_voice_clone_prompt(
-            ref_audio=(ref_audio_array, ref_sr),
-            ref_text=ref_text,
-        )
+        x_vector = await backend.create_voice_clone_prompt(ref_audio_bytes, ref_text=ref_text)
 
         cache_manager = await VoiceCacheManager.get_instance()
         ref_audio_hash = cache_manager.get_audio_hash(ref_audio_bytes)
@@ -231,7 +223,9 @@ async def prepare_voice_clone_prompt(
             "temperature": 0.3,
             "top_k": 10,
             "top_p": 0.5,
-            "repetition_penalty": 1.05
+            "repetition_penalty": 1.05,
+            "priority": "preview",
+            "user_id": current_user.id
         })
 
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
@@ -244,18 +238,7 @@ async def prepare_voice_clone_prompt(
         logger.info(f"Extracting voice clone prompt from reference audio")
         ref_audio_array, ref_sr = process_ref_audio(ref_audio_bytes)
 
-        from core.model_manager import ModelManager
-        model_manager = await ModelManager.get_instance()
-        await model_manager.load_model("base")
-        _, tts = await model_manager.get_current_model()
-
-        if tts is None:
-            raise RuntimeError("Failed to load base model")
-
-        x_vector = tts.create_voice_clone_prompt(
-            ref_audio=(ref_audio_array, ref_sr),
-            ref_text=ref_text,
-        )
+        x_vector = await backend.create_voice_clone_prompt(ref_audio_bytes, ref_text=ref_text)
 
         cache_manager = await VoiceCacheManager.get_instance()
         ref_audio_hash = cache_manager.get_audio_hash(ref_audio_bytes)
@@ -16,13 +16,22 @@ class Settings(BaseSettings):
 
     MODEL_DEVICE: str = Field(default="cuda:0")
     MODEL_BASE_PATH: str = Field(default="../Qwen")
+    MODEL_MEMORY_BUDGET_GB: float = Field(default=0.0)
+    MODEL_HOST_BUDGET_GB: float = Field(default=0.0)
+    MODEL_PIN_HOST_MEMORY: bool = Field(default=False)
+    MODEL_PIN_WAIT_SECONDS: float = Field(default=30.0)
 
     MAX_CACHE_ENTRIES: int = Field(default=100)
     CACHE_TTL_DAYS: int = Field(default=7)
+    VOICE_CACHE_MEMORY_MB: int = Field(default=256)
+    VOICE_CACHE_STATS_FLUSH_SECONDS: float = Field(default=30.0)
+    AUDIO_CACHE_DIR: str = Field(default="./audio_cache")
+    AUDIO_CACHE_MAX_MB: int = Field(default=2048)
 
     HOST: str = Field(default="0.0.0.0")
     PORT: int = Field(default=8000)
     WORKERS: int = Field(default=1)
+    INFERENCE_WORKERS: str = Field(default="")
     LOG_LEVEL: str = Field(default="info")
     LOG_FILE: str = Field(default="./app.log")
 
@@ -32,6 +41,27 @@ class Settings(BaseSettings):
     MAX_QUEUE_SIZE: int = Field(default=100)
     BATCH_SIZE: int = Field(default=4)
     BATCH_WAIT_TIME: float = Field(default=0.5)
+    JOB_MAX_WAIT_SECONDS: float = Field(default=120.0)
+    SCHEDULER_BULK_SHARE: float = Field(default=0.2)
+    USAGE_FLUSH_SECONDS: float = Field(default=10.0)
+    ADMISSION_MAX_QUEUE_SECONDS: float = Field(default=600.0)
+    ADMISSION_DEFAULT_THROUGHPUT: float = Field(default=10.0)
+    REALTIME_MAX_PENDING_SENTENCES: int = Field(default=8)
+    JOB_EVENTS_QUEUE_SIZE: int = Field(default=100)
+    JOB_EVENTS_KEEPALIVE_SECONDS: float = Field(default=15.0)
+
+    EVENT_BUS: str = Field(default="memory")
+    EVENT_BUS_PATH: str = Field(default="./event_bus.db")
+    EVENT_BUS_POLL_INTERVAL: float = Field(default=0.02)
+    EVENT_BUS_RETENTION_SECONDS: float = Field(default=60.0)
+
+    TASK_LEASE_SECONDS: float = Field(default=60.0)
+    TASK_HEARTBEAT_SECONDS: float = Field(default=15.0)
+    TASK_MAX_ATTEMPTS: int = Field(default=3)
+    TASK_RETRY_BACKOFF_SECONDS: float = Field(default=10.0)
+    TASK_POLL_INTERVAL: float = Field(default=1.0)
+    TASK_MAX_IN_FLIGHT: int = Field(default=16)
+    ORPHAN_UPLOAD_MAX_AGE_HOURS: float = Field(default=24.0)
 
     MAX_TEXT_LENGTH: int = Field(default=1000)
     MAX_AUDIO_SIZE_MB: int = Field(default=10)
@@ -46,6 +76,7 @@ class Settings(BaseSettings):
 
     AUDIOBOOK_PARSE_CONCURRENCY: int = Field(default=3)
     AUDIOBOOK_GENERATE_CONCURRENCY: int = Field(default=2)
+    PROGRESS_MAX_LINES: int = Field(default=2000)
 
     class Config:
         env_file = ".env"
@@ -65,12 +96,22 @@ class Settings(BaseSettings):
 
         Path(self.CACHE_DIR).mkdir(parents=True, exist_ok=True)
         Path(self.OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+        if self.AUDIO_CACHE_MAX_MB > 0:
+            Path(self.AUDIO_CACHE_DIR).mkdir(parents=True, exist_ok=True)
 
-        if self.WORKERS > 1:
+        if self.WORKERS > 1 and not self.INFERENCE_WORKERS:
             import warnings
-            warnings.warn("WORKERS > 1 not recommended for GPU models. Setting to 1.")
+            warnings.warn("WORKERS > 1 requires INFERENCE_WORKERS when models run in-process. Setting to 1.")
             self.WORKERS = 1
 
+        if self.WORKERS > 1 and self.EVENT_BUS == "memory":
+            import warnings
+            warnings.warn("WORKERS > 1 with EVENT_BUS=memory: progress logs, job events and cancellation only reach the worker that runs the task. Set EVENT_BUS=sqlite.")
+
+        if self.INFERENCE_WORKERS and self.EVENT_BUS == "memory":
+            import warnings
+            warnings.warn("INFERENCE_WORKERS with EVENT_BUS=memory: running generations cannot be cancelled from the API process. Set EVENT_BUS=sqlite.")
+
         return True
 
 settings = Settings()
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Relative synthesis cost per model variant; voice clone also encodes the reference prompt
+VARIANT_COST_WEIGHTS = {
+    "custom-voice": 1.0,
+    "voice-design": 1.0,
+    "base": 1.3,
+}
+REQUEST_OVERHEAD_CHARS = 20
+THROUGHPUT_WINDOW_SECONDS = 600
+MIN_BUSY_SECONDS = 5.0
+
+
+def estimate_cost(model_name: str, text: str) -> float:
+    return (len(text or "") + REQUEST_OVERHEAD_CHARS) * VARIANT_COST_WEIGHTS.get(model_name, 1.0)
+
+
+class QueueFullError(Exception):
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    _instance: Optional['AdmissionController'] = None
+    _lock = asyncio.Lock()
+
+    def __init__(self):
+        self.max_queue_size = settings.MAX_QUEUE_SIZE
+        self.max_queue_seconds = settings.ADMISSION_MAX_QUEUE_SECONDS
+        self.default_throughput = settings.ADMISSION_DEFAULT_THROUGHPUT
+        self.admitted = 0
+        self.rejected = 0
+        self._completed: Deque[Tuple[float, float, float]] = deque(maxlen=500)
+        logger.info(
+            f"AdmissionController initialized with max_queue_size={self.max_queue_size}, "
+            f"max_queue_seconds={self.max_queue_seconds}s"
+        )
+
+    @classmethod
+    async def get_instance(cls) -> 'AdmissionController':
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def record_completion(self, model_name: str, text: str, started_at: datetime, completed_at: datetime) -> None:
+        if started_at is None or completed_at is None:
+            return
+        self._completed.append((
+            started_at.timestamp(),
+            completed_at.timestamp(),
+            estimate_cost(model_name, text)
+        ))
+
+    def throughput(self) -> float:
+        now = time.time()
+        recent = sorted(
+            (start, end, cost) for start, end, cost in self._completed
+            if now - end <= THROUGHPUT_WINDOW_SECONDS
+        )
+
+        # Jobs run concurrently and in batches, so measure against the union of their busy intervals
+        busy = 0.0
+        total_cost = 0.0
+        span_start = span_end = None
+        for start, end, cost in recent:
+            total_cost += cost
+            if span_end is None or start > span_end:
+                if span_end is not None:
+                    busy += span_end - span_start
+                span_start, span_end = start, end
+            else:
+                span_end = max(span_end, end)
+        if span_end is not None:
+            busy += span_end - span_start
+
+        if busy < MIN_BUSY_SECONDS:
+            return self.default_throughput
+        return total_cost / busy
+
+    def _pending_work(self, db: Session) -> List[Dict[str, Any]]:
+        from db.crud import list_pending_model_tasks
+
+        now = datetime.utcnow()
+        work = []
+        for task in list_pending_model_tasks(db):
+            request_data = (task.payload or {}).get("request_data") or {}
+            work.append({
+                "task_id": task.id,
+                "job_id": task.job_id,
+                "cost": estimate_cost(task.model_name, request_data.get("text", "")),
+                "delay": max((task.available_at - now).total_seconds(), 0.0) if task.available_at else 0.0,
+            })
+        return work
+
+    def admit(self, db: Session, model_name: str, text: str) -> float:
+        work = self._pending_work(db)
+        throughput = self.throughput()
+        cost = estimate_cost(model_name, text)
+        drain_seconds = sum(item["cost"] for item in work) / throughput
+        eta = drain_seconds + cost / throughput
+
+        if len(work) >= self.max_queue_size or eta > self.max_queue_seconds:
+            self.rejected += 1
+            retry_after = max(1, math.ceil(eta - self.max_queue_seconds), math.ceil(drain_seconds / max(len(work), 1)))
+            raise QueueFullError(
+                f"Server is busy: {len(work)} jobs queued, estimated wait {drain_seconds:.0f}s",
+                retry_after
+            )
+
+        self.admitted += 1
+        return eta
+
+    def estimate_eta(self, db: Session, job) -> Optional[float]:
+        return self.estimate_etas(db, [job])[job.id]
+
+    def estimate_etas(self, db: Session, jobs) -> Dict[int, Optional[float]]:
+        etas: Dict[int, Optional[float]] = {job.id: None for job in jobs}
+        active = [job for job in jobs if job.backend_type == "local" and job.status in ("pending", "processing")]
+        if not active:
+            return etas
+
+        # One pass over the queue serves every job in the listing
+        throughput = self.throughput()
+        now = datetime.utcnow()
+        queued = {}
+        ahead = 0.0
+        for item in self._pending_work(db):
+            ahead += item["cost"]
+            queued.setdefault(item["job_id"], (item, ahead))
+
+        for job in active:
+            if job.id not in queued:
+                continue
+            own, ahead = queued[job.id]
+            if job.status == "processing" and job.started_at is not None:
+                elapsed = (now - job.started_at).total_seconds()
+                etas[job.id] = max(own["cost"] / throughput - elapsed, 0.0)
+            else:
+                # Work queued before this job drains first; retries wait out their backoff
+                etas[job.id] = max(ahead / throughput, own["delay"])
+        return etas
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_queue_size": self.max_queue_size,
+            "max_queue_seconds": self.max_queue_seconds,
+            "throughput_chars_per_second": self.throughput(),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from core.batch_processor import TTSBatchProcessor
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when a change makes previously synthesized audio stale
+KEY_VERSION = 1
+KEY_PARAMS = ("text", "language", "speaker", "instruct") + TTSBatchProcessor.SAMPLING_PARAMS
+
+
+def synthesis_key(model: str, mode: str, params: dict, voice: Optional[str], seed: Optional[int]) -> str:
+    """Canonical hash of everything that determines the synthesized audio."""
+    canonical = {
+        "version": KEY_VERSION,
+        "model": model,
+        "mode": mode,
+        "voice": voice,
+        "seed": seed,
+        **{name: params.get(name) for name in KEY_PARAMS},
+    }
+    encoded = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def seed_for_key(key: str) -> int:
+    return int(key[:8], 16)
+
+
+class CachedAudio(bytes):
+    """WAV bytes that are also stored in the audio cache, so they can be linked instead of written again."""
+
+    path: Optional[Path] = None
+
+
+def save_audio(audio: bytes, output_path) -> None:
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex[:8]}")
+    source = getattr(audio, "path", None)
+    if source is not None:
+        try:
+            # A hard link shares the stored file; evicting it later only drops the cache's name for it
+            os.link(source, tmp_path)
+            os.replace(tmp_path, output_path)
+            return
+        except OSError as e:
+            logger.debug(f"Could not link cached audio {source}: {e}")
+    with open(tmp_path, "wb") as f:
+        f.write(audio)
+    os.replace(tmp_path, output_path)
+
+
+class AudioCache:
+    """
+    Synthesized audio on disk, addressed by `synthesis_key`, evicted least recently used first once the files
+    exceed `max_bytes`. File I/O runs in worker threads, off the event loop.
+
+    Recency is kept in memory rather than in file mtimes, because a stored file may be hard linked as a job output
+    and touching it would change that output's mtime too. Processes sharing the directory (WORKERS > 1) reconcile
+    with the files on disk when a store takes them over `max_bytes`, and at least every `SYNC_INTERVAL_SECONDS`,
+    so they stay within the bound together without scanning the directory on every store; entries stored by
+    another process rank by their write time among this process's last uses.
+    """
+
+    _instance = None
+    _lock = asyncio.Lock()
+
+    SYNC_INTERVAL_SECONDS = 30.0
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        # key -> (size, last use), least recently used first
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._entries_lock = threading.Lock()
+        self.size = 0
+        self._synced_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._sync_with_disk()
+        logger.info(f"AudioCache initialized: dir={cache_dir}, max={max_bytes / 1024**2:.0f}MB, entries={len(self._entries)}")
+
+    @classmethod
+    async def get_instance(cls) -> 'AudioCache':
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = AudioCache(settings.AUDIO_CACHE_DIR, settings.AUDIO_CACHE_MAX_MB * 1024**2)
+        return cls._instance
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.wav"
+
+    def _sync_with_disk(self) -> None:
+        files = {}
+        for path in self.cache_dir.glob("*.wav"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files[path.stem] = (stat.st_mtime, stat.st_size)
+        self._synced_at = time.monotonic()
+
+        with self._entries_lock:
+            for key in [key for key in self._entries if key not in files]:
+                # Evicted by another process
+                self._forget(key)
+            stored_elsewhere = {key: (size, mtime) for key, (mtime, size) in files.items() if key not in self._entries}
+            if stored_elsewhere:
+                self._entries.update(stored_elsewhere)
+                self.size += sum(size for size, _ in stored_elsewhere.values())
+                self._entries = OrderedDict(sorted(self._entries.items(), key=lambda item: item[1][1]))
+
+    def _forget(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[0]
+
+    def _touch(self, key: str, size: int) -> None:
+        self._forget(key)
+        self._entries[key] = (size, time.time())
+        self.size += size
+
+    async def get(self, key: str) -> Optional[CachedAudio]:
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self._read, key)
+
+    def _read(self, key: str) -> Optional[CachedAudio]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = CachedAudio(f.read())
+        except FileNotFoundError:
+            # Never stored, or evicted by another process
+            with self._entries_lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+
+        with self._entries_lock:
+            self._touch(key, len(audio))
+            self.hits += 1
+        audio.path = path
+        return audio
+
+    async def put(self, key: str, audio: bytes) -> bytes:
+        if not self.enabled or len(audio) > self.max_bytes:
+            return audio
+        return await asyncio.to_thread(self._write, key, audio)
+
+    def _write(self, key: str, audio: bytes) -> bytes:
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to store synthesized audio {key[:8]}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return audio
+
+        with self._entries_lock:
+            self._touch(key, len(audio))
+        if self.size > self.max_bytes or time.monotonic() - self._synced_at > self.SYNC_INTERVAL_SECONDS:
+            self._sync_with_disk()
+        self._evict()
+
+        stored = CachedAudio(audio)
+        stored.path = path
+        return stored
+
+    def _evict(self) -> None:
+        while True:
+            with self._entries_lock:
+                if self.size <= self.max_bytes or not self._entries:
+                    return
+                key, (size, _) = self._entries.popitem(last=False)
+                self.size -= size
+                self.evictions += 1
+            self._path(key).unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "size_mb": self.size / 1024**2,
+            "max_size_mb": self.max_bytes / 1024**2,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+        }
@@ -6,7 +6,10 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 
+from core.audio_cache import save_audio
+from core.cancellation import GenerationCancelled, audiobook_key, cancel
 from core.config import settings
+from core.event_bus import get_event_bus
 from core.llm_service import LLMService
 from core import progress_store as ps
 from db import crud
@@ -18,14 +21,24 @@ logger = logging.getLogger(__name__)
 _cancel_events: dict[int, asyncio.Event] = {}
 
 
-def cancel_batch(project_id: int) -> None:
-    """Signal cancellation for any running batch operation on this project."""
+def _on_cancel(message: dict) -> None:
+    project_id = message["project_id"]
     ev = _cancel_events.get(project_id)
     if ev:
         ev.set()
         logger.info(f"cancel_batch: project={project_id} cancellation signalled")
 
 
+get_event_bus().subscribe("audiobook.cancel", _on_cancel)
+
+
+def cancel_batch(project_id: int) -> None:
+    """Signal cancellation for any running batch operation on this project, in whichever process runs it."""
+    get_event_bus().publish("audiobook.cancel", {"project_id": project_id})
+    # Segments already on the device stop mid-generation instead of running to the end
+    cancel(audiobook_key(project_id))
+
+
 def _get_llm_service(user: User) -> LLMService:
     from core.security import decrypt_api_key
     if not user.llm_api_key or not user.llm_base_url or not user.llm_model:
@@ -444,9 +457,7 @@ async def _bootstrap_character_voices(segments, user, backend, backend_type: str
 
         try:
             if backend_type == "local" and not design.voice_cache_id:
-                from core.model_manager import ModelManager
                 from core.cache_manager import VoiceCacheManager
-                from utils.audio import process_ref_audio
                 import hashlib
 
                 ref_text = "你好，这是参考音频。"
@@ -459,17 +470,11 @@ async def _bootstrap_character_voices(segments, user, backend, backend_type: str
                     "top_k": 10,
                     "top_p": 0.9,
                     "repetition_penalty": 1.05,
+                    "priority": "bulk",
+                    "user_id": user.id,
                 })
 
-                model_manager = await ModelManager.get_instance()
-                await model_manager.load_model("base")
-                _, tts = await model_manager.get_current_model()
-
-                ref_audio_array, ref_sr = process_ref_audio(ref_audio_bytes)
-                x_vector = tts.create_voice_clone_prompt(
-                    ref_audio=(ref_audio_array, ref_sr),
-                    ref_text=ref_text,
-                )
+                x_vector = await backend.create_voice_clone_prompt(ref_audio_bytes, ref_text=ref_text)
 
                 cache_manager = await VoiceCacheManager.get_instance()
                 ref_audio_hash = hashlib.sha256(ref_audio_bytes).hexdigest()
@@ -589,6 +594,9 @@ async def generate_project(project_id: int, user: User, db: Session, chapter_ind
                                     "top_k": 10,
                                     "top_p": 0.9,
                                     "repetition_penalty": 1.05,
+                                    "priority": "bulk",
+                                    "user_id": user.id,
+                                    "cancel_key": audiobook_key(project_id),
                                 },
                                 x_vector=x_vector
                             )
@@ -602,6 +610,9 @@ async def generate_project(project_id: int, user: User, db: Session, chapter_ind
                                 "top_k": 10,
                                 "top_p": 0.9,
                                 "repetition_penalty": 1.05,
+                                "priority": "bulk",
+                                "user_id": user.id,
+                                "cancel_key": audiobook_key(project_id),
                             })
                     else:
                         audio_bytes, _ = await backend.generate_voice_design({
@@ -613,14 +624,21 @@ async def generate_project(project_id: int, user: User, db: Session, chapter_ind
                             "top_k": 10,
                             "top_p": 0.9,
                             "repetition_penalty": 1.05,
+                            "priority": "bulk",
+                            "user_id": user.id,
+                            "cancel_key": audiobook_key(project_id),
                         })
 
-                with open(audio_path, "wb") as f:
-                    f.write(audio_bytes)
+                save_audio(audio_bytes, audio_path)
 
                 crud.update_audiobook_segment_status(db, seg.id, "done", audio_path=str(audio_path))
                 logger.info(f"Segment {seg.id} generated: {audio_path}")
 
+            except GenerationCancelled:
+                logger.info(f"Generation cancelled for project {project_id} during segment {seg.id}")
+                crud.update_audiobook_segment_status(db, seg.id, "pending")
+                break
+
             except Exception as e:
                 logger.error(f"Segment {seg.id} generation failed: {e}", exc_info=True)
                 crud.update_audiobook_segment_status(db, seg.id, "error")
@@ -829,9 +847,7 @@ async def generate_character_preview(project_id: int, char_id: int, user: User,
     try:
         if backend_type == "local" and not design.voice_cache_id:
             logger.info(f"Local voice cache missing for char {char_id}. Bootstrapping now...")
-            from core.model_manager import ModelManager
             from core.cache_manager import VoiceCacheManager
-            from utils.audio import process_ref_audio
             import hashlib
 
             ref_text = "你好，这是参考音频。"
@@ -844,17 +860,11 @@ async def generate_character_preview(project_id: int, char_id: int, user: User,
                 "top_k": 10,
                 "top_p": 0.9,
                 "repetition_penalty": 1.05,
+                "priority": "preview",
+                "user_id": user.id,
             })
 
-            model_manager = await ModelManager.get_instance()
-            await model_manager.load_model("base")
-            _, tts = await model_manager.get_current_model()
-
-            ref_audio_array, ref_sr = process_ref_audio(ref_audio_bytes)
-            x_vector = tts.create_voice_clone_prompt(
-                ref_audio=(ref_audio_array, ref_sr),
-                ref_text=ref_text,
-            )
+            x_vector = await backend.create_voice_clone_prompt(ref_audio_bytes, ref_text=ref_text)
 
             cache_manager = await VoiceCacheManager.get_instance()
             ref_audio_hash = hashlib.sha256(ref_audio_bytes).hexdigest()
@@ -909,6 +919,8 @@ async def generate_character_preview(project_id: int, char_id: int, user: User,
                             "top_k": 10,
                             "top_p": 0.9,
                             "repetition_penalty": 1.05,
+                            "priority": "preview",
+                            "user_id": user.id,
                         },
                         x_vector=x_vector
                     )
@@ -922,6 +934,8 @@ async def generate_character_preview(project_id: int, char_id: int, user: User,
                         "top_k": 10,
                         "top_p": 0.9,
                         "repetition_penalty": 1.05,
+                        "priority": "preview",
+                        "user_id": user.id,
                     })
             else:
                 audio_bytes, _ = await backend.generate_voice_design({
@@ -933,11 +947,12 @@ async def generate_character_preview(project_id: int, char_id: int, user: User,
                     "top_k": 10,
                     "top_p": 0.9,
                     "repetition_penalty": 1.05,
+                    "priority": "preview",
+                    "user_id": user.id,
                 })
 
-        with open(audio_path, "wb") as f:
-            f.write(audio_bytes)
-            
+        save_audio(audio_bytes, audio_path)
+
         logger.info(f"Preview generated for char {char_id}: {audio_path}")
     except Exception as e:
         logger.error(f"Failed to generate preview for char {char_id}: {e}")
@@ -1,14 +1,20 @@
 import asyncio
+import functools
 import logging
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
 from dataclasses import dataclass
-from collections import deque
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
 
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Highest priority first: user-facing requests, voice previews, then bulk audiobook segments
+PRIORITY_CLASSES = ("interactive", "preview", "bulk")
+DEVICE_SHARE_WINDOW_SECONDS = 300
+
 
 @dataclass
 class BatchRequest:
@@ -16,6 +22,11 @@ class BatchRequest:
     data: Dict[str, Any]
     future: asyncio.Future
     timestamp: float
+    priority: str = "interactive"
+    user_id: Optional[Hashable] = None
+    cost: float = 1.0
+    start_tag: float = 0.0
+    finish_tag: float = 0.0
 
 
 class BatchProcessor:
@@ -28,6 +39,15 @@ class BatchProcessor:
         self.queue: deque = deque()
         self.queue_lock = asyncio.Lock()
         self.processing = False
+        self.total_batches = 0
+        self.total_requests_batched = 0
+        self.bulk_share = settings.SCHEDULER_BULK_SHARE
+        self.queue_waits: Dict[str, deque] = {name: deque(maxlen=1000) for name in PRIORITY_CLASSES}
+        self._device_time: deque = deque()
+        # Virtual finish time fair queuing: per class virtual clock and the last finish tag of each user
+        self.virtual_time: Dict[str, float] = {name: 0.0 for name in PRIORITY_CLASSES}
+        self._user_finish: Dict[Tuple[str, Hashable], float] = {}
+        self.user_device_seconds: Dict[Hashable, float] = defaultdict(float)
         self._processor_task: Optional[asyncio.Task] = None
         logger.info(f"BatchProcessor initialized with batch_size={self.batch_size}, wait_time={self.batch_wait_time}s")
 
@@ -45,63 +65,165 @@ class BatchProcessor:
             self._processor_task = asyncio.create_task(self._process_batches())
             logger.info("Batch processor task started")
 
+    def _batch_key(self, data: Dict[str, Any]) -> Hashable:
+        return None
+
+    def _estimate_cost(self, data: Dict[str, Any]) -> float:
+        return 1.0
+
+    def _device_share(self, priority: str) -> float:
+        now = time.time()
+        while self._device_time and now - self._device_time[0][0] > DEVICE_SHARE_WINDOW_SECONDS:
+            self._device_time.popleft()
+        total = sum(seconds for _, _, seconds in self._device_time)
+        if total <= 0:
+            return 0.0
+        return sum(seconds for _, name, seconds in self._device_time if name == priority) / total
+
+    def _take_batch(self) -> Tuple[List[BatchRequest], float]:
+        groups: Dict[Hashable, List[BatchRequest]] = {}
+        for request in self.queue:
+            groups.setdefault((request.priority, self._batch_key(request.data)), []).append(request)
+        for group in groups.values():
+            group.sort(key=lambda request: request.finish_tag)
+
+        now = time.time()
+        ready = [
+            group for group in groups.values()
+            if len(group) >= self.batch_size or now - min(request.timestamp for request in group) >= self.batch_wait_time
+        ]
+        if not ready:
+            return [], 0.0
+
+        # Highest class first, smallest virtual finish time within a class, so a user with a long
+        # backlog is interleaved with everyone else instead of being drained first. Each bulk segment
+        # is its own request, so bulk work yields to interactive work at segment boundaries.
+        ready.sort(key=lambda group: (PRIORITY_CLASSES.index(group[0].priority), group[0].finish_tag))
+        batch = ready[0]
+        bulk = [group for group in ready if group[0].priority == "bulk"]
+        if bulk and batch[0].priority != "bulk" and self._device_share("bulk") < self.bulk_share:
+            batch = bulk[0]
+
+        batch = batch[:self.batch_size]
+        for request in batch:
+            self.queue.remove(request)
+        self._advance_virtual_time(batch[0].priority, batch[0].start_tag)
+        return batch, now - min(request.timestamp for request in batch)
+
+    def _advance_virtual_time(self, priority: str, start_tag: float) -> None:
+        if start_tag <= self.virtual_time[priority]:
+            return
+        self.virtual_time[priority] = start_tag
+        # Users whose last tag is behind the clock are idle and would restart from it anyway
+        for flow in [flow for flow, finish in self._user_finish.items() if flow[0] == priority and finish <= start_tag]:
+            del self._user_finish[flow]
+
     async def _process_batches(self):
         logger.info("Batch processing loop started")
         while True:
             try:
-                await asyncio.sleep(0.1)
+                await asyncio.sleep(min(0.1, self.batch_wait_time))
 
                 async with self.queue_lock:
                     if not self.queue:
                         continue
+                    batch, wait_duration = self._take_batch()
 
-                    current_time = time.time()
-                    oldest_request = self.queue[0]
-                    wait_duration = current_time - oldest_request.timestamp
-
-                    should_process = (
-                        len(self.queue) >= self.batch_size or
-                        wait_duration >= self.batch_wait_time
+                # Batches run one at a time so the next pick sees everything queued meanwhile
+                if batch:
+                    logger.info(
+                        f"Processing {batch[0].priority} batch of {len(batch)} requests (queue_wait={wait_duration:.3f}s)"
                     )
-
-                    if should_process:
-                        batch = []
-                        for _ in range(min(self.batch_size, len(self.queue))):
-                            if self.queue:
-                                batch.append(self.queue.popleft())
-
-                        if batch:
-                            logger.info(f"Processing batch of {len(batch)} requests (queue_wait={wait_duration:.3f}s)")
-                            asyncio.create_task(self._process_batch(batch))
+                    await self._process_batch(batch)
 
             except Exception as e:
                 logger.error(f"Error in batch processor loop: {e}", exc_info=True)
                 await asyncio.sleep(1)
 
     async def _process_batch(self, batch: List[BatchRequest]):
+        batch = [request for request in batch if not request.future.done()]
+        if not batch:
+            return
+
+        self.total_batches += 1
+        self.total_requests_batched += len(batch)
+        started = time.time()
+        for request in batch:
+            self.queue_waits[request.priority].append(started - request.timestamp)
+        try:
+            from core.metrics import MetricsCollector
+            metrics = await MetricsCollector.get_instance()
+            await metrics.record_batch(len(batch))
+        except Exception as e:
+            logger.debug(f"Failed to record batch metrics: {e}")
+
+        try:
+            results = await self._execute_batch([request.data for request in batch])
+        except Exception as e:
+            logger.error(f"Error processing batch of {len(batch)} requests: {e}", exc_info=True)
+            results = [e] * len(batch)
+        finally:
+            elapsed = time.time() - started
+            self._device_time.append((time.time(), batch[0].priority, elapsed))
+            await self._record_usage(batch, elapsed)
+
+        for request, result in zip(batch, results):
+            if request.future.done():
+                continue
+            if isinstance(result, Exception):
+                request.future.set_exception(result)
+            else:
+                request.future.set_result(result)
+
+    @staticmethod
+    def _users(request: BatchRequest) -> List[Hashable]:
+        # A request shared by several callers lists all of their users
+        return request.data.get("user_ids") or [request.user_id]
+
+    async def _record_usage(self, batch: List[BatchRequest], elapsed: float) -> None:
+        total_cost = sum(request.cost for request in batch) or 1.0
         for request in batch:
+            users = self._users(request)
+            for user_id in users:
+                self.user_device_seconds[user_id] += elapsed * request.cost / total_cost / len(users)
+
+    async def _execute_batch(self, items: List[Dict[str, Any]]) -> List[Any]:
+        results = []
+        for data in items:
             try:
-                if not request.future.done():
-                    result = await self._execute_single_request(request.data)
-                    request.future.set_result(result)
+                results.append(await self._execute_single_request(data))
             except Exception as e:
-                logger.error(f"Error processing request {request.request_id}: {e}", exc_info=True)
-                if not request.future.done():
-                    request.future.set_exception(e)
+                logger.error(f"Error processing request: {e}", exc_info=True)
+                results.append(e)
+        return results
 
     async def _execute_single_request(self, data: Dict[str, Any]) -> Any:
         raise NotImplementedError("Subclass must implement _execute_single_request")
 
-    async def submit(self, request_id: str, data: Dict[str, Any], timeout: float = 300) -> Any:
-        future = asyncio.Future()
+    async def submit(
+        self,
+        request_id: str,
+        data: Dict[str, Any],
+        timeout: Optional[float] = 300,
+        priority: str = "interactive",
+        user_id: Optional[Hashable] = None
+    ) -> Any:
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        future = asyncio.get_running_loop().create_future()
         request = BatchRequest(
             request_id=request_id,
             data=data,
             future=future,
-            timestamp=time.time()
+            timestamp=time.time(),
+            priority=priority,
+            user_id=user_id,
+            cost=max(self._estimate_cost(data), 1e-6)
         )
 
         async with self.queue_lock:
+            self._tag(request)
             self.queue.append(request)
             queue_size = len(self.queue)
 
@@ -117,25 +239,268 @@ class BatchProcessor:
                     self.queue.remove(request)
             raise TimeoutError(f"Request timed out after {timeout}s")
 
+    def _tag(self, request: BatchRequest) -> None:
+        flow = (request.priority, request.user_id)
+        request.start_tag = max(self.virtual_time[request.priority], self._user_finish.get(flow, 0.0))
+        request.finish_tag = request.start_tag + request.cost
+        self._user_finish[flow] = request.finish_tag
+
+    async def record_unbatched(
+        self,
+        data: Dict[str, Any],
+        elapsed: float,
+        priority: str = "interactive",
+        user_id: Optional[Hashable] = None
+    ) -> None:
+        """Charge device time spent outside the queue, such as a stream, to its class and user like a batch."""
+        request = BatchRequest(
+            request_id="unbatched",
+            data=data,
+            future=None,
+            timestamp=time.time(),
+            priority=priority,
+            user_id=user_id,
+            cost=max(self._estimate_cost(data), 1e-6)
+        )
+        async with self.queue_lock:
+            # Pushes the user's next queued request back as if this one had gone through the queue
+            self._tag(request)
+        self._device_time.append((time.time(), priority, elapsed))
+        await self._record_usage([request], elapsed)
+
+    async def promote(self, request_id: str, priority: str) -> bool:
+        """Move a queued request up to `priority` if that class ranks higher than its own."""
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        async with self.queue_lock:
+            request = next((request for request in self.queue if request.request_id == request_id), None)
+            if request is None or PRIORITY_CLASSES.index(priority) >= PRIORITY_CLASSES.index(request.priority):
+                return False
+            request.priority = priority
+            self._tag(request)
+        logger.debug(f"Request {request_id} promoted to {priority}")
+        return True
+
     async def get_queue_length(self) -> int:
         async with self.queue_lock:
             return len(self.queue)
 
+    @staticmethod
+    def _percentiles(samples) -> Dict[str, float]:
+        if not samples:
+            return {}
+        ordered = sorted(samples)
+        return {
+            'p50': ordered[len(ordered) // 2],
+            'p95': ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+            'p99': ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)],
+        }
+
     async def get_stats(self) -> Dict[str, Any]:
         queue_length = await self.get_queue_length()
+        async with self.queue_lock:
+            pending = {name: sum(1 for request in self.queue if request.priority == name) for name in PRIORITY_CLASSES}
+            pending_users = len({request.user_id for request in self.queue})
         return {
+            "priority_classes": {
+                name: {
+                    "pending": pending[name],
+                    "device_share": self._device_share(name),
+                    "queue_wait": self._percentiles(self.queue_waits[name]),
+                }
+                for name in PRIORITY_CLASSES
+            },
+            "bulk_share_target": self.bulk_share,
+            "pending_users": pending_users,
+            "device_seconds_by_user": {str(user_id): seconds for user_id, seconds in self.user_device_seconds.items()},
             "queue_length": queue_length,
             "batch_size": self.batch_size,
             "batch_wait_time": self.batch_wait_time,
+            "batches_processed": self.total_batches,
+            "avg_batch_size": self.total_requests_batched / self.total_batches if self.total_batches else 0.0,
             "processor_running": self._processor_task is not None and not self._processor_task.done()
         }
 
 
 class TTSBatchProcessor(BatchProcessor):
+    _instance: Optional['TTSBatchProcessor'] = None
+    _lock = asyncio.Lock()
 
-    def __init__(self, process_func: Callable, batch_size: int = None, batch_wait_time: float = None):
+    VARIANTS = {
+        "custom_voice": "custom-voice",
+        "voice_design": "voice-design",
+        "voice_clone": "base",
+    }
+    SAMPLING_PARAMS = ("max_new_tokens", "temperature", "top_k", "top_p", "repetition_penalty")
+    # Fixed per-request cost in characters, covering prompt encoding and decoder warm-up
+    REQUEST_OVERHEAD_CHARS = 20
+
+    def __init__(self, batch_size: int = None, batch_wait_time: float = None):
         super().__init__(batch_size, batch_wait_time)
-        self.process_func = process_func
+        self.gpu_lock = asyncio.Lock()
+        self.model_loader: Optional[Callable[[str], Awaitable[Any]]] = None
+        # Per-user usage waiting to be written; batches only add to it, a delayed flush writes it off the loop
+        self._pending_usage: Dict[int, Dict[str, float]] = {}
+        self._usage_flush_task: Optional[asyncio.Task] = None
 
-    async def _execute_single_request(self, data: Dict[str, Any]) -> Any:
-        return await self.process_func(**data)
+    @asynccontextmanager
+    async def use_model(self, variant: str) -> AsyncIterator[Any]:
+        """Load `variant` and keep it from being evicted until the block exits."""
+        if self.model_loader is not None:
+            yield await self.model_loader(variant)
+            return
+        from core.model_manager import ModelManager
+        model_manager = await ModelManager.get_instance()
+        async with model_manager.use_model(variant) as tts:
+            yield tts
+
+    def _estimate_cost(self, data: Dict[str, Any]) -> float:
+        return float(len(data["params"].get("text") or "") + self.REQUEST_OVERHEAD_CHARS)
+
+    async def _record_usage(self, batch: List[BatchRequest], elapsed: float) -> None:
+        await super()._record_usage(batch, elapsed)
+
+        total_cost = sum(request.cost for request in batch) or 1.0
+        for request in batch:
+            # Every user sharing a request is billed for it; its device time is split between them
+            users = self._users(request)
+            for user_id in users:
+                if user_id is None:
+                    continue
+                totals = self._pending_usage.setdefault(user_id, {"device_seconds": 0.0, "requests": 0, "characters": 0})
+                totals["device_seconds"] += elapsed * request.cost / total_cost / len(users)
+                totals["requests"] += 1
+                totals["characters"] += len(request.data["params"].get("text") or "")
+
+        if self._pending_usage and (self._usage_flush_task is None or self._usage_flush_task.done()):
+            self._usage_flush_task = asyncio.create_task(self._flush_usage_later())
+
+    async def _flush_usage_later(self) -> None:
+        await asyncio.sleep(settings.USAGE_FLUSH_SECONDS)
+        await self.flush_usage()
+
+    async def flush_usage(self) -> int:
+        pending, self._pending_usage = self._pending_usage, {}
+        if not pending:
+            return 0
+        try:
+            await asyncio.to_thread(self._write_usage, pending)
+        except Exception as e:
+            logger.warning(f"Failed to record device usage of {len(pending)} users: {e}")
+        return len(pending)
+
+    @staticmethod
+    def _write_usage(usage: Dict[int, Dict[str, float]]) -> None:
+        from db.database import SessionLocal
+        from db.crud import record_user_usage
+        db = SessionLocal()
+        try:
+            record_user_usage(db, usage)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _is_cancelled(data: Dict[str, Any]) -> bool:
+        token = data.get("cancel_token")
+        return token is not None and token.is_set()
+
+    def _batch_key(self, data: Dict[str, Any]) -> Hashable:
+        mode = data["mode"]
+        params = data["params"]
+        key = (mode,) + tuple(params.get(name) for name in self.SAMPLING_PARAMS)
+        prompt = data.get("voice_clone_prompt")
+        if mode == "voice_clone" and not (isinstance(prompt, list) and len(prompt) == 1):
+            # Prompts stored as dicts or raw arrays cannot be concatenated with others
+            key += (id(data),)
+        elif params.get("seed") is not None:
+            # A batch shares one random generator, so a caller-chosen seed only reproduces when run alone
+            key += (id(data),)
+        return key
+
+    @staticmethod
+    def _batch_seed(items: List[Dict[str, Any]]) -> Optional[int]:
+        seeds = [data.get("seed") for data in items]
+        if any(seed is None for seed in seeds):
+            return None
+        if len(seeds) == 1:
+            return seeds[0]
+        import hashlib
+        return int(hashlib.sha256(repr(seeds).encode()).hexdigest()[:8], 16)
+
+    @staticmethod
+    def _seeded(seed: int, generate: Callable[[], Any]) -> Any:
+        import torch
+        # Runs under gpu_lock, so no other generation draws from the generator in between
+        torch.manual_seed(seed)
+        return generate()
+
+    async def _execute_batch(self, items: List[Dict[str, Any]]) -> List[Tuple[Any, int]]:
+        from core.cancellation import GenerationCancelled
+
+        cancelled = [self._is_cancelled(data) for data in items]
+        if any(cancelled):
+            # Requests cancelled while queued are dropped before the batch reaches the device
+            live = [data for data, is_cancelled in zip(items, cancelled) if not is_cancelled]
+            live_results = iter(await self._execute_batch(live) if live else [])
+            return [
+                GenerationCancelled("Generation cancelled") if is_cancelled else next(live_results)
+                for is_cancelled in cancelled
+            ]
+
+        mode = items[0]["mode"]
+        # Held until the batch has left the device, so loading another variant cannot move these weights mid-run
+        async with self.use_model(self.VARIANTS[mode]) as tts:
+            generate = self._build_generate(tts, items)
+            loop = asyncio.get_running_loop()
+            async with self.gpu_lock:
+                wavs, sample_rate = await loop.run_in_executor(None, generate)
+
+        if len(items) > 1:
+            logger.info(f"Generated {len(items)} {mode} requests in one batch")
+        # A request cancelled mid-generation has no waveform; its batchmates are unaffected
+        return [
+            (wav, sample_rate) if wav is not None else GenerationCancelled("Generation cancelled")
+            for wav in wavs
+        ]
+
+    def _build_generate(self, tts: Any, items: List[Dict[str, Any]]) -> Callable[[], Any]:
+        mode = items[0]["mode"]
+        params = items[0]["params"]
+        kwargs = {name: params[name] for name in self.SAMPLING_PARAMS}
+        kwargs["cancel_token"] = [data.get("cancel_token") for data in items]
+        texts = [data["params"]["text"] for data in items]
+        languages = [data["params"]["language"] for data in items]
+
+        if mode == "custom_voice":
+            generate = functools.partial(
+                tts.generate_custom_voice,
+                text=texts,
+                language=languages,
+                speaker=[data["params"]["speaker"] for data in items],
+                instruct=[data["params"].get("instruct") or "" for data in items],
+                **kwargs,
+            )
+        elif mode == "voice_design":
+            generate = functools.partial(
+                tts.generate_voice_design,
+                text=texts,
+                language=languages,
+                instruct=[data["params"]["instruct"] for data in items],
+                **kwargs,
+            )
+        else:
+            prompt = items[0]["voice_clone_prompt"]
+            if len(items) > 1:
+                prompt = [data["voice_clone_prompt"][0] for data in items]
+            generate = functools.partial(
+                tts.generate_voice_clone,
+                text=texts,
+                language=languages,
+                voice_clone_prompt=prompt,
+                **kwargs,
+            )
+
+        seed = self._batch_seed(items)
+        if seed is not None:
+            generate = functools.partial(self._seeded, seed, generate)
+        return generate
@@ -1,7 +1,9 @@
 import hashlib
 import asyncio
+import dataclasses
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 import numpy as np
@@ -9,7 +11,6 @@ import numpy as np
 from sqlalchemy.orm import Session
 from db.crud import (
     create_cache_entry,
-    get_cache_entry,
     list_cache_entries,
     delete_cache_entry
 )
@@ -19,16 +20,72 @@ from core.config import settings
 logger = logging.getLogger(__name__)
 
 
+def _nbytes(value) -> int:
+    if hasattr(value, "element_size"):
+        return value.element_size() * value.nelement()
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(_nbytes(getattr(value, field.name)) for field in dataclasses.fields(value))
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    return 0
+
+
+def _to_device(value, device):
+    if hasattr(value, "detach"):
+        return value.to(device)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.replace(value, **{
+            field.name: _to_device(getattr(value, field.name), device) for field in dataclasses.fields(value)
+        })
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_device(item, device) for item in value)
+    if isinstance(value, dict):
+        return {key: _to_device(item, device) for key, item in value.items()}
+    return value
+
+
+@dataclasses.dataclass
+class _HotEntry:
+    user_id: int
+    ref_audio_hash: str
+    data: Any
+    metadata: Optional[str]
+    nbytes: int
+
+
 class VoiceCacheManager:
+    """
+    Voice clone prompts in two tiers: loaded prompts in an in-process LRU bounded by `memory_bytes`, in front of
+    the prompt files on disk and their rows in the database. Access statistics are counted in memory and written
+    by `flush_access_stats`, instead of one commit per read.
+
+    The memory tier is per process; a prompt file is never rewritten under the same cache id, so hot entries stay
+    valid until the entry is evicted.
+    """
+
     _instance = None
     _lock = asyncio.Lock()
 
-    def __init__(self, cache_dir: str, max_entries: int, ttl_days: int):
+    def __init__(self, cache_dir: str, max_entries: int, ttl_days: int, memory_bytes: int = 0):
         self.cache_dir = Path(cache_dir)
         self.max_entries = max_entries
         self.ttl_days = ttl_days
+        self.memory_bytes = memory_bytes
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"VoiceCacheManager initialized: dir={cache_dir}, max={max_entries}, ttl={ttl_days}d")
+        self._hot: "OrderedDict[int, _HotEntry]" = OrderedDict()
+        self._hot_ids: Dict[Tuple[int, str], int] = {}
+        self.hot_size = 0
+        self.hot_hits = 0
+        self.hot_misses = 0
+        self._pending_access: Dict[int, Tuple[int, datetime]] = {}
+        logger.info(
+            f"VoiceCacheManager initialized: dir={cache_dir}, max={max_entries}, ttl={ttl_days}d, "
+            f"memory={memory_bytes / 1024**2:.0f}MB"
+        )
 
     @classmethod
     async def get_instance(cls) -> 'VoiceCacheManager':
@@ -38,7 +95,8 @@ class VoiceCacheManager:
                     cls._instance = VoiceCacheManager(
                         cache_dir=settings.CACHE_DIR,
                         max_entries=settings.MAX_CACHE_ENTRIES,
-                        ttl_days=settings.CACHE_TTL_DAYS
+                        ttl_days=settings.CACHE_TTL_DAYS,
+                        memory_bytes=settings.VOICE_CACHE_MEMORY_MB * 1024**2
                     )
         return cls._instance
 
@@ -46,38 +104,138 @@ class VoiceCacheManager:
         return hashlib.sha256(audio_data).hexdigest()
 
     def _load_cache_file(self, cache_file: Path):
+        from qwen_tts import load_voice_clone_prompt
+        return load_voice_clone_prompt(str(cache_file))
+
+    @staticmethod
+    def _load_legacy_file(cache_file: Path):
         if cache_file.suffix == '.pt':
             import torch
-            return torch.load(cache_file, weights_only=False)
+            from qwen_tts import VoiceClonePromptItem
+            with torch.serialization.safe_globals([VoiceClonePromptItem]):
+                return torch.load(cache_file, map_location="cpu", weights_only=True)
         with open(cache_file, 'rb') as f:
             return np.load(f, allow_pickle=False)
 
+    def _migrate(self, cache_entry: VoiceCache, cache_file: Path, db: Session) -> Path:
+        """Rewrite a .pt / .npy entry of earlier versions as safetensors the first time it is read."""
+        from qwen_tts import save_voice_clone_prompt
+        from qwen_tts.inference.qwen3_tts_model import voice_clone_prompt_items
+
+        migrated_file = cache_file.with_suffix('.safetensors')
+        if not migrated_file.exists():
+            save_voice_clone_prompt(voice_clone_prompt_items(self._load_legacy_file(cache_file)), str(migrated_file))
+        cache_entry.cache_path = str(migrated_file)
+        db.commit()
+        cache_file.unlink(missing_ok=True)
+        logger.info(f"Cache migrated to safetensors: cache_id={cache_entry.id}, from={cache_file.name}")
+        return migrated_file
+
+    @staticmethod
+    def _prompt_device() -> Optional[str]:
+        # With INFERENCE_WORKERS prompts are pickled to the workers, which place them themselves
+        if settings.INFERENCE_WORKERS:
+            return None
+        import torch
+        if settings.MODEL_DEVICE.startswith("cuda") and not torch.cuda.is_available():
+            return None
+        return settings.MODEL_DEVICE
+
+    def _remember(self, cache_id: int, user_id: int, ref_audio_hash: str, data: Any, metadata: Optional[str]) -> Any:
+        device = self._prompt_device()
+        if device is not None:
+            data = _to_device(data, device)
+        nbytes = _nbytes(data)
+        if nbytes > self.memory_bytes:
+            return data
+
+        self._forget(cache_id)
+        self._hot[cache_id] = _HotEntry(user_id, ref_audio_hash, data, metadata, nbytes)
+        self._hot_ids[(user_id, ref_audio_hash)] = cache_id
+        self.hot_size += nbytes
+        while self.hot_size > self.memory_bytes:
+            evicted_id = next(iter(self._hot))
+            self._forget(evicted_id)
+        return data
+
+    def _forget(self, cache_id: int) -> None:
+        entry = self._hot.pop(cache_id, None)
+        if entry is None:
+            return
+        self.hot_size -= entry.nbytes
+        if self._hot_ids.get((entry.user_id, entry.ref_audio_hash)) == cache_id:
+            del self._hot_ids[(entry.user_id, entry.ref_audio_hash)]
+
+    def _hot_result(self, cache_id: int) -> Optional[Dict[str, Any]]:
+        entry = self._hot.get(cache_id)
+        if entry is None:
+            self.hot_misses += 1
+            return None
+        self._hot.move_to_end(cache_id)
+        self.hot_hits += 1
+        self._record_access(cache_id)
+        return {
+            'cache_id': cache_id,
+            'data': entry.data,
+            'metadata': entry.metadata
+        }
+
+    def _record_access(self, cache_id: int) -> None:
+        count, _ = self._pending_access.get(cache_id, (0, None))
+        self._pending_access[cache_id] = (count + 1, datetime.utcnow())
+
+    def _load_entry(self, cache_entry: VoiceCache, db: Session, delete_missing: bool) -> Optional[Dict[str, Any]]:
+        cache_file = Path(cache_entry.cache_path)
+        if not cache_file.exists() and cache_file.with_suffix('.safetensors').exists():
+            # Migrated by another process
+            cache_file = cache_file.with_suffix('.safetensors')
+        if not cache_file.exists():
+            logger.warning(f"Cache file missing: {cache_file}")
+            if delete_missing:
+                delete_cache_entry(db, cache_entry.id, cache_entry.user_id)
+            return None
+
+        resolved_cache_file = cache_file.resolve()
+        if not resolved_cache_file.is_relative_to(self.cache_dir.resolve()):
+            logger.warning(f"Cache path out of cache dir: {resolved_cache_file}")
+            return None
+
+        if cache_file.suffix != '.safetensors':
+            cache_file = self._migrate(cache_entry, cache_file, db)
+
+        cache_data = self._remember(
+            cache_entry.id,
+            cache_entry.user_id,
+            cache_entry.ref_audio_hash,
+            self._load_cache_file(cache_file),
+            cache_entry.meta_data
+        )
+        self._record_access(cache_entry.id)
+        return {
+            'cache_id': cache_entry.id,
+            'data': cache_data,
+            'metadata': cache_entry.meta_data
+        }
+
     async def get_cache(self, user_id: int, ref_audio_hash: str, db: Session) -> Optional[Dict[str, Any]]:
         try:
-            cache_entry = get_cache_entry(db, user_id, ref_audio_hash)
+            cache_id = self._hot_ids.get((user_id, ref_audio_hash))
+            if cache_id is not None:
+                return self._hot_result(cache_id)
+            self.hot_misses += 1
+
+            cache_entry = db.query(VoiceCache).filter(
+                VoiceCache.user_id == user_id,
+                VoiceCache.ref_audio_hash == ref_audio_hash
+            ).first()
             if not cache_entry:
                 logger.debug(f"Cache miss: user={user_id}, hash={ref_audio_hash[:8]}...")
                 return None
 
-            cache_file = Path(cache_entry.cache_path)
-            if not cache_file.exists():
-                logger.warning(f"Cache file missing: {cache_file}")
-                delete_cache_entry(db, cache_entry.id, user_id)
-                return None
-
-            resolved_cache_file = cache_file.resolve()
-            if not resolved_cache_file.is_relative_to(self.cache_dir.resolve()):
-                logger.warning(f"Cache path out of cache dir: {resolved_cache_file}")
-                return None
-
-            cache_data = self._load_cache_file(cache_file)
-
-            logger.info(f"Cache hit: user={user_id}, hash={ref_audio_hash[:8]}..., access_count={cache_entry.access_count}")
-            return {
-                'cache_id': cache_entry.id,
-                'data': cache_data,
-                'metadata': cache_entry.meta_data
-            }
+            result = self._load_entry(cache_entry, db, delete_missing=True)
+            if result:
+                logger.info(f"Cache hit: user={user_id}, hash={ref_audio_hash[:8]}..., loaded from disk")
+            return result
 
         except Exception as e:
             logger.error(f"Cache retrieval error: {e}", exc_info=True)
@@ -85,37 +243,68 @@ class VoiceCacheManager:
 
     async def get_cache_by_id(self, cache_id: int, db: Session) -> Optional[Dict[str, Any]]:
         try:
+            result = self._hot_result(cache_id)
+            if result:
+                return result
+
             cache_entry = db.query(VoiceCache).filter(VoiceCache.id == cache_id).first()
             if not cache_entry:
                 logger.debug(f"Cache not found: id={cache_id}")
                 return None
 
-            cache_file = Path(cache_entry.cache_path)
-            if not cache_file.exists():
-                logger.warning(f"Cache file missing: {cache_file}")
-                return None
+            result = self._load_entry(cache_entry, db, delete_missing=False)
+            if result:
+                logger.info(f"Cache loaded by id: cache_id={cache_id}, loaded from disk")
+            return result
 
-            resolved_cache_file = cache_file.resolve()
-            if not resolved_cache_file.is_relative_to(self.cache_dir.resolve()):
-                logger.warning(f"Cache path out of cache dir: {resolved_cache_file}")
-                return None
-
-            cache_data = self._load_cache_file(cache_file)
+        except Exception as e:
+            logger.error(f"Cache retrieval by id error: {e}", exc_info=True)
+            return None
 
-            cache_entry.last_accessed = datetime.utcnow()
-            cache_entry.access_count += 1
+    def flush_access_stats(self, db: Session) -> int:
+        if not self._pending_access:
+            return 0
+        pending, self._pending_access = self._pending_access, {}
+        try:
+            for cache_id, (count, last_accessed) in pending.items():
+                db.query(VoiceCache).filter(VoiceCache.id == cache_id).update(
+                    {
+                        VoiceCache.access_count: VoiceCache.access_count + count,
+                        VoiceCache.last_accessed: last_accessed
+                    },
+                    synchronize_session=False
+                )
             db.commit()
+        except Exception as e:
+            logger.error(f"Cache access stats flush error: {e}", exc_info=True)
+            db.rollback()
+            for cache_id, (count, last_accessed) in pending.items():
+                newer_count, newer_accessed = self._pending_access.get(cache_id, (0, last_accessed))
+                self._pending_access[cache_id] = (count + newer_count, max(last_accessed, newer_accessed))
+            return 0
+        logger.debug(f"Flushed access stats of {len(pending)} cache entries")
+        return len(pending)
 
-            logger.info(f"Cache loaded by id: cache_id={cache_id}, access_count={cache_entry.access_count}")
-            return {
-                'cache_id': cache_entry.id,
-                'data': cache_data,
-                'metadata': cache_entry.meta_data
-            }
+    async def flush_stats(self) -> None:
+        from core.database import SessionLocal
 
-        except Exception as e:
-            logger.error(f"Cache retrieval by id error: {e}", exc_info=True)
-            return None
+        db = SessionLocal()
+        try:
+            self.flush_access_stats(db)
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hot_hits + self.hot_misses
+        return {
+            "memory_entries": len(self._hot),
+            "memory_size_mb": self.hot_size / 1024**2,
+            "memory_max_mb": self.memory_bytes / 1024**2,
+            "memory_hits": self.hot_hits,
+            "memory_misses": self.hot_misses,
+            "memory_hit_rate": self.hot_hits / total if total else 0.0,
+            "pending_access_updates": len(self._pending_access),
+        }
 
     async def set_cache(
         self,
@@ -126,20 +315,13 @@ class VoiceCacheManager:
         db: Session
     ) -> str:
         async with self._lock:
+            from qwen_tts import save_voice_clone_prompt
+            from qwen_tts.inference.qwen3_tts_model import voice_clone_prompt_items
+
+            cache_path = self.cache_dir / f"{user_id}_{ref_audio_hash}.safetensors"
             try:
-                if hasattr(cache_data, "detach"):
-                    cache_data = cache_data.detach().cpu().numpy()
-
-                if isinstance(cache_data, np.ndarray):
-                    cache_filename = f"{user_id}_{ref_audio_hash}.npy"
-                    cache_path = self.cache_dir / cache_filename
-                    with open(cache_path, 'wb') as f:
-                        np.save(f, cache_data, allow_pickle=False)
-                else:
-                    import torch
-                    cache_filename = f"{user_id}_{ref_audio_hash}.pt"
-                    cache_path = self.cache_dir / cache_filename
-                    torch.save(cache_data, cache_path)
+                cache_data = voice_clone_prompt_items(cache_data)
+                save_voice_clone_prompt(cache_data, str(cache_path))
 
                 cache_entry = create_cache_entry(
                     db=db,
@@ -148,6 +330,7 @@ class VoiceCacheManager:
                     cache_path=str(cache_path),
                     meta_data=metadata
                 )
+                self._remember(cache_entry.id, user_id, ref_audio_hash, cache_data, cache_entry.meta_data)
 
                 await self.enforce_max_entries(user_id, db)
 
@@ -162,6 +345,8 @@ class VoiceCacheManager:
 
     async def enforce_max_entries(self, user_id: int, db: Session) -> int:
         try:
+            # Recency comes from last_accessed
+            self.flush_access_stats(db)
             all_caches = list_cache_entries(db, user_id, skip=0, limit=9999)
             if len(all_caches) <= self.max_entries:
                 return 0
@@ -175,6 +360,7 @@ class VoiceCacheManager:
                     cache_file.unlink()
 
                 delete_cache_entry(db, cache.id, user_id)
+                self._forget(cache.id)
                 deleted_count += 1
 
             if deleted_count > 0:
@@ -188,6 +374,7 @@ class VoiceCacheManager:
 
     async def cleanup_expired(self, db: Session) -> int:
         try:
+            self.flush_access_stats(db)
             cutoff_date = datetime.utcnow() - timedelta(days=self.ttl_days)
             expired_caches = db.query(VoiceCache).filter(
                 VoiceCache.last_accessed < cutoff_date
@@ -200,6 +387,7 @@ class VoiceCacheManager:
                     cache_file.unlink()
 
                 db.delete(cache)
+                self._forget(cache.id)
                 deleted_count += 1
 
             if deleted_count > 0:
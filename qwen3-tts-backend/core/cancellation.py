@@ -0,0 +1,61 @@
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from core.event_bus import get_event_bus
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+# Tokens of running generations, keyed by what they were started for (a job, an audiobook project).
+# They are threading.Events because the model checks them from the executor thread at every decoding step.
+_tokens: Dict[str, List[threading.Event]] = {}
+
+
+def _on_cancel(message: dict) -> None:
+    tokens = _tokens.get(message["key"], ())
+    for token in tokens:
+        token.set()
+    if tokens:
+        logger.info(f"Cancelled {len(tokens)} running generations for {message['key']}")
+
+
+get_event_bus().subscribe("generation.cancel", _on_cancel)
+
+
+def job_key(job_id: int) -> str:
+    return f"job:{job_id}"
+
+
+def audiobook_key(project_id: int) -> str:
+    return f"audiobook:{project_id}"
+
+
+def register(key: Optional[str]) -> threading.Event:
+    token = threading.Event()
+    if key is not None:
+        _tokens.setdefault(key, []).append(token)
+    return token
+
+
+def release(key: Optional[str], token: threading.Event) -> None:
+    tokens = _tokens.get(key)
+    if tokens is None:
+        return
+    if token in tokens:
+        tokens.remove(token)
+    if not tokens:
+        del _tokens[key]
+
+
+def cancel(key: str) -> None:
+    """Stop the running generations registered under `key`, in whichever process runs them."""
+    get_event_bus().publish("generation.cancel", {"key": key})
+
+
+def get_stats() -> dict:
+    return {"running": sum(len(tokens) for tokens in _tokens.values())}
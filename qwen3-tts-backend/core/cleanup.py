@@ -1,4 +1,5 @@
 import logging
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from sqlalchemy import create_engine
@@ -6,7 +7,7 @@ from sqlalchemy.orm import sessionmaker
 
 from core.config import settings
 from core.cache_manager import VoiceCacheManager
-from db.models import Job
+from db.models import Job, QueuedTask, TaskStatus
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +107,18 @@ async def cleanup_orphaned_files(db_url: str) -> dict:
         from db.models import VoiceCache
         cache_files_in_db = {Path(cache.cache_path).name for cache in db.query(VoiceCache.cache_path).all()}
 
+        # Reference audio still needed by queued or running tasks; failed, abandoned and deleted tasks leave theirs behind
+        pending_tasks = db.query(QueuedTask.payload).filter(
+            QueuedTask.status.in_([TaskStatus.QUEUED.value, TaskStatus.LEASED.value])
+        ).all()
+        uploads_in_use = {
+            Path(task.payload["ref_audio_path"]).name
+            for task in pending_tasks
+            if isinstance(task.payload, dict) and task.payload.get("ref_audio_path")
+        }
+        # Uploads are written just before their task is enqueued, so recent ones may not be referenced yet
+        upload_cutoff = time.time() - settings.ORPHAN_UPLOAD_MAX_AGE_HOURS * 3600
+
         deleted_orphans = 0
         freed_space_bytes = 0
 
@@ -117,8 +130,20 @@ async def cleanup_orphaned_files(db_url: str) -> dict:
                     deleted_orphans += 1
                     freed_space_bytes += size
 
+        upload_dir = output_dir / "uploads"
+        if upload_dir.exists():
+            for upload_file in upload_dir.glob("*.wav"):
+                if upload_file.name in uploads_in_use:
+                    continue
+                stat = upload_file.stat()
+                if stat.st_mtime > upload_cutoff:
+                    continue
+                upload_file.unlink()
+                deleted_orphans += 1
+                freed_space_bytes += stat.st_size
+
         if cache_dir.exists():
-            for pattern in ("*.npy", "*.pkl"):
+            for pattern in ("*.safetensors", "*.pt", "*.npy", "*.pkl"):
                 for cache_file in cache_dir.glob(pattern):
                     if cache_file.name not in cache_files_in_db:
                         size = cache_file.stat().st_size
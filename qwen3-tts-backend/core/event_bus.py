@@ -0,0 +1,212 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], None]
+
+
+class EventBus:
+    """
+    Topic-based pub/sub shared by every process of a deployment.
+
+    `publish` runs the handlers of the current process synchronously and, for distributed backends, forwards
+    the message to the handlers of all other processes. Handlers run on the event loop and must not block.
+    """
+
+    distributed = False
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self.published = 0
+        self.received = 0
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        self._handlers[topic].append(handler)
+
+    def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        self.published += 1
+        self._dispatch(topic, message)
+
+    def _dispatch(self, topic: str, message: Dict[str, Any]) -> None:
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error(f"Event bus handler for {topic} failed: {e}", exc_info=True)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "published": self.published,
+            "received": self.received,
+        }
+
+
+class MemoryEventBus(EventBus):
+    pass
+
+
+class SQLiteEventBus(EventBus):
+    """
+    Relays messages between processes through an append-only table in a shared SQLite file. Outgoing messages
+    are written in one transaction per flush; every process polls for rows written by the others.
+    """
+
+    distributed = True
+
+    def __init__(self, path: str, poll_interval: float, retention_seconds: float):
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.flushes = 0
+        self._outbox: List[Tuple[str, Dict[str, Any]]] = []
+        self._last_id = 0
+        self._last_prune = 0.0
+        self._conn: Optional[sqlite3.Connection] = None
+        # One thread owns the connection, so SQLite never blocks the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-bus")
+        self._task: Optional[asyncio.Task] = None
+
+    def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        super().publish(topic, message)
+        if self._outbox and self._outbox[-1][0] == topic == "progress":
+            previous = self._outbox[-1][1]
+            # Streamed tokens for the same log travel as one row per flush
+            if previous["op"] == message["op"] == "token" and previous["key"] == message["key"]:
+                previous["text"] += message["text"]
+                return
+        self._outbox.append((topic, dict(message)))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS bus_messages ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT NOT NULL, origin TEXT NOT NULL, "
+            "payload TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM bus_messages").fetchone()[0]
+        return conn
+
+    def _exchange(self, outgoing: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[int, str, str]]:
+        conn = self._conn
+        now = time.time()
+        written_id = 0
+        if outgoing:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO bus_messages (topic, origin, payload, created_at) VALUES (?, ?, ?, ?)",
+                    [(topic, self.origin, json.dumps(message), now) for topic, message in outgoing]
+                )
+                # Writers are serialized, so every lower id was committed before this transaction
+                written_id = conn.execute("SELECT MAX(id) FROM bus_messages").fetchone()[0]
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        if now - self._last_prune > self.retention_seconds / 2:
+            self._last_prune = now
+            conn.execute("DELETE FROM bus_messages WHERE created_at < ?", (now - self.retention_seconds,))
+
+        rows = conn.execute(
+            "SELECT id, topic, payload FROM bus_messages WHERE id > ? AND origin != ? ORDER BY id",
+            (self._last_id, self.origin)
+        ).fetchall()
+        self._last_id = max(self._last_id, written_id, rows[-1][0] if rows else 0)
+        return rows
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._conn = await loop.run_in_executor(self._executor, self._connect)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"SQLite event bus started at {self.path} as {self.origin}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        loop = asyncio.get_running_loop()
+        # Deliver what was published during shutdown
+        if self._outbox:
+            outgoing, self._outbox = self._outbox, []
+            await loop.run_in_executor(self._executor, self._exchange, outgoing)
+        await loop.run_in_executor(self._executor, self._conn.close)
+        self._conn = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            outgoing, self._outbox = self._outbox, []
+            try:
+                rows = await loop.run_in_executor(self._executor, self._exchange, outgoing)
+            except asyncio.CancelledError:
+                self._outbox[:0] = outgoing
+                raise
+            except Exception as e:
+                logger.error(f"Event bus exchange failed: {e}")
+                self._outbox[:0] = outgoing
+                rows = []
+
+            if outgoing:
+                self.flushes += 1
+            for _, topic, payload in rows:
+                self.received += 1
+                self._dispatch(topic, json.loads(payload))
+
+            await asyncio.sleep(self.poll_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "sqlite",
+            "origin": self.origin,
+            "published": self.published,
+            "received": self.received,
+            "flushes": self.flushes,
+            "pending": len(self._outbox),
+        }
+
+
+_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    global _bus
+    if _bus is None:
+        if settings.EVENT_BUS == "sqlite":
+            _bus = SQLiteEventBus(
+                settings.EVENT_BUS_PATH,
+                settings.EVENT_BUS_POLL_INTERVAL,
+                settings.EVENT_BUS_RETENTION_SECONDS
+            )
+        elif settings.EVENT_BUS == "memory":
+            _bus = MemoryEventBus()
+        else:
+            raise ValueError(f"Unknown EVENT_BUS backend: {settings.EVENT_BUS}")
+    return _bus
@@ -0,0 +1,242 @@
+import asyncio
+import itertools
+import logging
+import pickle
+import struct
+from contextlib import aclosing
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("!I")
+
+# Audio smaller than this is sent inline, larger buffers go through shared memory
+SHM_THRESHOLD_BYTES = 256 * 1024
+
+
+async def send_message(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    writer.write(_HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+async def read_message(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    header = await reader.readexactly(_HEADER.size)
+    (length,) = _HEADER.unpack(header)
+    return pickle.loads(await reader.readexactly(length))
+
+
+def pack_audio(audio: bytes) -> Dict[str, Any]:
+    if len(audio) < SHM_THRESHOLD_BYTES:
+        return {"inline": audio}
+
+    shm = shared_memory.SharedMemory(create=True, size=len(audio))
+    # The receiving process owns the segment from here on and unlinks it after reading
+    resource_tracker.unregister(shm._name, "shared_memory")
+    shm.buf[:len(audio)] = audio
+    descriptor = {"shm": shm.name, "size": len(audio)}
+    shm.close()
+    return descriptor
+
+
+def unpack_audio(descriptor: Dict[str, Any]) -> bytes:
+    if "inline" in descriptor:
+        return descriptor["inline"]
+
+    shm = shared_memory.SharedMemory(name=descriptor["shm"])
+    try:
+        return bytes(shm.buf[:descriptor["size"]])
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def release_audio(descriptor: Optional[Dict[str, Any]]) -> None:
+    if not descriptor or "shm" not in descriptor:
+        return
+    try:
+        shm = shared_memory.SharedMemory(name=descriptor["shm"])
+        shm.close()
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _raise_for_error(reply: Dict[str, Any]) -> None:
+    if not reply.get("error"):
+        return
+    if reply.get("cancelled"):
+        from core.cancellation import GenerationCancelled
+        raise GenerationCancelled(reply["error"])
+    raise RuntimeError(reply["error"])
+
+
+class InferenceWorkerClient:
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.last_op: Optional[str] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # A future for single replies, a queue for streamed ones
+        self._pending: Dict[int, Union[asyncio.Future, asyncio.Queue]] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def _ensure_connected(self) -> None:
+        async with self._connect_lock:
+            if self.connected:
+                return
+            reader, writer = await asyncio.open_unix_connection(self.socket_path)
+            self._writer = writer
+            self._reader_task = asyncio.create_task(self._read_replies(reader))
+            logger.info(f"Connected to inference worker at {self.socket_path}")
+
+    async def _read_replies(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                message = await read_message(reader)
+                if "audio" in message:
+                    # Copy out of shared memory right away so the segment is freed even if the caller is gone
+                    message["audio"] = unpack_audio(message["audio"])
+                replies = self._pending.get(message["id"])
+                if isinstance(replies, asyncio.Queue):
+                    replies.put_nowait(message)
+                    if message.get("done") or message.get("error"):
+                        self._pending.pop(message["id"], None)
+                    continue
+                future = self._pending.pop(message["id"], None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            logger.warning(f"Lost connection to inference worker at {self.socket_path}: {e}")
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+            self._writer = None
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                error = ConnectionError(f"Inference worker at {self.socket_path} disconnected")
+                if isinstance(future, asyncio.Queue):
+                    future.put_nowait(error)
+                elif not future.done():
+                    future.set_exception(error)
+
+    async def call(self, op: str, **kwargs) -> Dict[str, Any]:
+        await self._ensure_connected()
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.last_op = op
+        try:
+            async with self._write_lock:
+                await send_message(self._writer, {"id": request_id, "op": op, **kwargs})
+            reply = await future
+        finally:
+            self._pending.pop(request_id, None)
+
+        _raise_for_error(reply)
+        return reply
+
+    async def stream(self, op: str, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        await self._ensure_connected()
+
+        request_id = next(self._ids)
+        replies: asyncio.Queue = asyncio.Queue()
+        self._pending[request_id] = replies
+        self.last_op = op
+        finished = False
+        try:
+            async with self._write_lock:
+                await send_message(self._writer, {"id": request_id, "op": op, **kwargs})
+            while True:
+                reply = await replies.get()
+                if isinstance(reply, Exception):
+                    raise reply
+                if reply.get("error") or reply.get("done"):
+                    finished = True
+                _raise_for_error(reply)
+                if reply.get("done"):
+                    return
+                yield reply
+        finally:
+            self._pending.pop(request_id, None)
+            if not finished and self.connected:
+                # Abandoned by the consumer: the worker would otherwise synthesize the rest for nobody
+                try:
+                    async with self._write_lock:
+                        await send_message(self._writer, {"id": next(self._ids), "op": "cancel", "target": request_id})
+                except ConnectionError as e:
+                    logger.warning(f"Could not cancel stream {request_id}: {e}")
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+
+
+class InferenceWorkerPool:
+    def __init__(self, socket_paths: List[str]):
+        if not socket_paths:
+            raise ValueError("At least one inference worker socket is required")
+        self.clients = [InferenceWorkerClient(path) for path in socket_paths]
+
+    def _candidates(self, op: str) -> List[InferenceWorkerClient]:
+        # Least loaded first; on ties prefer a worker that served the same operation last (model already resident)
+        return sorted(
+            self.clients,
+            key=lambda client: (not client.connected and client.last_op is not None, client.in_flight, client.last_op != op)
+        )
+
+    async def call(self, op: str, **kwargs) -> Dict[str, Any]:
+        last_error: Optional[Exception] = None
+        for client in self._candidates(op):
+            try:
+                return await client.call(op, **kwargs)
+            except (ConnectionError, FileNotFoundError) as e:
+                logger.warning(f"Inference worker {client.socket_path} unavailable for {op}: {e}")
+                last_error = e
+        raise ConnectionError(f"No inference worker available: {last_error}")
+
+    async def stream(self, op: str, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        last_error: Optional[Exception] = None
+        for client in self._candidates(op):
+            started = False
+            try:
+                async with aclosing(client.stream(op, **kwargs)) as replies:
+                    async for reply in replies:
+                        started = True
+                        yield reply
+                return
+            except (ConnectionError, FileNotFoundError) as e:
+                # Part of the audio has been delivered already, so the stream cannot be restarted elsewhere
+                if started:
+                    raise
+                logger.warning(f"Inference worker {client.socket_path} unavailable for {op}: {e}")
+                last_error = e
+        raise ConnectionError(f"No inference worker available: {last_error}")
+
+    async def health(self) -> List[Dict[str, Any]]:
+        results = []
+        for client in self.clients:
+            try:
+                reply = await asyncio.wait_for(client.call("health"), timeout=5)
+                results.append({"socket": client.socket_path, "available": True, **reply["health"]})
+            except Exception as e:
+                results.append({"socket": client.socket_path, "available": False, "error": str(e)})
+        return results
+
+    async def close(self) -> None:
+        for client in self.clients:
+            await client.close()
@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import dataclasses
+import logging
+import os
+import sys
+import time
+from contextlib import aclosing
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.cancellation import GenerationCancelled
+from core.config import settings
+from core.inference_ipc import pack_audio, read_message, release_audio, send_message
+
+logger = logging.getLogger(__name__)
+
+
+class FakeTTSModel:
+    """
+    Stand-in for Qwen3TTSModel that renders short tones, so the worker protocol can be exercised without weights.
+    `frame_delay` simulates the time spent decoding each 12Hz codec frame.
+    """
+
+    sample_rate = 24000
+    samples_per_frame = 1920
+
+    def __init__(self, frame_delay: float = 0.0):
+        self.frame_delay = frame_delay
+
+    def _render_one(self, text: str, index: int = 0) -> np.ndarray:
+        duration = min(0.2 + 0.05 * len(text), 10.0)
+        t = np.arange(int(duration * self.sample_rate), dtype=np.float32) / self.sample_rate
+        return (0.1 * np.sin(2 * np.pi * (220.0 + 20.0 * index) * t)).astype(np.float32)
+
+    def _render(self, texts: List[str], cancel_token=None) -> List[Optional[np.ndarray]]:
+        wavs = [self._render_one(text, index) for index, text in enumerate(texts)]
+        # A batch takes as long as its longest sample
+        time.sleep(self.frame_delay * max(len(wav) for wav in wavs) / self.samples_per_frame)
+        tokens = cancel_token if isinstance(cancel_token, list) else [cancel_token] * len(wavs)
+        return [None if token is not None and token.is_set() else wav for wav, token in zip(wavs, tokens)]
+
+    def generate_stream(self, mode: str, text: str, chunk_frames: int = 12, cancel_token=None, **kwargs):
+        wav = self._render_one(text)
+        step = chunk_frames * self.samples_per_frame
+        for start in range(0, len(wav), step):
+            if cancel_token is not None and cancel_token.is_set():
+                return
+            chunk = wav[start:start + step]
+            time.sleep(self.frame_delay * len(chunk) / self.samples_per_frame)
+            yield chunk, self.sample_rate
+
+    def generate_custom_voice(self, text, cancel_token=None, **kwargs):
+        return self._render(text if isinstance(text, list) else [text], cancel_token), self.sample_rate
+
+    def generate_voice_design(self, text, cancel_token=None, **kwargs):
+        return self._render(text if isinstance(text, list) else [text], cancel_token), self.sample_rate
+
+    def generate_voice_clone(self, text, cancel_token=None, **kwargs):
+        return self._render(text if isinstance(text, list) else [text], cancel_token), self.sample_rate
+
+    def create_voice_clone_prompt(self, ref_audio, ref_text=None, x_vector_only_mode=False):
+        return [{"ref_text": ref_text, "x_vector_only_mode": x_vector_only_mode}]
+
+
+def _to_cpu(value: Any) -> Any:
+    if hasattr(value, "detach") and hasattr(value, "cpu"):
+        return value.detach().cpu()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.replace(value, **{
+            field.name: _to_cpu(getattr(value, field.name)) for field in dataclasses.fields(value)
+        })
+    if isinstance(value, list):
+        return [_to_cpu(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_cpu(item) for key, item in value.items()}
+    return value
+
+
+class InferenceWorker:
+    def __init__(self, socket_path: str, fake: bool = False, fake_frame_delay: float = 0.0):
+        self.socket_path = socket_path
+        self.fake = fake
+        self.backend = None
+        self.requests_served = 0
+        self._fake_model = FakeTTSModel(fake_frame_delay) if fake else None
+
+    async def _load_fake_model(self, variant: str) -> FakeTTSModel:
+        return self._fake_model
+
+    async def start(self) -> asyncio.AbstractServer:
+        from core.event_bus import get_event_bus
+        from core.tts_service import LocalTTSBackend
+
+        # Cancellation of jobs and audiobook runs reaches the worker over the bus
+        await get_event_bus().start()
+        self.backend = LocalTTSBackend()
+        await self.backend.initialize()
+        if self.fake:
+            self.backend.batch_processor.model_loader = self._load_fake_model
+
+        Path(self.socket_path).parent.mkdir(parents=True, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        # Messages are pickled, so only the service user may connect
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"Inference worker listening on {self.socket_path} (device={settings.MODEL_DEVICE}, fake={self.fake})")
+        return server
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        write_lock = asyncio.Lock()
+        requests = set()
+        streams: Dict[int, asyncio.Task] = {}
+        try:
+            while True:
+                message = await read_message(reader)
+                if message["op"] == "cancel":
+                    # The client stopped reading a stream; closing it stops decoding
+                    stream = streams.get(message["target"])
+                    if stream is not None:
+                        stream.cancel()
+                    continue
+                task = asyncio.create_task(self._handle_request(message, writer, write_lock))
+                requests.add(task)
+                task.add_done_callback(requests.discard)
+                if message["op"] == "stream":
+                    streams[message["id"]] = task
+                    task.add_done_callback(lambda _, request_id=message["id"]: streams.pop(request_id, None))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, message: Dict[str, Any], writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        if message["op"] == "stream":
+            await self._handle_stream(message, writer, write_lock)
+            return
+
+        reply: Dict[str, Any] = {"id": message["id"]}
+        try:
+            reply.update(await self._dispatch(message))
+            self.requests_served += 1
+        except GenerationCancelled as e:
+            reply.update(error=str(e), cancelled=True)
+        except Exception as e:
+            logger.error(f"Inference request {message.get('op')} failed: {e}", exc_info=True)
+            reply["error"] = str(e) or e.__class__.__name__
+
+        try:
+            async with write_lock:
+                await send_message(writer, reply)
+        except Exception as e:
+            logger.warning(f"Could not deliver reply for request {message['id']}: {e}")
+            release_audio(reply.get("audio"))
+
+    async def _handle_stream(self, message: Dict[str, Any], writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        reply: Dict[str, Any] = {"id": message["id"], "done": True}
+        try:
+            chunks = self.backend.stream(
+                message["mode"], message["params"], voice_clone_prompt=message.get("voice_clone_prompt")
+            )
+            async with aclosing(chunks):
+                async for chunk, sample_rate in chunks:
+                    async with write_lock:
+                        await send_message(writer, {"id": message["id"], "chunk": chunk, "sample_rate": sample_rate})
+            self.requests_served += 1
+        except GenerationCancelled as e:
+            reply = {"id": message["id"], "error": str(e), "cancelled": True}
+        except Exception as e:
+            logger.error(f"Streaming request failed: {e}", exc_info=True)
+            reply = {"id": message["id"], "error": str(e) or e.__class__.__name__}
+
+        try:
+            async with write_lock:
+                await send_message(writer, reply)
+        except Exception as e:
+            logger.warning(f"Could not finish stream {message['id']}: {e}")
+
+    async def _dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        op = message["op"]
+        if op == "generate_custom_voice":
+            audio, sample_rate = await self.backend.generate_custom_voice(message["params"])
+        elif op == "generate_voice_design":
+            audio, sample_rate = await self.backend.generate_voice_design(message["params"])
+        elif op == "generate_voice_clone":
+            audio, sample_rate = await self.backend.generate_voice_clone(
+                message["params"],
+                ref_audio_bytes=message.get("ref_audio_bytes"),
+                x_vector=message.get("x_vector")
+            )
+        elif op == "create_voice_clone_prompt":
+            prompt = await self.backend.create_voice_clone_prompt(
+                message["ref_audio_bytes"],
+                ref_text=message.get("ref_text", ""),
+                x_vector_only_mode=message.get("x_vector_only_mode", False)
+            )
+            # Tensors cross the process boundary on the CPU; the model moves them back when generating
+            return {"prompt": _to_cpu(prompt)}
+        elif op == "health":
+            return {"health": await self.health()}
+        else:
+            raise ValueError(f"Unknown inference operation: {op}")
+
+        return {"audio": pack_audio(audio), "sample_rate": sample_rate}
+
+    async def health(self) -> Dict[str, Any]:
+        health = {
+            "pid": os.getpid(),
+            "device": settings.MODEL_DEVICE,
+            "fake": self.fake,
+            "requests_served": self.requests_served,
+            "batching": await self.backend.batch_processor.get_stats(),
+        }
+        if not self.fake:
+            health["models"] = self.backend.model_manager.get_load_status()
+        return health
+
+
+async def serve(socket_path: str, fake: bool = False, preload: Optional[str] = None, fake_frame_delay: float = 0.0):
+    worker = InferenceWorker(socket_path, fake=fake, fake_frame_delay=fake_frame_delay)
+    server = await worker.start()
+    if preload and not fake:
+        asyncio.create_task(worker.backend.model_manager.load_model(preload))
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Qwen3-TTS inference worker that API processes reach over a Unix socket")
+    parser.add_argument("--socket", required=True, help="Unix socket path, listed in INFERENCE_WORKERS of the API processes")
+    parser.add_argument("--device", default=None, help="Device for this worker, overrides MODEL_DEVICE")
+    parser.add_argument("--preload", default="custom-voice", help="Model variant to load at startup, empty to skip")
+    parser.add_argument("--fake", action="store_true", help="Serve synthetic audio instead of loading model weights")
+    parser.add_argument("--fake-frame-delay", type=float, default=0.0, help="Seconds the fake model spends per codec frame")
+    args = parser.parse_args()
+
+    if args.device:
+        settings.MODEL_DEVICE = args.device
+
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL.upper()),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    asyncio.run(serve(args.socket, fake=args.fake, preload=args.preload or None, fake_frame_delay=args.fake_frame_delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.event_bus import get_event_bus
+
+logger = logging.getLogger(__name__)
+
+
+def serialize_job(job, eta_seconds: Optional[float] = None) -> Dict[str, Any]:
+    # Runs for every pushed update and listed job, so it stays off the filesystem; the download itself reports a
+    # file that has gone missing
+    download_url = f"/jobs/{job.id}/download" if job.status == "completed" and job.output_path else None
+
+    return {
+        "id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "input_params": job.input_params,
+        "download_url": download_url,
+        "error_message": job.error_message,
+        "created_at": job.created_at.isoformat() + 'Z' if job.created_at else None,
+        "started_at": job.started_at.isoformat() + 'Z' if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() + 'Z' if job.completed_at else None,
+        "eta_seconds": eta_seconds
+    }
+
+
+class JobEventBroker:
+    """
+    Pub/sub of job status changes, keyed by user and relayed between processes by the event bus. Every subscriber
+    gets a bounded queue; a subscriber that falls behind has its backlog replaced by a single `resync` event and is
+    expected to reload its jobs.
+    """
+
+    _instance: Optional['JobEventBroker'] = None
+    _lock = asyncio.Lock()
+
+    def __init__(self):
+        self.queue_size = settings.JOB_EVENTS_QUEUE_SIZE
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self.delivered = 0
+        self.resyncs = 0
+        get_event_bus().subscribe("job_events", self._deliver)
+
+    @classmethod
+    async def get_instance(cls) -> 'JobEventBroker':
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(user_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[user_id]
+
+    def has_subscribers(self, user_id: int) -> bool:
+        return bool(self._subscribers.get(user_id))
+
+    def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        # Subscribers may be connected to any process of the deployment
+        get_event_bus().publish("job_events", {"user_id": user_id, "event": event})
+
+    def _deliver(self, message: Dict[str, Any]) -> None:
+        self.delivered += 1
+        event = message["event"]
+        for queue in self._subscribers.get(message["user_id"], ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"type": "resync"})
+                self.resyncs += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "subscribed_users": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+        }
+
+
+async def publish_job_update(db: Session, job) -> None:
+    from core.admission import AdmissionController
+
+    try:
+        broker = await JobEventBroker.get_instance()
+        if not get_event_bus().distributed and not broker.has_subscribers(job.user_id):
+            return
+        admission = await AdmissionController.get_instance()
+        broker.publish(job.user_id, {"type": "job.updated", "job": serialize_job(job, admission.estimate_eta(db, job))})
+    except Exception as e:
+        logger.error(f"Failed to publish update for job {job.id}: {e}")
+
+
+async def publish_job_deleted(user_id: int, job_id: int) -> None:
+    broker = await JobEventBroker.get_instance()
+    broker.publish(user_id, {"type": "job.deleted", "job_id": job_id})
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledJob:
+    job_id: int
+    model_name: str
+    func: Callable[..., Awaitable[Any]]
+    args: tuple
+    enqueued_at: float
+    user_id: Optional[Hashable] = None
+    cost: float = 1.0
+    start_tag: float = 0.0
+    finish_tag: float = 0.0
+
+
+class JobScheduler:
+    _instance: Optional['JobScheduler'] = None
+    _lock = asyncio.Lock()
+
+    def __init__(self, max_wait_seconds: float = None, max_concurrent_jobs: int = None):
+        self.max_wait_seconds = max_wait_seconds or settings.JOB_MAX_WAIT_SECONDS
+        self.max_concurrent_jobs = max_concurrent_jobs or settings.BATCH_SIZE
+        self.queues: Dict[str, Deque[ScheduledJob]] = defaultdict(deque)
+        self._condition = asyncio.Condition()
+        self.active_model: Optional[str] = None
+        self.running_jobs: List[ScheduledJob] = []
+        self.total_swaps = 0
+        self.forced_swaps = 0
+        self.dispatched = 0
+        self.max_observed_wait = 0.0
+        self._swap_times: Deque[float] = deque()
+        # Virtual finish time fair queuing across users, as in the batch processor: jobs of a variant are
+        # dispatched by finish tag, so one user's backlog is interleaved with everyone else's
+        self.virtual_time = 0.0
+        self._user_finish: Dict[Optional[Hashable], float] = {}
+        self._worker_task: Optional[asyncio.Task] = None
+        logger.info(f"JobScheduler initialized with max_wait={self.max_wait_seconds}s")
+
+    @classmethod
+    async def get_instance(cls) -> 'JobScheduler':
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                    cls._instance._start_worker()
+        return cls._instance
+
+    def _start_worker(self):
+        if not self._worker_task or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._run())
+            logger.info("Job scheduler task started")
+
+    async def submit(
+        self,
+        model_name: str,
+        job_id: int,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        user_id: Optional[Hashable] = None,
+        cost: float = 1.0
+    ) -> None:
+        async with self._condition:
+            job = ScheduledJob(
+                job_id=job_id,
+                model_name=model_name,
+                func=func,
+                args=args,
+                enqueued_at=time.time(),
+                user_id=user_id,
+                cost=max(cost, 1e-6)
+            )
+            job.start_tag = max(self.virtual_time, self._user_finish.get(user_id, 0.0))
+            job.finish_tag = job.start_tag + job.cost
+            self._user_finish[user_id] = job.finish_tag
+            self.queues[model_name].append(job)
+            self._condition.notify()
+        logger.debug(f"Job {job_id} queued for model {model_name}")
+
+    def _has_pending(self) -> bool:
+        return any(self.queues.values())
+
+    def _take(self, job: ScheduledJob) -> ScheduledJob:
+        self.queues[job.model_name].remove(job)
+        if job.start_tag > self.virtual_time:
+            self.virtual_time = job.start_tag
+            # Users whose last tag is behind the clock are idle and would restart from it anyway
+            for user_id in [user_id for user_id, finish in self._user_finish.items() if finish <= job.start_tag]:
+                del self._user_finish[user_id]
+        return job
+
+    def _next_for(self, model_name: str) -> ScheduledJob:
+        return min(self.queues[model_name], key=lambda job: job.finish_tag)
+
+    def _select_job(self, resident_models: set) -> ScheduledJob:
+        heads = {name: self._next_for(name) for name, queue in self.queues.items() if queue}
+        oldest = min((job for queue in self.queues.values() for job in queue), key=lambda job: job.enqueued_at)
+
+        # Bound starvation: a job that waited too long is served even if it forces a swap
+        if time.time() - oldest.enqueued_at >= self.max_wait_seconds:
+            if oldest.model_name != self.active_model:
+                self.forced_swaps += 1
+            return self._take(oldest)
+
+        # Drain the loaded variant first, then any other resident variant, then the fairest job
+        if self.active_model in heads:
+            return self._take(heads[self.active_model])
+        resident = [name for name in heads if name in resident_models]
+        if resident:
+            return self._take(min((heads[name] for name in resident), key=lambda job: job.finish_tag))
+        return self._take(min(heads.values(), key=lambda job: job.finish_tag))
+
+    def _record_swap(self, now: float) -> None:
+        self.total_swaps += 1
+        self._swap_times.append(now)
+        while self._swap_times and now - self._swap_times[0] > 3600:
+            self._swap_times.popleft()
+
+    async def _execute(self, job: ScheduledJob):
+        try:
+            await job.func(*job.args)
+        except Exception as e:
+            logger.error(f"Scheduled job {job.job_id} failed: {e}", exc_info=True)
+
+    async def _run(self):
+        from core.model_manager import ModelManager
+
+        logger.info("Job scheduler loop started")
+        while True:
+            try:
+                model_manager = await ModelManager.get_instance()
+                async with self._condition:
+                    await self._condition.wait_for(self._has_pending)
+                    job = self._select_job(set(model_manager.models))
+                    # Jobs for the same variant run together so the batch processor can merge them
+                    batch = [job]
+                    queue = self.queues[job.model_name]
+                    while queue and len(batch) < self.max_concurrent_jobs:
+                        batch.append(self._take(self._next_for(job.model_name)))
+
+                now = time.time()
+                self.max_observed_wait = max(self.max_observed_wait, now - job.enqueued_at)
+                if self.active_model is not None and job.model_name != self.active_model:
+                    self._record_swap(now)
+                    logger.info(f"Switching model {self.active_model} -> {job.model_name} for job {job.job_id}")
+                self.active_model = job.model_name
+                self.dispatched += len(batch)
+
+                self.running_jobs = batch
+                try:
+                    await asyncio.gather(*(self._execute(scheduled) for scheduled in batch))
+                finally:
+                    self.running_jobs = []
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in job scheduler loop: {e}", exc_info=True)
+                await asyncio.sleep(1)
+
+    def get_queue_length(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    async def get_stats(self) -> Dict[str, Any]:
+        from core.model_manager import ModelManager
+
+        model_manager = await ModelManager.get_instance()
+        now = time.time()
+        while self._swap_times and now - self._swap_times[0] > 3600:
+            self._swap_times.popleft()
+
+        return {
+            "pending": {name: len(queue) for name, queue in self.queues.items() if queue},
+            "pending_users": len({job.user_id for queue in self.queues.values() for job in queue}),
+            "active_model": self.active_model,
+            "running_job_ids": [job.job_id for job in self.running_jobs],
+            "dispatched": self.dispatched,
+            "total_swaps": self.total_swaps,
+            "swaps_last_hour": len(self._swap_times),
+            "forced_swaps": self.forced_swaps,
+            "max_wait_seconds": self.max_wait_seconds,
+            "max_observed_wait_seconds": self.max_observed_wait,
+            "model_load_seconds": sum(
+                stats["total_load_seconds"] for stats in model_manager.stats.values()
+            ),
+        }
@@ -122,8 +122,8 @@ class MetricsCollector:
             else:
                 gpu_stats = {'gpu_available': False}
 
-            from core.batch_processor import BatchProcessor
-            batch_processor = await BatchProcessor.get_instance()
+            from core.batch_processor import TTSBatchProcessor
+            batch_processor = await TTSBatchProcessor.get_instance()
             batch_stats_current = await batch_processor.get_stats()
 
             return {
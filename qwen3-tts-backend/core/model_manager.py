@@ -1,12 +1,97 @@
 import asyncio
+import contextvars
+import functools
 import logging
-from typing import Optional
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
 import torch
+from safetensors import safe_open
+from torch import nn
 from qwen_tts import Qwen3TTSModel
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# (task, model name) of the pins taken through use_model(); a load awaited by a task holding a pin must not wait
+# for that pin to be released. Tasks started inside the block inherit the entries but are not their owners.
+_held_pins: contextvars.ContextVar[tuple] = contextvars.ContextVar("held_pins", default=())
+
+
+def _copy_tensor(tensor: torch.Tensor, device: torch.device, pin_memory: bool) -> torch.Tensor:
+    if device.type == "cpu" and pin_memory:
+        return torch.empty_like(tensor, device=device, pin_memory=True).copy_(tensor)
+    return tensor.to(device, non_blocking=True, copy=True)
+
+
+@torch.no_grad()
+def _move_module(module: nn.Module, device: torch.device, pin_memory: bool = False) -> None:
+    # Rebuild parameters instead of module.to(): parameters may be shared with other resident
+    # variants (see qwen_tts SharedModuleRegistry) and must not be moved in place.
+    moved: Dict[int, torch.Tensor] = {}
+    # `moved` is keyed by id(), which is only unique while the object is alive. Replacing a module's last
+    # reference to a tensor can free it, so hold every source tensor until the whole tree has been rebuilt.
+    originals = []
+    for submodule in module.modules():
+        for name, param in list(submodule._parameters.items()):
+            if param is None:
+                continue
+            if id(param) not in moved:
+                originals.append(param)
+                moved[id(param)] = nn.Parameter(
+                    _copy_tensor(param.detach(), device, pin_memory), requires_grad=param.requires_grad
+                )
+            submodule._parameters[name] = moved[id(param)]
+        for name, buffer in list(submodule._buffers.items()):
+            if buffer is None:
+                continue
+            if id(buffer) not in moved:
+                originals.append(buffer)
+                moved[id(buffer)] = _copy_tensor(buffer, device, pin_memory)
+            submodule._buffers[name] = moved[id(buffer)]
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+@torch.no_grad()
+def _release_weights(module: nn.Module) -> None:
+    # Swap parameters and saved buffers for meta tensors, freeing their memory unless another variant shares
+    # them, while the module tree, its config and the buffers that are not saved (rotary tables) stay built
+    meta = torch.device("meta")
+    persistent = set(module.state_dict(keep_vars=True))
+    for prefix, submodule in module.named_modules():
+        for name, param in list(submodule._parameters.items()):
+            if param is not None:
+                submodule._parameters[name] = nn.Parameter(param.to(meta), requires_grad=param.requires_grad)
+        for name, buffer in list(submodule._buffers.items()):
+            if buffer is not None and (f"{prefix}.{name}" if prefix else name) in persistent:
+                submodule._buffers[name] = buffer.to(meta)
+
+
+@torch.no_grad()
+def _load_safetensors(module: nn.Module, directory: Path, device: torch.device) -> None:
+    """Load the `*.safetensors` files directly in `directory` into a module whose weights were released."""
+    expected = module.state_dict()
+    state_dict = {}
+    for path in sorted(directory.glob("*.safetensors")):
+        # safe_open maps the file instead of reading it whole; tensors are copied out one at a time
+        with safe_open(str(path), framework="pt", device="cpu") as f:
+            for key in f.keys():
+                if key in expected:
+                    state_dict[key] = f.get_tensor(key).to(device, dtype=expected[key].dtype)
+    module.load_state_dict(state_dict, strict=False, assign=True)
+    if hasattr(module, "tie_weights"):
+        module.tie_weights()
+    missing = [name for name, tensor in module.state_dict().items() if tensor.is_meta]
+    if missing:
+        raise RuntimeError(f"{len(missing)} weights not found in {directory}, e.g. {missing[0]}")
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
 
 class ModelManager:
     _instance: Optional['ModelManager'] = None
@@ -22,7 +107,54 @@ class ModelManager:
         if ModelManager._instance is not None:
             raise RuntimeError("Use get_instance() to get ModelManager")
         self.current_model_name: Optional[str] = None
-        self.tts: Optional[Qwen3TTSModel] = None
+        self.models: "OrderedDict[str, Qwen3TTSModel]" = OrderedDict()
+        self.parked: "OrderedDict[str, Qwen3TTSModel]" = OrderedDict()
+        # Models dropped to disk whose weights were released; they are rebuilt from the mmap'd checkpoint
+        # instead of going through from_pretrained again
+        self.cold: Dict[str, Qwen3TTSModel] = {}
+        self.footprints: Dict[str, int] = {}
+        self.stats: Dict[str, dict] = {
+            name: {
+                "hits": 0,
+                "misses": 0,
+                "loads": 0,
+                "evictions": 0,
+                "promotions": 0,
+                "demotions": 0,
+                "coalesced_waits": 0,
+                "total_load_seconds": 0.0,
+                "last_load_seconds": None,
+                "cold_loads": 0,
+                "last_promote_seconds": None,
+                "last_demote_seconds": None,
+            }
+            for name in self.MODEL_PATHS
+        }
+        self.load_states: Dict[str, dict] = {
+            name: {
+                "state": "unloaded",
+                "stage": None,
+                "started_at": None,
+                "duration_seconds": None,
+                "error": None,
+            }
+            for name in self.MODEL_PATHS
+        }
+        self._load_lock = asyncio.Lock()
+        self._load_tasks: Dict[str, asyncio.Task] = {}
+        # Models held through use_model(); eviction skips them, since moving or freeing the weights of a model
+        # that is generating (or about to) breaks it partway through
+        self._pins: Dict[str, int] = {}
+        self._pin_released = asyncio.Event()
+        # Loads and device transfers block for seconds; keep them off the event loop and one at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-loader")
+        self.device = torch.device(settings.MODEL_DEVICE)
+        self.memory_budget_bytes = self._resolve_memory_budget()
+        self.host_budget_bytes = self._resolve_host_budget()
+        logger.info(
+            f"Model memory budget: {self.memory_budget_bytes / 1024**3:.2f} GB, "
+            f"host parking budget: {self.host_budget_bytes / 1024**3:.2f} GB"
+        )
 
     @classmethod
     async def get_instance(cls) -> 'ModelManager':
@@ -32,76 +164,370 @@ class ModelManager:
                     cls._instance = cls()
         return cls._instance
 
-    async def load_model(self, model_name: str) -> None:
+    @property
+    def tts(self) -> Optional[Qwen3TTSModel]:
+        return self.models.get(self.current_model_name)
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def _set_load_state(self, model_name: str, state: str, stage: Optional[str] = None, error: Optional[str] = None) -> None:
+        load_state = self.load_states[model_name]
+        if state == "loading" and load_state["state"] != "loading":
+            load_state["started_at"] = time.time()
+            load_state["duration_seconds"] = None
+        elif state in ("ready", "failed") and load_state["started_at"] is not None:
+            load_state["duration_seconds"] = time.time() - load_state["started_at"]
+        load_state["state"] = state
+        load_state["stage"] = stage
+        load_state["error"] = error
+
+    def _resolve_memory_budget(self) -> int:
+        if settings.MODEL_MEMORY_BUDGET_GB > 0:
+            return int(settings.MODEL_MEMORY_BUDGET_GB * 1024**3)
+
+        if self.device.type == "cuda" and torch.cuda.is_available():
+            total = torch.cuda.get_device_properties(self.device.index or 0).total_memory
+            return int(total * 0.8)
+        # On a CPU-only host the resident and the parked models share RAM; each tier gets half of it
+        return int(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") * 0.4)
+
+    def _resolve_host_budget(self) -> int:
+        if settings.MODEL_HOST_BUDGET_GB < 0:
+            return 0
+        if settings.MODEL_HOST_BUDGET_GB > 0:
+            return int(settings.MODEL_HOST_BUDGET_GB * 1024**3)
+        fraction = 0.4 if self.device.type == "cpu" else 0.5
+        return int(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") * fraction)
+
+    def _resolve_model_path(self, model_name: str) -> str:
+        model_base_path = Path(settings.MODEL_BASE_PATH)
+        local_model_path = model_base_path / self.MODEL_PATHS[model_name]
+
+        if local_model_path.exists():
+            logger.info(f"Using local model: {local_model_path}")
+            return str(local_model_path)
+
+        model_path = f"Qwen/{self.MODEL_PATHS[model_name]}"
+        logger.info(f"Local path not found, using HuggingFace: {model_path}")
+        return model_path
+
+    @staticmethod
+    def _tensors(tts: Qwen3TTSModel):
+        yield from tts.model.parameters()
+        yield from tts.model.buffers()
+        speech_tokenizer = getattr(tts.model, "speech_tokenizer", None)
+        if speech_tokenizer is not None and speech_tokenizer.model is not None:
+            yield from speech_tokenizer.model.parameters()
+            yield from speech_tokenizer.model.buffers()
+
+    def _resident_bytes(self, models=None) -> int:
+        # Count each storage once: variants may share the speech tokenizer and identical weights
+        seen = set()
+        total = 0
+        for tts in (self.models.values() if models is None else models):
+            for tensor in self._tensors(tts):
+                key = (tensor.device, tensor.data_ptr())
+                if key in seen:
+                    continue
+                seen.add(key)
+                total += tensor.numel() * tensor.element_size()
+        return total
+
+    def _estimate_footprint(self, model_name: str, model_path: str) -> int:
+        if model_name in self.footprints:
+            return self.footprints[model_name]
+        path = Path(model_path)
+        if not path.exists():
+            return 0
+        return sum(f.stat().st_size for f in path.rglob("*.safetensors"))
+
+    def _evictable(self, exclude: Optional[str] = None) -> Optional[str]:
+        return next((name for name in self.models if name != exclude and not self._pins.get(name)), None)
+
+    async def _evict_for(self, required_bytes: int, held: tuple = ()) -> None:
+        # Called with _load_lock held; `held` are the models pinned by the task waiting for this load
+        deadline = time.monotonic() + settings.MODEL_PIN_WAIT_SECONDS
+        while self.models and self._resident_bytes() + required_bytes > self.memory_budget_bytes:
+            model_name = self._evictable()
+            if model_name is not None:
+                await self._evict(model_name)
+                continue
+
+            remaining = deadline - time.monotonic()
+            held_resident = [name for name in held if name in self.models]
+            if held_resident or remaining <= 0:
+                # Waiting would never end (the caller holds the pin itself) or has taken too long: go over budget
+                logger.warning(
+                    f"Over the model memory budget: {list(self.models)} are in use"
+                    f"{f' by the caller ({held_resident})' if held_resident else ''}"
+                )
+                return
+
+            # Every resident model is in use; wait for one to be released without blocking other loads
+            logger.info(f"Waiting for a resident model to be released: {list(self.models)} in use")
+            self._pin_released.clear()
+            self._load_lock.release()
+            try:
+                await asyncio.wait_for(self._pin_released.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                await self._load_lock.acquire()
+
+    async def _evict(self, model_name: str) -> None:
+        self.stats[model_name]["evictions"] += 1
+        footprint = self.footprints.get(model_name, 0)
+        if footprint == 0 or footprint > self.host_budget_bytes:
+            await self._unload_model_internal(model_name, keep_cold=True)
+            return
+
+        while self.parked and self._resident_bytes(self.parked.values()) + footprint > self.host_budget_bytes:
+            dropped_name = next(iter(self.parked))
+            logger.info(f"Dropping parked model: {dropped_name}")
+            await self._unload_model_internal(dropped_name, keep_cold=True)
+        await self._demote(model_name)
+
+    def _move_tts(self, tts: Qwen3TTSModel, device: torch.device, move_speech_tokenizer: bool) -> None:
+        pin_memory = device.type == "cpu" and settings.MODEL_PIN_HOST_MEMORY and torch.cuda.is_available()
+        _move_module(tts.model, device, pin_memory=pin_memory)
+        tts.device = device
+        tts.clear_text_cache()
+
+        speech_tokenizer = getattr(tts.model, "speech_tokenizer", None)
+        if move_speech_tokenizer and speech_tokenizer is not None and speech_tokenizer.device != device:
+            _move_module(speech_tokenizer.model, device, pin_memory=pin_memory)
+            speech_tokenizer.device = device
+
+    async def _demote(self, model_name: str) -> None:
+        tts = self.models.pop(model_name)
+        start = time.perf_counter()
+        # The speech tokenizer may be shared with variants that stay on the device
+        speech_tokenizer = getattr(tts.model, "speech_tokenizer", None)
+        shared = any(getattr(other.model, "speech_tokenizer", None) is speech_tokenizer for other in self.models.values())
+        if self.device.type != "cpu":
+            await self._run_blocking(self._move_tts, tts, torch.device("cpu"), move_speech_tokenizer=not shared)
+        # On a CPU-only host the model already is in RAM: parking it only moves it between the budgets
+        seconds = time.perf_counter() - start
+        self.parked[model_name] = tts
+        self.stats[model_name]["demotions"] += 1
+        self.stats[model_name]["last_demote_seconds"] = seconds
+        self._set_load_state(model_name, "unloaded")
+        if self.current_model_name == model_name:
+            self.current_model_name = next(reversed(self.models), None)
+        if torch.cuda.is_available():
+            await self._run_blocking(torch.cuda.empty_cache)
+        logger.info(f"Parked model {model_name} in host memory in {seconds:.1f}s")
+
+    async def _promote(self, model_name: str, tts: Qwen3TTSModel) -> Qwen3TTSModel:
+        start = time.perf_counter()
+        if tts.device != self.device:
+            await self._run_blocking(self._move_tts, tts, self.device, move_speech_tokenizer=True)
+            from qwen_tts.inference.module_registry import shared_module_registry
+            await self._run_blocking(shared_module_registry.share_parameters, tts.model)
+        seconds = time.perf_counter() - start
+        self.stats[model_name]["promotions"] += 1
+        self.stats[model_name]["last_promote_seconds"] = seconds
+        logger.info(f"Promoted parked model {model_name} to {self.device} in {seconds:.1f}s")
+        return tts
+
+    async def load_model(self, model_name: str) -> Qwen3TTSModel:
         if model_name not in self.MODEL_PATHS:
             raise ValueError(
                 f"Unknown model: {model_name}. "
                 f"Available models: {list(self.MODEL_PATHS.keys())}"
             )
 
-        if self.current_model_name == model_name and self.tts is not None:
-            logger.info(f"Model {model_name} already loaded")
-            return
-
-        async with self._lock:
-            logger.info(f"Loading model: {model_name}")
-
-            if self.tts is not None:
-                logger.info(f"Unloading current model: {self.current_model_name}")
-                await self._unload_model_internal()
+        tts = self.models.get(model_name)
+        if tts is not None:
+            self.models.move_to_end(model_name)
+            self.stats[model_name]["hits"] += 1
+            self.current_model_name = model_name
+            return tts
 
-            from pathlib import Path
-            model_base_path = Path(settings.MODEL_BASE_PATH)
-            local_model_path = model_base_path / self.MODEL_PATHS[model_name]
+        # Concurrent requests for a model that is already loading wait on the same task
+        task = self._load_tasks.get(model_name)
+        if task is None:
+            self.stats[model_name]["misses"] += 1
+            current = asyncio.current_task()
+            held = tuple(name for owner, name in _held_pins.get() if owner is current)
+            task = asyncio.create_task(self._load_model_internal(model_name, held))
+            self._load_tasks[model_name] = task
+            task.add_done_callback(lambda _: self._load_tasks.pop(model_name, None))
+        else:
+            self.stats[model_name]["coalesced_waits"] += 1
+        return await asyncio.shield(task)
 
-            if local_model_path.exists():
-                model_path = str(local_model_path)
-                logger.info(f"Using local model: {model_path}")
-            else:
-                model_path = f"Qwen/{self.MODEL_PATHS[model_name]}"
-                logger.info(f"Local path not found, using HuggingFace: {model_path}")
+    @asynccontextmanager
+    async def use_model(self, model_name: str) -> AsyncIterator[Qwen3TTSModel]:
+        """
+        Load `model_name` and keep it on the device until the block exits. Use this instead of `load_model` around
+        generation: a model returned by `load_model` may be evicted by the next load of another variant.
+        """
+        # Pinned before loading, so a concurrent load cannot evict it between load and use
+        self._pins[model_name] = self._pins.get(model_name, 0) + 1
+        token = _held_pins.set(_held_pins.get() + ((asyncio.current_task(), model_name),))
+        try:
+            yield await self.load_model(model_name)
+        finally:
+            _held_pins.reset(token)
+            self._pins[model_name] -= 1
+            if not self._pins[model_name]:
+                del self._pins[model_name]
+                self._pin_released.set()
 
-            try:
-                self.tts = Qwen3TTSModel.from_pretrained(
-                    str(model_path),
-                    device_map=settings.MODEL_DEVICE,
-                    torch_dtype=torch.bfloat16
-                )
+    async def _load_model_internal(self, model_name: str, held: tuple = ()) -> Qwen3TTSModel:
+        async with self._load_lock:
+            tts = self.models.get(model_name)
+            if tts is not None:
                 self.current_model_name = model_name
-                logger.info(f"Successfully loaded model: {model_name}")
-
-                if torch.cuda.is_available():
-                    allocated = torch.cuda.memory_allocated(0) / 1024**3
-                    logger.info(f"GPU memory allocated: {allocated:.2f} GB")
+                return tts
 
+            self._set_load_state(model_name, "loading", stage="evicting")
+            try:
+                if model_name in self.parked:
+                    # Taken out of the host tier first, so making room for it cannot drop it from there
+                    tts = self.parked.pop(model_name)
+                    try:
+                        await self._evict_for(self.footprints.get(model_name, 0), held)
+                    except BaseException:
+                        self.parked[model_name] = tts
+                        raise
+                    self._set_load_state(model_name, "loading", stage="promoting")
+                    tts = await self._promote(model_name, tts)
+                else:
+                    tts = await self._load_from_disk(model_name, held)
             except Exception as e:
                 logger.error(f"Failed to load model {model_name}: {e}")
-                self.tts = None
-                self.current_model_name = None
+                self._set_load_state(model_name, "failed", error=str(e))
                 raise
 
+            self.models[model_name] = tts
+            self.current_model_name = model_name
+            self._set_load_state(model_name, "ready")
+
+            # The estimate may have been missing or low; keep the new model and evict older ones instead
+            while self._resident_bytes() > self.memory_budget_bytes:
+                victim = self._evictable(exclude=model_name)
+                if victim is None:
+                    if len(self.models) > 1:
+                        logger.warning(f"Over the model memory budget: {list(self.models)} are in use")
+                    break
+                await self._evict(victim)
+
+            if torch.cuda.is_available():
+                allocated = torch.cuda.memory_allocated(0) / 1024**3
+                logger.info(f"GPU memory allocated: {allocated:.2f} GB")
+
+            return tts
+
+    def _load_cold(self, tts: Qwen3TTSModel, model_path: str) -> None:
+        directory = Path(model_path)
+        _load_safetensors(tts.model, directory, self.device)
+        from qwen_tts.inference.module_registry import shared_module_registry
+        shared_module_registry.share_parameters(tts.model)
+        tts.device = self.device
+        tts.clear_text_cache()
+
+        speech_tokenizer = getattr(tts.model, "speech_tokenizer", None)
+        if speech_tokenizer is None or speech_tokenizer.model is None:
+            return
+        if any(tensor.is_meta for tensor in speech_tokenizer.model.state_dict().values()):
+            _load_safetensors(speech_tokenizer.model, directory / "speech_tokenizer", self.device)
+        elif speech_tokenizer.device != self.device:
+            _move_module(speech_tokenizer.model, self.device)
+        speech_tokenizer.device = self.device
+
+    def _release_tts(self, tts: Qwen3TTSModel, release_speech_tokenizer: bool) -> None:
+        _release_weights(tts.model)
+        tts.clear_text_cache()
+        speech_tokenizer = getattr(tts.model, "speech_tokenizer", None)
+        if release_speech_tokenizer and speech_tokenizer is not None and speech_tokenizer.model is not None:
+            _release_weights(speech_tokenizer.model)
+
+    async def _load_from_disk(self, model_name: str, held: tuple = ()) -> Qwen3TTSModel:
+        logger.info(f"Loading model: {model_name}")
+        model_path = self._resolve_model_path(model_name)
+        await self._evict_for(self._estimate_footprint(model_name, model_path), held)
+
+        self._set_load_state(model_name, "loading", stage="loading_weights")
+        start = time.perf_counter()
+        tts = self.cold.pop(model_name, None)
+        if tts is not None:
+            try:
+                await self._run_blocking(self._load_cold, tts, model_path)
+                self.stats[model_name]["cold_loads"] += 1
+            except Exception as e:
+                logger.warning(f"Reading {model_name} from its checkpoint failed, loading it again: {e}")
+                tts = None
+        if tts is None:
+            tts = await self._run_blocking(
+                Qwen3TTSModel.from_pretrained,
+                model_path,
+                device_map=settings.MODEL_DEVICE,
+                torch_dtype=torch.bfloat16
+            )
+        load_seconds = time.perf_counter() - start
+
+        stats = self.stats[model_name]
+        stats["loads"] += 1
+        stats["total_load_seconds"] += load_seconds
+        stats["last_load_seconds"] = load_seconds
+        self.footprints[model_name] = self._resident_bytes([tts])
+        logger.info(
+            f"Successfully loaded model: {model_name} in {load_seconds:.1f}s "
+            f"({self.footprints[model_name] / 1024**3:.2f} GB)"
+        )
+        return tts
+
     async def get_current_model(self) -> tuple[Optional[str], Optional[Qwen3TTSModel]]:
         return self.current_model_name, self.tts
 
-    async def unload_model(self) -> None:
-        async with self._lock:
-            await self._unload_model_internal()
+    async def unload_model(self, model_name: Optional[str] = None) -> None:
+        async with self._load_lock:
+            names = [model_name] if model_name else list(self.models) + list(self.parked) + list(self.cold)
+            for name in names:
+                self.cold.pop(name, None)
+                await self._unload_model_internal(name)
 
-    async def _unload_model_internal(self) -> None:
-        if self.tts is not None:
-            logger.info(f"Unloading model: {self.current_model_name}")
-            del self.tts
-            self.tts = None
-            self.current_model_name = None
+    async def _unload_model_internal(self, model_name: str, keep_cold: bool = False) -> None:
+        tts = self.models.pop(model_name, None)
+        parked = self.parked.pop(model_name, None)
+        if tts is None:
+            tts = parked
+        if tts is None:
+            return
 
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                logger.info("Cleared CUDA cache")
+        logger.info(f"Unloading model: {model_name}")
+        if keep_cold and Path(self._resolve_model_path(model_name)).is_dir():
+            # Keep the built model without its weights; the next load reads them straight from the checkpoint
+            speech_tokenizer = getattr(tts.model, "speech_tokenizer", None)
+            shared = any(
+                getattr(other.model, "speech_tokenizer", None) is speech_tokenizer
+                for other in list(self.models.values()) + list(self.parked.values())
+            )
+            await self._run_blocking(self._release_tts, tts, release_speech_tokenizer=not shared)
+            self.cold[model_name] = tts
+        del tts
+        self._set_load_state(model_name, "unloaded")
+        if self.current_model_name == model_name:
+            self.current_model_name = next(reversed(self.models), None)
+
+        if torch.cuda.is_available():
+            await self._run_blocking(torch.cuda.empty_cache)
+            logger.info("Cleared CUDA cache")
 
     async def get_memory_usage(self) -> dict:
         memory_info = {
             "gpu_available": torch.cuda.is_available(),
-            "current_model": self.current_model_name
+            "current_model": self.current_model_name,
+            "resident_models": list(self.models),
+            "resident_gb": self._resident_bytes() / 1024**3,
+            "budget_gb": self.memory_budget_bytes / 1024**3,
+            "parked_models": list(self.parked),
+            "parked_gb": self._resident_bytes(self.parked.values()) / 1024**3,
+            "host_budget_gb": self.host_budget_bytes / 1024**3
         }
 
         if torch.cuda.is_available():
@@ -113,11 +539,41 @@ class ModelManager:
 
         return memory_info
 
+    def get_load_status(self) -> dict:
+        status = {}
+        for name, load_state in self.load_states.items():
+            entry = dict(load_state)
+            entry["progress"] = 1.0 if load_state["state"] == "ready" else None
+            if load_state["state"] == "loading" and load_state["started_at"] is not None:
+                # from_pretrained reports no progress; estimate it from the previous load of the same kind
+                stats = self.stats[name]
+                expected = stats["last_promote_seconds"] if load_state["stage"] == "promoting" else stats["last_load_seconds"]
+                elapsed = time.time() - load_state["started_at"]
+                entry["elapsed_seconds"] = elapsed
+                if expected:
+                    entry["progress"] = min(elapsed / expected, 0.99)
+            status[name] = entry
+        return status
+
+    def get_model_stats(self) -> dict:
+        load_status = self.get_load_status()
+        return {
+            name: {
+                **stats,
+                **load_status[name],
+                "resident": name in self.models,
+                "in_use": self._pins.get(name, 0),
+                "tier": "device" if name in self.models else "host" if name in self.parked else "disk",
+                "footprint_gb": self.footprints[name] / 1024**3 if name in self.footprints else None
+            }
+            for name, stats in self.stats.items()
+        }
+
     def get_model_info(self) -> dict:
         return {
             name: {
                 "path": path,
-                "loaded": name == self.current_model_name
+                "loaded": name in self.models
             }
             for name, path in self.MODEL_PATHS.items()
         }
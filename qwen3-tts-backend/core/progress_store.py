@@ -1,38 +1,183 @@
-from typing import Dict
+import asyncio
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional
 
-_store: Dict[str, dict] = {}
+from core.config import settings
+from core.event_bus import get_event_bus
 
+# Finished logs kept around for late subscribers
+MAX_FINISHED_LOGS = 64
 
-def _ensure(key: str) -> dict:
-    if key not in _store:
-        _store[key] = {"lines": [], "done": False}
-    return _store[key]
+
+class _Line:
+    __slots__ = ("index", "parts", "seq")
+
+    def __init__(self, index: int, text: str, seq: int):
+        self.index = index
+        self.parts = [text]
+        self.seq = seq
+
+    @property
+    def text(self) -> str:
+        # Streamed tokens are collected as parts and joined once per read
+        if len(self.parts) > 1:
+            self.parts = ["".join(self.parts)]
+        return self.parts[0]
+
+
+class _Log:
+    def __init__(self, max_lines: int):
+        self.lines: Deque[_Line] = deque(maxlen=max_lines)
+        self.next_index = 0
+        self.seq = 0
+        self.done = False
+        self.condition: Optional[asyncio.Condition] = None
+        self.notify_scheduled = False
+
+    def add_line(self, text: str) -> None:
+        self.seq += 1
+        self.lines.append(_Line(self.next_index, text, self.seq))
+        self.next_index += 1
+
+    def changed_since(self, since: int) -> List[_Line]:
+        # Only the newest line is ever extended, so changed lines form a suffix
+        changed = []
+        for line in reversed(self.lines):
+            if line.seq <= since:
+                break
+            changed.append(line)
+        changed.reverse()
+        return changed
+
+
+_store: "OrderedDict[str, _Log]" = OrderedDict()
+
+
+def _notify(log: _Log) -> None:
+    if log.condition is None or log.notify_scheduled:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    async def notify_all():
+        log.notify_scheduled = False
+        async with log.condition:
+            log.condition.notify_all()
+
+    # Tokens arriving within one loop iteration wake subscribers once
+    log.notify_scheduled = True
+    loop.create_task(notify_all())
+
+
+def _evict_finished() -> None:
+    finished = [key for key, log in _store.items() if log.done]
+    for key in finished[:max(len(finished) - MAX_FINISHED_LOGS, 0)]:
+        del _store[key]
+
+
+def _ensure(key: str) -> _Log:
+    log = _store.get(key)
+    if log is None:
+        log = _store[key] = _Log(settings.PROGRESS_MAX_LINES)
+        _evict_finished()
+    return log
+
+
+def _reset(key: str) -> None:
+    old = _store.pop(key, None)
+    log = _store[key] = _Log(settings.PROGRESS_MAX_LINES)
+    _evict_finished()
+    if old is not None:
+        # Sequence numbers stay monotonic per key; subscribers of the previous run see it end
+        log.seq = old.seq
+        old.done = True
+        _notify(old)
+
+
+def _append_token(log: _Log, token: str) -> None:
+    if log.lines:
+        log.seq += 1
+        line = log.lines[-1]
+        line.parts.append(token)
+        line.seq = log.seq
+    else:
+        log.add_line(token)
+
+
+def _apply(message: dict) -> None:
+    op, key = message["op"], message["key"]
+    if op == "reset":
+        _reset(key)
+        return
+
+    log = _ensure(key)
+    if op == "line":
+        log.add_line(message["text"])
+    elif op == "token":
+        _append_token(log, message["text"])
+    elif op == "done":
+        log.done = True
+        log.seq += 1
+    _notify(log)
+
+
+# Every process keeps a replica of the logs, so subscribers can attach wherever their request lands
+get_event_bus().subscribe("progress", _apply)
 
 
 def reset(key: str) -> None:
-    _store[key] = {"lines": [], "done": False}
+    get_event_bus().publish("progress", {"op": "reset", "key": key})
 
 
 def append_line(key: str, text: str) -> None:
-    s = _ensure(key)
-    s["lines"].append(text)
+    get_event_bus().publish("progress", {"op": "line", "key": key, "text": text})
 
 
 def append_token(key: str, token: str) -> None:
-    s = _ensure(key)
-    if s["lines"]:
-        s["lines"][-1] += token
-    else:
-        s["lines"].append(token)
+    get_event_bus().publish("progress", {"op": "token", "key": key, "text": token})
 
 
 def mark_done(key: str) -> None:
-    s = _ensure(key)
-    s["done"] = True
+    get_event_bus().publish("progress", {"op": "done", "key": key})
+
+
+def read(key: str, since: int = 0) -> dict:
+    log = _store.get(key)
+    if log is None:
+        return {"seq": since, "lines": [], "done": True}
+    return {
+        "seq": log.seq,
+        "lines": [(line.index, line.text) for line in log.changed_since(since)],
+        "done": log.done,
+    }
+
+
+async def wait(key: str, since: int = 0, timeout: Optional[float] = None) -> dict:
+    """
+    Return the lines changed after `since`, sleeping until there are some, the log is done or `timeout` passes.
+    """
+    log = _store.get(key)
+    if log is None or log.seq > since or log.done:
+        return read(key, since)
+
+    if log.condition is None:
+        log.condition = asyncio.Condition()
+    try:
+        async with log.condition:
+            await asyncio.wait_for(log.condition.wait_for(lambda: log.seq > since or log.done), timeout)
+    except asyncio.TimeoutError:
+        pass
+
+    if _store.get(key) is not log:
+        # Reset while waiting; the old run is over
+        return {"seq": log.seq, "lines": [(line.index, line.text) for line in log.changed_since(since)], "done": True}
+    return read(key, since)
 
 
 def get_snapshot(key: str) -> dict:
-    s = _store.get(key)
-    if not s:
+    log = _store.get(key)
+    if not log:
         return {"lines": [], "done": True}
-    return {"lines": list(s["lines"]), "done": s["done"]}
+    return {"lines": [line.text for line in log.lines], "done": log.done}
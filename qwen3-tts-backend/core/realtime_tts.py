@@ -0,0 +1,251 @@
+import asyncio
+import base64
+import logging
+import re
+import uuid
+from contextlib import aclosing
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.config import settings
+from utils.validation import validate_generation_params, validate_language, validate_speaker
+
+logger = logging.getLogger(__name__)
+
+# A sentence ends at CJK or ASCII terminators (with trailing quotes), a period followed by whitespace, or a newline
+_SENTENCE_END = re.compile(r'[。！？；!?;]+["”’」』）)]*|\.(?=\s)|\n')
+_FINISH = object()
+
+MODES = ("custom_voice", "voice_design", "voice_clone")
+
+
+def split_sentences(buffer: str) -> Tuple[List[str], str]:
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(buffer):
+        sentence = buffer[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    return sentences, buffer[start:]
+
+
+class RealtimeSession:
+    """
+    One realtime synthesis session, speaking the event names of the DashScope realtime API.
+
+    Text appended with `input_text_buffer.append` is cut into sentences, and every sentence is streamed through
+    the backend as `response.audio.delta` events (base64 PCM16, 24kHz mono). Sentences are synthesized one at a
+    time in arrival order. At most `max_pending` sentences may wait; an append beyond that is rejected whole with
+    an `input_text_buffer.full` error, so clients pace themselves on the `pending` count of `response.done`. The voice configured by
+    `session.update`, including a resolved voice clone prompt, is reused for every sentence of the session.
+    """
+
+    def __init__(
+        self,
+        backend,
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+        user_id: Optional[int] = None,
+        resolve_voice: Optional[Callable[[int], Awaitable[Any]]] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.id = f"sess_{uuid.uuid4().hex[:16]}"
+        self.backend = backend
+        self.send = send
+        self.user_id = user_id
+        self.resolve_voice = resolve_voice
+        self.max_pending = max_pending or settings.REALTIME_MAX_PENDING_SENTENCES
+        self.config: Dict[str, Any] = {
+            "mode": "custom_voice",
+            "speaker": "Vivian",
+            "instruct": "",
+            "language": "Auto",
+            "voice_design_id": None,
+            **validate_generation_params({}),
+        }
+        self.voice_clone_prompt = None
+        self.buffer = ""
+        self.responses = 0
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._epoch = 0
+        self._finishing = False
+        self._response_task: Optional[asyncio.Task] = None
+        self._synthesis_task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> Optional[asyncio.Task]:
+        return self._synthesis_task
+
+    async def start(self) -> None:
+        self._synthesis_task = asyncio.create_task(self._synthesize())
+        await self.send({"type": "session.created", "session": self._public_config()})
+
+    async def close(self) -> None:
+        for task in (self._response_task, self._synthesis_task):
+            if task is not None and not task.done():
+                task.cancel()
+        for task in (self._response_task, self._synthesis_task):
+            if task is not None:
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def handle(self, event: Dict[str, Any]) -> None:
+        event_type = event.get("type")
+        try:
+            if self._finishing and event_type != "response.cancel":
+                raise ValueError("Session is finishing")
+
+            if event_type == "session.update":
+                await self._update(event.get("session") or {})
+                await self.send({"type": "session.updated", "session": self._public_config()})
+            elif event_type == "input_text_buffer.append":
+                text = event.get("text") or ""
+                if not isinstance(text, str):
+                    raise ValueError("text must be a string")
+                self._append(text)
+            elif event_type == "input_text_buffer.commit":
+                self._flush()
+                await self.send({"type": "input_text_buffer.committed"})
+            elif event_type == "input_text_buffer.clear":
+                self.buffer = ""
+                await self.send({"type": "input_text_buffer.cleared"})
+            elif event_type == "response.cancel":
+                await self.cancel()
+            elif event_type == "session.finish":
+                self._flush()
+                self._finishing = True
+                self._pending.put_nowait(_FINISH)
+            else:
+                raise ValueError(f"Unknown event type: {event_type}")
+        except BufferError as e:
+            await self._error("input_text_buffer.full", str(e), event_type)
+        except (ValueError, TypeError) as e:
+            # TypeError covers values of the wrong JSON type, e.g. a string temperature
+            await self._error("invalid_request", str(e), event_type)
+
+    async def cancel(self) -> None:
+        # Bumping the epoch drops queued sentences; the running one is interrupted at its next chunk
+        self._epoch += 1
+        self.buffer = ""
+        if self._response_task is not None and not self._response_task.done():
+            self._response_task.cancel()
+
+    async def _update(self, session: Dict[str, Any]) -> None:
+        config = dict(self.config)
+        for name in ("mode", "speaker", "instruct", "language", "voice_design_id") + tuple(validate_generation_params({})):
+            if name in session:
+                config[name] = session[name]
+
+        for name in ("mode", "speaker", "instruct", "language"):
+            if config[name] is not None and not isinstance(config[name], str):
+                raise ValueError(f"{name} must be a string")
+        if config["mode"] not in MODES:
+            raise ValueError(f"Unsupported mode: {config['mode']}")
+        config["language"] = validate_language(config["language"])
+        if config["mode"] == "custom_voice":
+            config["speaker"] = validate_speaker(config["speaker"], "local")
+        if config["mode"] == "voice_design" and not (config["instruct"] or "").strip():
+            raise ValueError("instruct is required for voice_design sessions")
+        config.update(validate_generation_params(config))
+
+        voice_clone_prompt = self.voice_clone_prompt
+        if config["mode"] == "voice_clone":
+            if not config["voice_design_id"]:
+                raise ValueError("voice_design_id is required for voice_clone sessions")
+            if config["voice_design_id"] != self.config["voice_design_id"] or voice_clone_prompt is None:
+                if self.resolve_voice is None:
+                    raise ValueError("Voice clone is not available in this session")
+                voice_clone_prompt = await self.resolve_voice(config["voice_design_id"])
+
+        self.config = config
+        self.voice_clone_prompt = voice_clone_prompt
+
+    @property
+    def pending(self) -> int:
+        return max(self._pending.qsize() - int(self._finishing), 0)
+
+    def _enqueue(self, sentences: List[str]) -> None:
+        if self.pending + len(sentences) > self.max_pending:
+            raise BufferError(
+                f"{self.pending} sentences are waiting (limit {self.max_pending}); "
+                "wait for response.done before appending more text"
+            )
+        for sentence in sentences:
+            self._pending.put_nowait((self._epoch, sentence))
+
+    def _append(self, text: str) -> None:
+        sentences, buffer = split_sentences(self.buffer + text)
+        # Unterminated text is cut once it reaches the request limit
+        while len(buffer) >= settings.MAX_TEXT_LENGTH:
+            sentences.append(buffer[:settings.MAX_TEXT_LENGTH])
+            buffer = buffer[settings.MAX_TEXT_LENGTH:]
+
+        # A rejected append leaves the buffer as it was
+        self._enqueue(sentences)
+        self.buffer = buffer
+
+    def _flush(self) -> None:
+        sentence = self.buffer.strip()
+        if sentence:
+            self._enqueue([sentence])
+        self.buffer = ""
+
+    async def _synthesize(self) -> None:
+        while True:
+            item = await self._pending.get()
+            if item is _FINISH:
+                await self.send({"type": "session.finished"})
+                return
+
+            epoch, sentence = item
+            if epoch != self._epoch:
+                continue
+            self._response_task = asyncio.create_task(self._respond(sentence))
+            # asyncio.wait does not propagate the response's cancellation into this loop
+            await asyncio.wait({self._response_task})
+
+    async def _respond(self, sentence: str) -> None:
+        self.responses += 1
+        response_id = f"resp_{self.responses}"
+        config = self.config
+        params = {
+            name: config[name]
+            for name in ("speaker", "instruct", "language") + tuple(validate_generation_params({}))
+        }
+        params.update(text=sentence, user_id=self.user_id)
+
+        await self.send({"type": "response.created", "response_id": response_id, "text": sentence})
+        status = "completed"
+        try:
+            chunks = self.backend.stream(config["mode"], params, voice_clone_prompt=self.voice_clone_prompt)
+            async with aclosing(chunks):
+                async for pcm, sample_rate in chunks:
+                    # Awaiting the send applies the client's read rate back onto synthesis
+                    await self.send({
+                        "type": "response.audio.delta",
+                        "response_id": response_id,
+                        "delta": base64.b64encode(pcm).decode(),
+                    })
+            await self.send({"type": "response.audio.done", "response_id": response_id})
+        except asyncio.CancelledError:
+            status = "cancelled"
+        except Exception as e:
+            logger.error(f"Realtime session {self.id} failed on {response_id}: {e}", exc_info=True)
+            status = "failed"
+            await self._error("synthesis_failed", str(e) or e.__class__.__name__, response_id=response_id)
+
+        await self.send({
+            "type": "response.done",
+            "response_id": response_id,
+            "status": status,
+            "pending": self.pending,
+        })
+
+    async def _error(self, code: str, message: str, event_type: Optional[str] = None, response_id: Optional[str] = None):
+        error: Dict[str, Any] = {"code": code, "message": message}
+        if event_type:
+            error["event_type"] = event_type
+        if response_id:
+            error["response_id"] = response_id
+        await self.send({"type": "error", "error": error})
+
+    def _public_config(self) -> Dict[str, Any]:
+        return {"id": self.id, **self.config, "response_format": "pcm", "sample_rate": 24000, "max_pending": self.max_pending}
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SharedCancelToken:
+    """
+    Cancellation token of work shared by several callers: set only once every caller's own token is set.
+
+    It also lists the `caller` each one passed, so the work can act for all of them, and calls `on_join` when a
+    caller joins work that has already started.
+    """
+
+    def __init__(self):
+        self.tokens: List[Any] = []
+        self.callers: List[Any] = []
+        self.on_join: Optional[Callable[[Any], None]] = None
+
+    def is_set(self) -> bool:
+        # A caller without a token never gives up
+        return bool(self.tokens) and all(token is not None and token.is_set() for token in self.tokens)
+
+
+class _Flight:
+    def __init__(self):
+        self.token = SharedCancelToken()
+        self.task: Optional[asyncio.Future] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller starts the work, later callers with the same key
+    wait for it and receive the same result or exception. Nothing is kept once the work finishes, so this is not a
+    cache; a call starting afterwards runs again.
+
+    The work runs in its own task and receives a `SharedCancelToken`, so one caller being cancelled does not take
+    the result away from the others.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.hits = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[SharedCancelToken], Awaitable[Any]],
+        cancel_token: Any = None,
+        caller: Any = None
+    ) -> Any:
+        flight = self._flights.get(key)
+        # Work whose callers have all given up is not joined, it is about to stop
+        if flight is None or flight.token.is_set():
+            flight = self._flights[key] = _Flight()
+            flight.token.tokens.append(cancel_token)
+            flight.token.callers.append(caller)
+            flight.task = asyncio.ensure_future(func(flight.token))
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.calls += 1
+        else:
+            flight.token.tokens.append(cancel_token)
+            flight.token.callers.append(caller)
+            self.hits += 1
+            logger.debug(f"Singleflight {self.name}: joined in-flight call ({flight.waiters} waiting)")
+            if flight.token.on_join is not None:
+                flight.token.on_join(caller)
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if cancel_token is not None:
+                cancel_token.set()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if flight.waiters == 0 and not flight.task.cancelled() and flight.task.exception() is not None:
+            # Nobody is left to receive the error
+            logger.warning(f"Singleflight {self.name}: abandoned call failed: {flight.task.exception()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.calls + self.hits
+        return {
+            "calls": self.calls,
+            "hits": self.hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "in_flight": len(self._flights),
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name)
+    return group
+
+
+def get_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: group.get_stats() for name, group in _groups.items()}
@@ -0,0 +1,301 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class NonRetryableError(Exception):
+    """Raised by a task handler for a failure that would happen again on every attempt."""
+
+
+# Bad input (validation errors, missing voices or files) fails the same way on a retry, so the task fails at once
+NON_RETRYABLE_ERRORS = (NonRetryableError, ValueError, TypeError, FileNotFoundError)
+
+
+@dataclass
+class TaskHandler:
+    func: Callable[..., Awaitable[Any]]
+    on_failure: Optional[Callable[[Dict[str, Any], str, bool], Awaitable[Any]]] = None
+
+
+@dataclass
+class LeasedTask:
+    task_id: int
+    task_type: str
+    payload: Dict[str, Any]
+    model_name: Optional[str]
+    job_id: Optional[int]
+    attempts: int
+
+
+_handlers: Dict[str, TaskHandler] = {}
+
+
+def register_task_handler(
+    task_type: str,
+    func: Callable[..., Awaitable[Any]],
+    on_failure: Optional[Callable[[Dict[str, Any], str, bool], Awaitable[Any]]] = None
+) -> None:
+    _handlers[task_type] = TaskHandler(func=func, on_failure=on_failure)
+
+
+class TaskQueue:
+    _instance: Optional['TaskQueue'] = None
+    _lock = asyncio.Lock()
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = settings.TASK_LEASE_SECONDS
+        self.heartbeat_seconds = settings.TASK_HEARTBEAT_SECONDS
+        self.max_attempts = settings.TASK_MAX_ATTEMPTS
+        self.retry_backoff_seconds = settings.TASK_RETRY_BACKOFF_SECONDS
+        self.poll_interval = settings.TASK_POLL_INTERVAL
+        self.max_in_flight = settings.TASK_MAX_IN_FLIGHT
+        self.in_flight: Set[int] = set()
+        self.counters = {
+            "claimed": 0,
+            "completed": 0,
+            "retried": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "lease_expirations": 0,
+        }
+        self._wakeup = asyncio.Event()
+        self._worker_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        logger.info(f"TaskQueue initialized as worker {self.worker_id} (lease={self.lease_seconds}s)")
+
+    @classmethod
+    async def get_instance(cls) -> 'TaskQueue':
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                    cls._instance._start_worker()
+        return cls._instance
+
+    def _start_worker(self):
+        if not self._worker_task or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._run())
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+            logger.info("Task queue worker started")
+
+    async def stop(self):
+        for task in (self._worker_task, self._heartbeat_task):
+            if task and not task.done():
+                task.cancel()
+        # Leases of unfinished tasks are left to expire, so another worker or the next start picks them up
+        if self.in_flight:
+            logger.info(f"Task queue stopped with {len(self.in_flight)} leased tasks in flight")
+
+    async def enqueue(
+        self,
+        task_type: str,
+        payload: Dict[str, Any],
+        model_name: Optional[str] = None,
+        job_id: Optional[int] = None
+    ) -> int:
+        from core.database import SessionLocal
+        from db.crud import enqueue_task
+
+        db = SessionLocal()
+        try:
+            task = enqueue_task(db, task_type, payload, model_name, job_id, self.max_attempts)
+            task_id = task.id
+        finally:
+            db.close()
+
+        self._wakeup.set()
+        logger.debug(f"Task {task_id} ({task_type}) enqueued")
+        return task_id
+
+    async def _run(self):
+        logger.info("Task queue loop started")
+        while True:
+            try:
+                await self._poll()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in task queue loop: {e}", exc_info=True)
+                await asyncio.sleep(1)
+
+    async def _poll(self):
+        from core.database import SessionLocal
+        from db.crud import requeue_expired_tasks, claim_tasks, get_queued_task
+
+        db = SessionLocal()
+        try:
+            requeued, dead = requeue_expired_tasks(db)
+            self.counters["lease_expirations"] += len(requeued) + len(dead)
+            if requeued:
+                logger.warning(f"Requeued {len(requeued)} tasks whose lease expired: {requeued}")
+            dead_tasks = [get_queued_task(db, task_id) for task_id in dead]
+            dead_tasks = [(task.task_type, dict(task.payload)) for task in dead_tasks if task]
+
+            capacity = self.max_in_flight - len(self.in_flight)
+            leased = []
+            if capacity > 0:
+                leased = [
+                    LeasedTask(
+                        task_id=task.id,
+                        task_type=task.task_type,
+                        payload=dict(task.payload),
+                        model_name=task.model_name,
+                        job_id=task.job_id,
+                        attempts=task.attempts
+                    )
+                    for task in claim_tasks(db, self.worker_id, self.lease_seconds, capacity)
+                ]
+        finally:
+            db.close()
+
+        for task_type, payload in dead_tasks:
+            self.counters["failed"] += 1
+            logger.error(f"Task of type {task_type} exhausted its attempts after lease expiry")
+            await self._notify_failure(task_type, payload, "Lease expired without heartbeat", False)
+
+        for task in leased:
+            self.in_flight.add(task.task_id)
+            self.counters["claimed"] += 1
+            await self._dispatch(task)
+
+    async def _dispatch(self, task: LeasedTask):
+        if task.model_name:
+            # Local inference goes through the scheduler so jobs for the same model variant are grouped
+            from core.batch_processor import TTSBatchProcessor
+            from core.job_scheduler import JobScheduler
+            scheduler = await JobScheduler.get_instance()
+            text = (task.payload.get("request_data") or {}).get("text") or ""
+            await scheduler.submit(
+                task.model_name, task.job_id or task.task_id, self._execute, task,
+                user_id=task.payload.get("user_id"),
+                cost=len(text) + TTSBatchProcessor.REQUEST_OVERHEAD_CHARS
+            )
+        else:
+            asyncio.create_task(self._execute(task))
+
+    async def _execute(self, task: LeasedTask):
+        from core.cancellation import GenerationCancelled
+        from core.database import SessionLocal
+        from db.crud import complete_task, fail_task
+        from db.models import TaskStatus
+
+        try:
+            handler = _handlers.get(task.task_type)
+            if handler is None:
+                raise RuntimeError(f"No handler registered for task type {task.task_type}")
+            await handler.func(**task.payload)
+
+        except asyncio.CancelledError:
+            self.in_flight.discard(task.task_id)
+            raise
+
+        except GenerationCancelled:
+            # Cancelled on purpose (its job was deleted), so it is finished rather than failed
+            db = SessionLocal()
+            try:
+                complete_task(db, task.task_id, self.worker_id)
+            finally:
+                db.close()
+            self.in_flight.discard(task.task_id)
+            self.counters["cancelled"] += 1
+            logger.info(f"Task {task.task_id} ({task.task_type}) cancelled")
+
+        except Exception as e:
+            retry = not isinstance(e, NON_RETRYABLE_ERRORS)
+            delay = self.retry_backoff_seconds * 2 ** (task.attempts - 1)
+            db = SessionLocal()
+            try:
+                failed = fail_task(db, task.task_id, self.worker_id, str(e), delay, retry=retry)
+                will_retry = failed is not None and failed.status == TaskStatus.QUEUED
+            finally:
+                db.close()
+            self.in_flight.discard(task.task_id)
+
+            if failed is None:
+                logger.warning(f"Task {task.task_id} failed after losing its lease: {e}")
+                return
+            if will_retry:
+                self.counters["retried"] += 1
+                logger.warning(
+                    f"Task {task.task_id} ({task.task_type}) failed on attempt {task.attempts}, "
+                    f"retrying in {delay:.0f}s: {e}"
+                )
+            else:
+                self.counters["failed"] += 1
+                if retry:
+                    logger.error(f"Task {task.task_id} ({task.task_type}) failed permanently: {e}", exc_info=True)
+                else:
+                    logger.warning(f"Task {task.task_id} ({task.task_type}) failed without retry: {e}")
+            await self._notify_failure(task.task_type, task.payload, str(e), will_retry)
+
+        else:
+            db = SessionLocal()
+            try:
+                if not complete_task(db, task.task_id, self.worker_id):
+                    logger.warning(f"Task {task.task_id} finished after its lease was taken over")
+            finally:
+                db.close()
+            self.in_flight.discard(task.task_id)
+            self.counters["completed"] += 1
+
+    async def _notify_failure(self, task_type: str, payload: Dict[str, Any], error: str, will_retry: bool):
+        handler = _handlers.get(task_type)
+        if handler is None or handler.on_failure is None:
+            return
+        try:
+            await handler.on_failure(payload, error, will_retry)
+        except Exception as e:
+            logger.error(f"Failure callback for {task_type} raised: {e}", exc_info=True)
+
+    async def _heartbeat(self):
+        from core.database import SessionLocal
+        from db.crud import heartbeat_tasks
+
+        while True:
+            try:
+                await asyncio.sleep(self.heartbeat_seconds)
+                task_ids = list(self.in_flight)
+                if not task_ids:
+                    continue
+                db = SessionLocal()
+                try:
+                    renewed = heartbeat_tasks(db, task_ids, self.worker_id, self.lease_seconds)
+                finally:
+                    db.close()
+                if renewed < len(task_ids):
+                    logger.warning(f"Renewed {renewed} of {len(task_ids)} task leases; the rest were lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error renewing task leases: {e}", exc_info=True)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        from core.database import SessionLocal
+        from db.crud import count_tasks_by_status
+
+        db = SessionLocal()
+        try:
+            by_status = count_tasks_by_status(db)
+        finally:
+            db.close()
+
+        return {
+            "worker_id": self.worker_id,
+            "in_flight": len(self.in_flight),
+            "by_status": by_status,
+            **self.counters,
+        }
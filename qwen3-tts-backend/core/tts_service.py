@@ -3,7 +3,7 @@ import functools
 import time
 import logging
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional
+from typing import AsyncIterator, Tuple, Optional
 import websockets
 import json
 import base64
@@ -11,6 +11,41 @@ import base64
 logger = logging.getLogger(__name__)
 
 
+def _prompt_fingerprint(prompt) -> Optional[str]:
+    """Content hash of a voice clone prompt, so equal prompts loaded separately compare equal."""
+    if prompt is None:
+        return None
+    import dataclasses
+    import hashlib
+    import numpy as np
+
+    digest = hashlib.sha1()
+
+    def feed(value):
+        if hasattr(value, "detach"):
+            value = value.detach().cpu().float().numpy()
+        if isinstance(value, np.ndarray):
+            digest.update(f"{value.dtype}{value.shape}".encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+            for field in dataclasses.fields(value):
+                feed(getattr(value, field.name))
+        elif isinstance(value, (list, tuple)):
+            digest.update(b"[")
+            for item in value:
+                feed(item)
+            digest.update(b"]")
+        elif isinstance(value, dict):
+            for key in sorted(value, key=str):
+                digest.update(str(key).encode())
+                feed(value[key])
+        else:
+            digest.update(repr(value).encode())
+
+    feed(prompt)
+    return digest.hexdigest()
+
+
 class TTSBackend(ABC):
     @abstractmethod
     async def generate_custom_voice(self, params: dict) -> Tuple[bytes, int]:
@@ -28,122 +63,260 @@ class TTSBackend(ABC):
     async def health_check(self) -> dict:
         pass
 
+    def stream(self, mode: str, params: dict, voice_clone_prompt=None) -> AsyncIterator[Tuple[bytes, int]]:
+        """Yield 16-bit mono PCM chunks as they are synthesized."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support streaming synthesis")
+
 
 class LocalTTSBackend(TTSBackend):
     def __init__(self):
         self.model_manager = None
-        # Add a lock to prevent concurrent VRAM contention and CUDA errors on local GPU models
-        self._gpu_lock = asyncio.Lock()
+        self.batch_processor = None
 
     async def initialize(self):
         from core.model_manager import ModelManager
+        from core.batch_processor import TTSBatchProcessor
         self.model_manager = await ModelManager.get_instance()
+        # Compatible requests are grouped into one list-valued generate call; its lock also
+        # prevents concurrent VRAM contention and CUDA errors on local GPU models
+        self.batch_processor = await TTSBatchProcessor.get_instance()
 
-    async def generate_custom_voice(self, params: dict) -> Tuple[bytes, int]:
-        await self.model_manager.load_model("custom-voice")
-        _, tts = await self.model_manager.get_current_model()
+    def _cache_key(self, mode: str, params: dict, voice: Optional[str]) -> Tuple[str, int]:
+        from core.audio_cache import seed_for_key, synthesis_key
+        from core.model_manager import ModelManager
 
-        loop = asyncio.get_event_loop()
-        async with self._gpu_lock:
-            result = await loop.run_in_executor(
-                None,
-                functools.partial(
-                    tts.generate_custom_voice,
-                    text=params['text'],
-                    language=params['language'],
-                    speaker=params['speaker'],
-                    instruct=params.get('instruct', ''),
-                    max_new_tokens=params['max_new_tokens'],
-                    temperature=params['temperature'],
-                    top_k=params['top_k'],
-                    top_p=params['top_p'],
-                    repetition_penalty=params['repetition_penalty'],
-                )
+        variant = self.batch_processor.VARIANTS[mode]
+        model = ModelManager.MODEL_PATHS.get(variant, variant)
+        seed = params.get('seed')
+        if seed is None:
+            # Without an explicit seed, equal inputs get equal seeds
+            seed = seed_for_key(synthesis_key(model, mode, params, voice, None))
+        return synthesis_key(model, mode, params, voice, seed), seed
+
+    async def _submit(self, mode: str, params: dict, voice: Optional[str] = None, voice_clone_prompt=None) -> Tuple[bytes, int]:
+        from core import cancellation
+        from core.audio_cache import AudioCache
+        from core.singleflight import get_singleflight
+
+        key, seed = self._cache_key(mode, params, voice)
+        audio_cache = await AudioCache.get_instance()
+        cached = await audio_cache.get(key)
+        if cached is not None:
+            logger.info(f"Audio cache hit for {mode} request {key[:8]}")
+            return cached, self._wav_sample_rate(cached)
+
+        cancel_key = params.get('cancel_key')
+        cancel_token = cancellation.register(cancel_key)
+        try:
+            # Identical concurrent requests share one generation; it is cancelled only when all of them are
+            result = await get_singleflight("synthesis").do(
+                key,
+                lambda shared_token: self._synthesize(mode, params, seed, shared_token, key, voice_clone_prompt),
+                cancel_token,
+                caller=(params.get('priority', 'interactive'), params.get('user_id'))
             )
+        finally:
+            cancellation.release(cancel_key, cancel_token)
+        if cancel_token.is_set():
+            raise cancellation.GenerationCancelled("Generation cancelled")
+        return result
+
+    async def _synthesize(self, mode: str, params: dict, seed: int, cancel_token, cache_key: str, voice_clone_prompt=None) -> Tuple[bytes, int]:
+        import uuid
+        from core.audio_cache import AudioCache
+        from core.batch_processor import PRIORITY_CLASSES
+
+        data = {"mode": mode, "params": params, "seed": seed, "cancel_token": cancel_token}
+        if mode == "voice_clone":
+            if callable(voice_clone_prompt):
+                voice_clone_prompt = await voice_clone_prompt()
+            data["voice_clone_prompt"] = voice_clone_prompt
+
+        # The generation is shared by every caller that coalesced onto it: it runs at the most urgent of their
+        # priorities, and its usage is billed to all of their users
+        request_id = f"{mode}-{uuid.uuid4().hex[:8]}"
+        priority, user_id = min(cancel_token.callers, key=lambda caller: PRIORITY_CLASSES.index(caller[0]))
+        data["user_ids"] = [caller[1] for caller in cancel_token.callers]
+
+        def on_join(caller):
+            data["user_ids"].append(caller[1])
+            asyncio.ensure_future(self.batch_processor.promote(request_id, caller[0]))
+
+        cancel_token.on_join = on_join
+        audio_data, sample_rate = await self.batch_processor.submit(
+            request_id,
+            data,
+            timeout=None,
+            priority=priority,
+            user_id=user_id
+        )
+        audio_cache = await AudioCache.get_instance()
+        return await audio_cache.put(cache_key, self._numpy_to_bytes(audio_data)), sample_rate
 
-        import numpy as np
-        wavs, sample_rate = result if isinstance(result, tuple) else (result, 24000)
-        audio_data = wavs[0] if isinstance(wavs, list) else wavs
-        return self._numpy_to_bytes(audio_data), sample_rate
+    async def generate_custom_voice(self, params: dict) -> Tuple[bytes, int]:
+        return await self._submit("custom_voice", params)
 
     async def generate_voice_design(self, params: dict) -> Tuple[bytes, int]:
-        await self.model_manager.load_model("voice-design")
-        _, tts = await self.model_manager.get_current_model()
-
-        loop = asyncio.get_event_loop()
-        async with self._gpu_lock:
-            result = await loop.run_in_executor(
-                None,
-                functools.partial(
-                    tts.generate_voice_design,
-                    text=params['text'],
-                    language=params['language'],
-                    instruct=params['instruct'],
-                    max_new_tokens=params['max_new_tokens'],
-                    temperature=params['temperature'],
-                    top_k=params['top_k'],
-                    top_p=params['top_p'],
-                    repetition_penalty=params['repetition_penalty'],
-                )
-            )
-
-        import numpy as np
-        wavs, sample_rate = result if isinstance(result, tuple) else (result, 24000)
-        audio_data = wavs[0] if isinstance(wavs, list) else wavs
-        return self._numpy_to_bytes(audio_data), sample_rate
+        return await self._submit("voice_design", params)
 
     async def generate_voice_clone(self, params: dict, ref_audio_bytes: bytes = None, x_vector=None) -> Tuple[bytes, int]:
-        from utils.audio import process_ref_audio
+        import hashlib
+
+        if x_vector is not None:
+            return await self._submit("voice_clone", params, _prompt_fingerprint(x_vector), x_vector)
+        if ref_audio_bytes is None:
+            raise ValueError("Either ref_audio_bytes or x_vector must be provided")
+
+        # Keyed by the reference itself, so a cache hit skips building the prompt
+        ref_text = params.get('ref_text', '')
+        voice = f"ref:{hashlib.sha256(ref_audio_bytes).hexdigest()}:{ref_text}"
+        return await self._submit(
+            "voice_clone", params, voice,
+            lambda: self.create_voice_clone_prompt(ref_audio_bytes, ref_text=ref_text)
+        )
 
-        await self.model_manager.load_model("base")
-        _, tts = await self.model_manager.get_current_model()
+    async def create_voice_clone_prompt(self, ref_audio_bytes: bytes, ref_text: str = '', x_vector_only_mode: bool = False):
+        import hashlib
+        from core.singleflight import get_singleflight
 
-        loop = asyncio.get_event_loop()
-
-        async with self._gpu_lock:
-            if x_vector is None:
-                if ref_audio_bytes is None:
-                    raise ValueError("Either ref_audio_bytes or x_vector must be provided")
+        key = (hashlib.sha256(ref_audio_bytes).hexdigest(), ref_text, x_vector_only_mode)
+        return await get_singleflight("clone_prompt").do(
+            key, lambda _: self._create_voice_clone_prompt(ref_audio_bytes, ref_text, x_vector_only_mode)
+        )
 
-                ref_audio_array, ref_sr = process_ref_audio(ref_audio_bytes)
+    async def _create_voice_clone_prompt(self, ref_audio_bytes: bytes, ref_text: str, x_vector_only_mode: bool):
+        from utils.audio import process_ref_audio
 
-                x_vector = await loop.run_in_executor(
-                    None,
-                    functools.partial(
-                        tts.create_voice_clone_prompt,
-                        ref_audio=(ref_audio_array, ref_sr),
-                        ref_text=params.get('ref_text', ''),
-                        x_vector_only_mode=False,
-                    )
-                )
+        ref_audio_array, ref_sr = process_ref_audio(ref_audio_bytes)
 
-            wavs, sample_rate = await loop.run_in_executor(
+        loop = asyncio.get_event_loop()
+        async with self.batch_processor.use_model("base") as tts, self.batch_processor.gpu_lock:
+            return await loop.run_in_executor(
                 None,
                 functools.partial(
-                    tts.generate_voice_clone,
-                    text=params['text'],
-                    language=params['language'],
-                    voice_clone_prompt=x_vector,
-                    max_new_tokens=params['max_new_tokens'],
-                    temperature=params['temperature'],
-                    top_k=params['top_k'],
-                    top_p=params['top_p'],
-                    repetition_penalty=params['repetition_penalty'],
+                    tts.create_voice_clone_prompt,
+                    ref_audio=(ref_audio_array, ref_sr),
+                    ref_text=ref_text,
+                    x_vector_only_mode=x_vector_only_mode,
                 )
             )
 
+    async def stream(self, mode: str, params: dict, voice_clone_prompt=None) -> AsyncIterator[Tuple[bytes, int]]:
         import numpy as np
-        audio_data = wavs[0] if isinstance(wavs, list) else wavs
-        if isinstance(audio_data, list):
-            audio_data = np.array(audio_data)
-        return self._numpy_to_bytes(audio_data), sample_rate
+        from core import cancellation
+        from core.audio_cache import AudioCache
+
+        kwargs = {name: params[name] for name in self.batch_processor.SAMPLING_PARAMS}
+        kwargs["language"] = params["language"]
+        if mode == "custom_voice":
+            kwargs.update(speaker=params["speaker"], instruct=params.get("instruct") or "")
+        elif mode == "voice_design":
+            kwargs["instruct"] = params["instruct"]
+        else:
+            if voice_clone_prompt is None:
+                raise ValueError("voice_clone_prompt is required for streaming voice clone")
+            kwargs["voice_clone_prompt"] = voice_clone_prompt
+
+        # Same key and seed as a queued request, so streamed and queued results serve each other
+        key, seed = self._cache_key(mode, params, _prompt_fingerprint(voice_clone_prompt) if mode == "voice_clone" else None)
+        audio_cache = await AudioCache.get_instance()
+        cached = await audio_cache.get(key)
+        if cached is not None:
+            logger.info(f"Audio cache hit for streamed {mode} request {key[:8]}")
+            for chunk in self._wav_pcm_chunks(cached):
+                yield chunk
+            return
+
+        # Held for the whole stream, so loading another variant cannot move these weights mid-run
+        async with self.batch_processor.use_model(self.batch_processor.VARIANTS[mode]) as tts:
+            cancel_key = params.get("cancel_key")
+            cancel_token = cancellation.register(cancel_key)
+            kwargs["cancel_token"] = cancel_token
+
+            loop = asyncio.get_running_loop()
+            chunks: asyncio.Queue = asyncio.Queue()
+            wavs = []
+
+            def produce():
+                try:
+                    import torch
+                    torch.manual_seed(seed)
+                    for wav, sample_rate in tts.generate_stream(mode, params["text"], **kwargs):
+                        wavs.append(wav)
+                        loop.call_soon_threadsafe(chunks.put_nowait, (self._numpy_to_pcm(wav), sample_rate))
+                except Exception as e:
+                    loop.call_soon_threadsafe(chunks.put_nowait, e)
+                finally:
+                    loop.call_soon_threadsafe(chunks.put_nowait, None)
+
+            # The stream holds the device for its whole duration, like one batch would
+            completed = False
+            async with self.batch_processor.gpu_lock:
+                started = time.time()
+                producer = loop.run_in_executor(None, produce)
+                try:
+                    while True:
+                        item = await chunks.get()
+                        if item is None:
+                            break
+                        if isinstance(item, Exception):
+                            raise item
+                        yield item
+                    if cancel_token.is_set():
+                        raise cancellation.GenerationCancelled("Generation cancelled")
+                    completed = True
+                finally:
+                    # Also reached when the consumer stops early; decoding stops at the next step
+                    cancel_token.set()
+                    await producer
+                    cancellation.release(cancel_key, cancel_token)
+                    # Streams are not batched or reordered, but their device time counts toward the user's share
+                    await self.batch_processor.record_unbatched(
+                        {"mode": mode, "params": params}, time.time() - started,
+                        priority=params.get("priority", "interactive"), user_id=params.get("user_id")
+                    )
+
+        if completed and wavs:
+            await audio_cache.put(key, self._numpy_to_bytes(np.concatenate(wavs)))
 
     async def health_check(self) -> dict:
+        from core.audio_cache import AudioCache
+
+        audio_cache = await AudioCache.get_instance()
         return {
             "available": self.model_manager is not None,
-            "current_model": self.model_manager.current_model_name if self.model_manager else None
+            "current_model": self.model_manager.current_model_name if self.model_manager else None,
+            "audio_cache": audio_cache.get_stats()
         }
 
+    @staticmethod
+    def _wav_sample_rate(audio: bytes) -> int:
+        import io
+        import wave
+
+        with wave.open(io.BytesIO(audio), 'rb') as wav_file:
+            return wav_file.getframerate()
+
+    @staticmethod
+    def _wav_pcm_chunks(audio: bytes, seconds: float = 1.0):
+        import io
+        import wave
+
+        with wave.open(io.BytesIO(audio), 'rb') as wav_file:
+            sample_rate = wav_file.getframerate()
+            while True:
+                pcm = wav_file.readframes(int(sample_rate * seconds))
+                if not pcm:
+                    break
+                yield pcm, sample_rate
+
+    @staticmethod
+    def _numpy_to_pcm(audio_array) -> bytes:
+        import numpy as np
+
+        audio_array = np.clip(np.asarray(audio_array, dtype=np.float32), -1.0, 1.0)
+        return (audio_array * 32767).astype('<i2').tobytes()
+
     @staticmethod
     def _numpy_to_bytes(audio_array) -> bytes:
         import numpy as np
@@ -167,6 +340,49 @@ class LocalTTSBackend(TTSBackend):
         return buffer.read()
 
 
+class RemoteTTSBackend(TTSBackend):
+    def __init__(self, socket_paths: list):
+        from core.inference_ipc import InferenceWorkerPool
+        self.pool = InferenceWorkerPool(socket_paths)
+
+    async def _generate(self, op: str, params: dict, **extra) -> Tuple[bytes, int]:
+        reply = await self.pool.call(op, params=params, **extra)
+        return reply["audio"], reply["sample_rate"]
+
+    async def generate_custom_voice(self, params: dict) -> Tuple[bytes, int]:
+        return await self._generate("generate_custom_voice", params)
+
+    async def generate_voice_design(self, params: dict) -> Tuple[bytes, int]:
+        return await self._generate("generate_voice_design", params)
+
+    async def generate_voice_clone(self, params: dict, ref_audio_bytes: bytes = None, x_vector=None) -> Tuple[bytes, int]:
+        if x_vector is None and ref_audio_bytes is None:
+            raise ValueError("Either ref_audio_bytes or x_vector must be provided")
+        return await self._generate(
+            "generate_voice_clone", params, ref_audio_bytes=ref_audio_bytes, x_vector=x_vector
+        )
+
+    async def create_voice_clone_prompt(self, ref_audio_bytes: bytes, ref_text: str = '', x_vector_only_mode: bool = False):
+        reply = await self.pool.call(
+            "create_voice_clone_prompt",
+            ref_audio_bytes=ref_audio_bytes,
+            ref_text=ref_text,
+            x_vector_only_mode=x_vector_only_mode
+        )
+        return reply["prompt"]
+
+    async def stream(self, mode: str, params: dict, voice_clone_prompt=None) -> AsyncIterator[Tuple[bytes, int]]:
+        async for reply in self.pool.stream("stream", mode=mode, params=params, voice_clone_prompt=voice_clone_prompt):
+            yield reply["chunk"], reply["sample_rate"]
+
+    async def health_check(self) -> dict:
+        workers = await self.pool.health()
+        return {
+            "available": any(worker["available"] for worker in workers),
+            "workers": workers
+        }
+
+
 class AliyunTTSBackend(TTSBackend):
     def __init__(self, api_key: str, region: str):
         self.api_key = api_key
@@ -428,7 +644,7 @@ class AliyunTTSBackend(TTSBackend):
 
 
 class TTSServiceFactory:
-    _local_backend: Optional[LocalTTSBackend] = None
+    _local_backend: Optional[TTSBackend] = None
     _aliyun_backend: Optional[AliyunTTSBackend] = None
     _user_aliyun_backends: dict[str, AliyunTTSBackend] = {}
 
@@ -441,8 +657,12 @@ class TTSServiceFactory:
 
         if backend_type == "local":
             if cls._local_backend is None:
-                cls._local_backend = LocalTTSBackend()
-                await cls._local_backend.initialize()
+                worker_sockets = [path.strip() for path in settings.INFERENCE_WORKERS.split(",") if path.strip()]
+                if worker_sockets:
+                    cls._local_backend = RemoteTTSBackend(worker_sockets)
+                else:
+                    cls._local_backend = LocalTTSBackend()
+                    await cls._local_backend.initialize()
             return cls._local_backend
 
         elif backend_type == "aliyun":
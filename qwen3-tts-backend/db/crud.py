@@ -1,9 +1,9 @@
 import json
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
 
-from db.models import User, Job, VoiceCache, SystemSettings, VoiceDesign, AudiobookProject, AudiobookChapter, AudiobookCharacter, AudiobookSegment
+from db.models import TaskStatus, QueuedTask, UserUsage, User, Job, VoiceCache, SystemSettings, VoiceDesign, AudiobookProject, AudiobookChapter, AudiobookCharacter, AudiobookSegment
 
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
@@ -182,6 +182,154 @@ def delete_job(db: Session, job_id: int, user_id: int) -> bool:
     db.commit()
     return True
 
+def enqueue_task(
+    db: Session,
+    task_type: str,
+    payload: Dict[str, Any],
+    model_name: Optional[str] = None,
+    job_id: Optional[int] = None,
+    max_attempts: int = 3
+) -> QueuedTask:
+    task = QueuedTask(
+        task_type=task_type,
+        payload=payload,
+        model_name=model_name,
+        job_id=job_id,
+        max_attempts=max_attempts,
+        available_at=datetime.utcnow()
+    )
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    return task
+
+def claim_tasks(db: Session, worker_id: str, lease_seconds: float, limit: int) -> List[QueuedTask]:
+    now = datetime.utcnow()
+    candidates = db.query(QueuedTask.id).filter(
+        QueuedTask.status == TaskStatus.QUEUED,
+        QueuedTask.available_at <= now
+    ).order_by(QueuedTask.available_at, QueuedTask.id).limit(limit).all()
+
+    claimed = []
+    for (task_id,) in candidates:
+        # Compare-and-set on the status so concurrent workers never claim the same task
+        updated = db.query(QueuedTask).filter(
+            QueuedTask.id == task_id,
+            QueuedTask.status == TaskStatus.QUEUED
+        ).update({
+            QueuedTask.status: TaskStatus.LEASED,
+            QueuedTask.lease_owner: worker_id,
+            QueuedTask.lease_expires_at: now + timedelta(seconds=lease_seconds),
+            QueuedTask.heartbeat_at: now,
+            QueuedTask.attempts: QueuedTask.attempts + 1
+        }, synchronize_session=False)
+        db.commit()
+        if updated:
+            claimed.append(task_id)
+
+    if not claimed:
+        return []
+    return db.query(QueuedTask).filter(QueuedTask.id.in_(claimed)).order_by(QueuedTask.id).all()
+
+def heartbeat_tasks(db: Session, task_ids: List[int], worker_id: str, lease_seconds: float) -> int:
+    if not task_ids:
+        return 0
+    now = datetime.utcnow()
+    updated = db.query(QueuedTask).filter(
+        QueuedTask.id.in_(task_ids),
+        QueuedTask.status == TaskStatus.LEASED,
+        QueuedTask.lease_owner == worker_id
+    ).update({
+        QueuedTask.heartbeat_at: now,
+        QueuedTask.lease_expires_at: now + timedelta(seconds=lease_seconds)
+    }, synchronize_session=False)
+    db.commit()
+    return updated
+
+def complete_task(db: Session, task_id: int, worker_id: str) -> bool:
+    updated = db.query(QueuedTask).filter(
+        QueuedTask.id == task_id,
+        QueuedTask.lease_owner == worker_id
+    ).update({
+        QueuedTask.status: TaskStatus.DONE,
+        QueuedTask.lease_owner: None,
+        QueuedTask.lease_expires_at: None,
+        QueuedTask.completed_at: datetime.utcnow()
+    }, synchronize_session=False)
+    db.commit()
+    return updated > 0
+
+def fail_task(
+    db: Session,
+    task_id: int,
+    worker_id: str,
+    error: str,
+    retry_delay_seconds: float,
+    retry: bool = True
+) -> Optional[QueuedTask]:
+    task = db.query(QueuedTask).filter(
+        QueuedTask.id == task_id,
+        QueuedTask.lease_owner == worker_id
+    ).first()
+    if not task:
+        return None
+
+    task.last_error = error
+    task.lease_owner = None
+    task.lease_expires_at = None
+    if not retry or task.attempts >= task.max_attempts:
+        task.status = TaskStatus.FAILED
+        task.completed_at = datetime.utcnow()
+    else:
+        task.status = TaskStatus.QUEUED
+        task.available_at = datetime.utcnow() + timedelta(seconds=retry_delay_seconds)
+    db.commit()
+    db.refresh(task)
+    return task
+
+def requeue_expired_tasks(db: Session) -> tuple[List[int], List[int]]:
+    now = datetime.utcnow()
+    expired = db.query(QueuedTask.id, QueuedTask.attempts, QueuedTask.max_attempts).filter(
+        QueuedTask.status == TaskStatus.LEASED,
+        QueuedTask.lease_expires_at < now
+    ).all()
+
+    requeued, dead = [], []
+    for task_id, attempts, max_attempts in expired:
+        exhausted = attempts >= max_attempts
+        values = {
+            QueuedTask.lease_owner: None,
+            QueuedTask.lease_expires_at: None,
+            QueuedTask.last_error: "Lease expired without heartbeat"
+        }
+        if exhausted:
+            values.update({QueuedTask.status: TaskStatus.FAILED, QueuedTask.completed_at: now})
+        else:
+            values.update({QueuedTask.status: TaskStatus.QUEUED, QueuedTask.available_at: now})
+        updated = db.query(QueuedTask).filter(
+            QueuedTask.id == task_id,
+            QueuedTask.status == TaskStatus.LEASED,
+            QueuedTask.lease_expires_at < now
+        ).update(values, synchronize_session=False)
+        db.commit()
+        if updated:
+            (dead if exhausted else requeued).append(task_id)
+    return requeued, dead
+
+def get_queued_task(db: Session, task_id: int) -> Optional[QueuedTask]:
+    return db.query(QueuedTask).filter(QueuedTask.id == task_id).first()
+
+def list_pending_model_tasks(db: Session) -> List[QueuedTask]:
+    return db.query(QueuedTask).filter(
+        QueuedTask.status.in_([TaskStatus.QUEUED, TaskStatus.LEASED]),
+        QueuedTask.model_name.isnot(None)
+    ).order_by(QueuedTask.id).all()
+
+def count_tasks_by_status(db: Session) -> Dict[str, int]:
+    from sqlalchemy import func
+    rows = db.query(QueuedTask.status, func.count(QueuedTask.id)).group_by(QueuedTask.status).all()
+    return {status: count for status, count in rows}
+
 def create_cache_entry(
     db: Session,
     user_id: int,
@@ -251,6 +399,46 @@ def update_user_preferences(db: Session, user_id: int, preferences: dict) -> Opt
     db.refresh(user)
     return user
 
+def record_user_usage(db: Session, usage: Dict[int, Dict[str, float]]) -> None:
+    today = datetime.utcnow().date()
+    for user_id, totals in usage.items():
+        row = db.query(UserUsage).filter(UserUsage.user_id == user_id, UserUsage.day == today).first()
+        if row is None:
+            row = UserUsage(user_id=user_id, day=today, device_seconds=0.0, request_count=0, characters=0)
+            db.add(row)
+        row.device_seconds += totals["device_seconds"]
+        row.request_count += int(totals["requests"])
+        row.characters += int(totals["characters"])
+    db.commit()
+
+def get_usage_summary(db: Session, since: date) -> List[Dict[str, Any]]:
+    from sqlalchemy import func
+    rows = db.query(
+        User.id,
+        User.username,
+        func.sum(UserUsage.device_seconds),
+        func.sum(UserUsage.request_count),
+        func.sum(UserUsage.characters)
+    ).join(UserUsage, UserUsage.user_id == User.id).filter(
+        UserUsage.day >= since
+    ).group_by(User.id, User.username).order_by(func.sum(UserUsage.device_seconds).desc()).all()
+    return [
+        {
+            "user_id": user_id,
+            "username": username,
+            "device_seconds": device_seconds or 0.0,
+            "request_count": request_count or 0,
+            "characters": characters or 0
+        }
+        for user_id, username, device_seconds, request_count, characters in rows
+    ]
+
+def list_user_usage(db: Session, user_id: int, since: date) -> List[UserUsage]:
+    return db.query(UserUsage).filter(
+        UserUsage.user_id == user_id,
+        UserUsage.day >= since
+    ).order_by(UserUsage.day.desc()).all()
+
 def get_system_setting(db: Session, key: str) -> Optional[dict]:
     setting = db.query(SystemSettings).filter(SystemSettings.key == key).first()
     if not setting:
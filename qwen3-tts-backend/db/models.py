@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Float, ForeignKey, Text, Index, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from db.database import Base
@@ -11,6 +11,12 @@ class JobStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+class TaskStatus(str, Enum):
+    QUEUED = "queued"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
 class AudiobookStatus(str, Enum):
     PENDING = "pending"
     ANALYZING = "analyzing"
@@ -71,6 +77,30 @@ class Job(Base):
         Index('idx_user_created', 'user_id', 'created_at'),
     )
 
+class QueuedTask(Base):
+    __tablename__ = "task_queue"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_type = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), default="queued", nullable=False)
+    model_name = Column(String(50), nullable=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    available_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('idx_task_status_available', 'status', 'available_at'),
+        Index('idx_task_status_lease', 'status', 'lease_expires_at'),
+    )
+
 class VoiceCache(Base):
     __tablename__ = "voice_caches"
 
@@ -89,6 +119,21 @@ class VoiceCache(Base):
         Index('idx_user_hash', 'user_id', 'ref_audio_hash'),
     )
 
+class UserUsage(Base):
+    __tablename__ = "user_usage"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    day = Column(Date, nullable=False, index=True)
+    device_seconds = Column(Float, default=0.0, nullable=False)
+    request_count = Column(Integer, default=0, nullable=False)
+    characters = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'day', name='uq_user_usage_day'),
+    )
+
 class SystemSettings(Base):
     __tablename__ = "system_settings"
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -15,7 +16,7 @@ from core.config import settings
 from core.database import init_db
 from core.model_manager import ModelManager
 from core.cleanup import run_scheduled_cleanup
-from api import auth, jobs, tts, users, voice_designs, audiobook
+from api import auth, jobs, tts, users, voice_designs, audiobook, realtime
 from api.auth import get_current_user
 from schemas.user import User
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -95,12 +96,27 @@ async def lifespan(app: FastAPI):
         logger.error(f"Superuser initialization failed: {e}")
         raise
 
-    try:
-        model_manager = await ModelManager.get_instance()
-        await model_manager.load_model("custom-voice")
-        logger.info("Preloaded custom-voice model")
-    except Exception as e:
-        logger.warning(f"Model preload failed: {e}")
+    async def preload_model():
+        try:
+            model_manager = await ModelManager.get_instance()
+            await model_manager.load_model("custom-voice")
+            logger.info("Preloaded custom-voice model")
+        except Exception as e:
+            logger.warning(f"Model preload failed: {e}")
+
+    # Preload in the background so the API (and /health load progress) is available meanwhile;
+    # with INFERENCE_WORKERS the models live in the worker processes instead
+    preload_task = None
+    if not settings.INFERENCE_WORKERS:
+        preload_task = asyncio.create_task(preload_model())
+
+    from core.event_bus import get_event_bus
+    event_bus = get_event_bus()
+    await event_bus.start()
+
+    # Tasks leased by an interrupted session are picked up again once their lease expires
+    from core.task_queue import TaskQueue
+    task_queue = await TaskQueue.get_instance()
 
     scheduler = AsyncIOScheduler()
     scheduler.add_job(
@@ -110,6 +126,15 @@ async def lifespan(app: FastAPI):
         args=[str(settings.DATABASE_URL)],
         id='cleanup_task'
     )
+    # Voice cache reads only count accesses; they reach the database in batches
+    from core.cache_manager import VoiceCacheManager
+    voice_cache = await VoiceCacheManager.get_instance()
+    scheduler.add_job(
+        voice_cache.flush_stats,
+        'interval',
+        seconds=settings.VOICE_CACHE_STATS_FLUSH_SECONDS,
+        id='voice_cache_stats_task'
+    )
     scheduler.start()
     logger.info("Background cleanup scheduler started (runs every 6 hours)")
 
@@ -117,8 +142,18 @@ async def lifespan(app: FastAPI):
 
     logger.info("Shutting down Qwen3-TTS Backend Service...")
 
+    if preload_task is not None and not preload_task.done():
+        preload_task.cancel()
+        await asyncio.gather(preload_task, return_exceptions=True)
     scheduler.shutdown()
     logger.info("Scheduler shutdown completed")
+    await voice_cache.flush_stats()
+    from core.batch_processor import TTSBatchProcessor
+    if TTSBatchProcessor._instance is not None:
+        await TTSBatchProcessor._instance.flush_usage()
+
+    await task_queue.stop()
+    await event_bus.stop()
 
     try:
         model_manager = await ModelManager.get_instance()
@@ -151,10 +186,41 @@ app.include_router(tts.router)
 app.include_router(users.router)
 app.include_router(voice_designs.router)
 app.include_router(audiobook.router)
+app.include_router(realtime.router)
+
+def _summarize_load_status(load_status: dict) -> dict:
+    return {
+        name: {
+            "state": status["state"],
+            "progress": status["progress"],
+            "duration_seconds": status["duration_seconds"],
+        }
+        for name, status in load_status.items()
+    }
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
+    if settings.INFERENCE_WORKERS:
+        from core.tts_service import TTSServiceFactory
+        backend = await TTSServiceFactory.get_backend("local")
+        workers = (await backend.health_check())["workers"]
+        return {
+            "status": "ok",
+            "workers": [
+                {
+                    "socket": worker["socket"],
+                    "available": worker["available"],
+                    "models": _summarize_load_status(worker.get("models", {})),
+                }
+                for worker in workers
+            ]
+        }
+
+    model_manager = await ModelManager.get_instance()
+    return {
+        "status": "ok",
+        "models": _summarize_load_status(model_manager.get_load_status())
+    }
 
 
 @app.get("/health/details")
@@ -162,7 +228,7 @@ async def health_check_details(current_user: User = Depends(get_current_user)):
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Superuser access required")
 
-    from core.batch_processor import BatchProcessor
+    from core.batch_processor import TTSBatchProcessor
     from core.database import SessionLocal
 
     gpu_available = torch.cuda.is_available()
@@ -176,9 +242,26 @@ async def health_check_details(current_user: User = Depends(get_current_user)):
     model_manager = await ModelManager.get_instance()
     current_model, _ = await model_manager.get_current_model()
 
-    batch_processor = await BatchProcessor.get_instance()
+    batch_processor = await TTSBatchProcessor.get_instance()
     queue_length = await batch_processor.get_queue_length()
 
+    from core.job_scheduler import JobScheduler
+    job_scheduler = await JobScheduler.get_instance()
+    queue_length += job_scheduler.get_queue_length()
+
+    from core.task_queue import TaskQueue
+    task_queue = await TaskQueue.get_instance()
+
+    from core.admission import AdmissionController
+    admission = await AdmissionController.get_instance()
+
+    from core.job_events import JobEventBroker
+    from core.event_bus import get_event_bus
+    from core import cancellation, singleflight
+    from core.cache_manager import VoiceCacheManager
+    job_events = await JobEventBroker.get_instance()
+    voice_cache = await VoiceCacheManager.get_instance()
+
     database_connected = True
     try:
         db = SessionLocal()
@@ -255,6 +338,15 @@ async def health_check_details(current_user: User = Depends(get_current_user)):
         "gpu_memory_total_mb": gpu_memory_total_mb,
         "queue_length": queue_length,
         "active_model": current_model,
+        "models": model_manager.get_model_stats(),
+        "scheduler": await job_scheduler.get_stats(),
+        "tasks": await task_queue.get_stats(),
+        "admission": admission.get_stats(),
+        "job_events": job_events.get_stats(),
+        "event_bus": get_event_bus().get_stats(),
+        "cancellation": cancellation.get_stats(),
+        "singleflight": singleflight.get_stats(),
+        "voice_cache": voice_cache.get_stats(),
         "database_connected": database_connected,
         "cache_dir_writable": cache_dir_writable,
         "output_dir_writable": output_dir_writable,
@@ -24,6 +24,7 @@ class CustomVoiceRequest(BaseModel):
     top_k: Optional[int] = Field(default=50, ge=1, le=100)
     top_p: Optional[float] = Field(default=1.0, ge=0.0, le=1.0)
     repetition_penalty: Optional[float] = Field(default=1.05, ge=1.0, le=2.0)
+    seed: Optional[int] = Field(default=None, ge=0, le=2**32 - 1)
     backend: Optional[str] = Field(default=None, description="Backend type: local or aliyun")
 
 
@@ -37,6 +38,7 @@ class VoiceDesignRequest(BaseModel):
     top_k: Optional[int] = Field(default=50, ge=1, le=100)
     top_p: Optional[float] = Field(default=1.0, ge=0.0, le=1.0)
     repetition_penalty: Optional[float] = Field(default=1.05, ge=1.0, le=2.0)
+    seed: Optional[int] = Field(default=None, ge=0, le=2**32 - 1)
     backend: Optional[str] = Field(default=None)
 
 
@@ -51,3 +53,16 @@ class VoiceCloneRequest(BaseModel):
     top_k: Optional[int] = Field(default=50, ge=1, le=100)
     top_p: Optional[float] = Field(default=1.0, ge=0.0, le=1.0)
     repetition_penalty: Optional[float] = Field(default=1.05, ge=1.0, le=2.0)
+    seed: Optional[int] = Field(default=None, ge=0, le=2**32 - 1)
+
+
+class VoiceCloneStreamRequest(BaseModel):
+    text: str = Field(..., min_length=1, max_length=1000)
+    language: str = Field(default="Auto")
+    voice_design_id: int
+    max_new_tokens: Optional[int] = Field(default=2048, ge=128, le=4096)
+    temperature: Optional[float] = Field(default=0.9, ge=0.1, le=2.0)
+    top_k: Optional[int] = Field(default=50, ge=1, le=100)
+    top_p: Optional[float] = Field(default=1.0, ge=0.0, le=1.0)
+    repetition_penalty: Optional[float] = Field(default=1.05, ge=1.0, le=2.0)
+    seed: Optional[int] = Field(default=None, ge=0, le=2**32 - 1)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator, ConfigDict
 import re
@@ -86,6 +86,33 @@ class UserListResponse(BaseModel):
     skip: int
     limit: int
 
+class UserUsageDay(BaseModel):
+    day: date
+    device_seconds: float
+    request_count: int
+    characters: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class UserUsageSummary(BaseModel):
+    user_id: int
+    username: str
+    device_seconds: float
+    request_count: int
+    characters: int
+
+class UserUsageListResponse(BaseModel):
+    since: date
+    users: list[UserUsageSummary]
+
+class UserUsageDetailResponse(BaseModel):
+    user_id: int
+    since: date
+    device_seconds: float
+    request_count: int
+    characters: int
+    days: list[UserUsageDay]
+
 class Token(BaseModel):
     access_token: str
     token_type: str
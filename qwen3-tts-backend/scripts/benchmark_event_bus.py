@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TOPIC = "benchmark"
+
+
+def summarize(latencies: list[float]) -> str:
+    latencies = sorted(latencies)
+    p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+    return (
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms   "
+        f"p95 {p95 * 1000:7.2f} ms   max {latencies[-1] * 1000:7.2f} ms"
+    )
+
+
+async def measure_memory(count: int) -> list[float]:
+    from core.event_bus import MemoryEventBus
+
+    bus = MemoryEventBus()
+    latencies = []
+    bus.subscribe(TOPIC, lambda message: latencies.append(time.perf_counter() - message["sent"]))
+    for index in range(count):
+        bus.publish(TOPIC, {"index": index, "sent": time.perf_counter()})
+        await asyncio.sleep(0)
+    return latencies
+
+
+async def measure_sqlite(path: str, count: int, interval: float, poll_interval: float) -> list[float]:
+    from core.event_bus import SQLiteEventBus
+
+    bus = SQLiteEventBus(path, poll_interval, retention_seconds=60.0)
+    latencies = []
+    received = asyncio.Event()
+
+    def on_message(message):
+        latencies.append(time.time() - message["sent"])
+        if len(latencies) >= count:
+            received.set()
+
+    bus.subscribe(TOPIC, on_message)
+    await bus.start()
+
+    # The publisher is a separate process, like another uvicorn worker
+    publisher = await asyncio.create_subprocess_exec(
+        sys.executable, __file__, "--role", "publisher", "--path", path,
+        "--count", str(count), "--interval", str(interval), "--poll-interval", str(poll_interval),
+    )
+    try:
+        await asyncio.wait_for(received.wait(), timeout=count * interval + 30)
+    finally:
+        await publisher.wait()
+        await bus.stop()
+    return latencies
+
+
+async def publish(path: str, count: int, interval: float, poll_interval: float) -> None:
+    from core.event_bus import SQLiteEventBus
+
+    bus = SQLiteEventBus(path, poll_interval, retention_seconds=60.0)
+    await bus.start()
+    for index in range(count):
+        bus.publish(TOPIC, {"index": index, "sent": time.time()})
+        await asyncio.sleep(interval)
+    await bus.stop()
+
+
+async def run(args):
+    memory = await measure_memory(args.count)
+    print(f"{args.count} messages, one every {args.interval * 1000:.0f} ms")
+    print(f"  memory, same process:               {summarize(memory)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for poll_interval in args.poll_intervals:
+            path = str(Path(tmp) / f"bus_{poll_interval}.db")
+            latencies = await measure_sqlite(path, args.count, args.interval, poll_interval)
+            print(f"  sqlite, other process, poll {poll_interval * 1000:4.0f} ms: {summarize(latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure delivery latency of the event bus backends")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.01, help="Delay between published messages")
+    parser.add_argument("--poll-intervals", type=json.loads, default=[0.005, 0.02, 0.05])
+    parser.add_argument("--role", choices=["benchmark", "publisher"], default="benchmark")
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    parser.add_argument("--poll-interval", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MODEL_BASE_PATH", tempfile.gettempdir())
+    if args.role == "publisher":
+        asyncio.run(publish(args.path, args.count, args.interval, args.poll_interval))
+    else:
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
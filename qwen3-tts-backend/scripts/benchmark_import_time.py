@@ -0,0 +1,69 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+HEAVY_MODULES = ["torch", "transformers", "librosa", "onnxruntime", "sox", "torchaudio"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str, runs: int) -> tuple[list[float], list[str]]:
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(sample["elapsed"])
+        loaded = sample["loaded"]
+    return timings, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time of the qwen_tts package")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=0.5, help="Median budget in seconds for `import qwen_tts`")
+    parser.add_argument("--full", action="store_true", help="Also time `from qwen_tts import Qwen3TTSModel`")
+    args = parser.parse_args()
+
+    failed = False
+
+    timings, loaded = measure("import qwen_tts", args.runs)
+    median = statistics.median(timings)
+    print(f"import qwen_tts: median {median * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms over {args.runs} runs")
+    if loaded:
+        print(f"  heavy modules imported eagerly: {', '.join(loaded)}")
+        failed = True
+    if median > args.budget:
+        print(f"  over budget of {args.budget * 1000:.0f} ms")
+        failed = True
+
+    if args.full:
+        timings, loaded = measure("from qwen_tts import Qwen3TTSModel", args.runs)
+        print(f"from qwen_tts import Qwen3TTSModel: median {statistics.median(timings):.2f} s")
+        deferred = [m for m in ("onnxruntime", "sox", "torchaudio") if m in loaded]
+        if deferred:
+            print(f"  25Hz tokenizer dependencies imported eagerly: {', '.join(deferred)}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+POLL_INTERVAL = 2.0
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+async def process_jobs(job_ids, job_seconds: float):
+    from core.database import SessionLocal
+    from core.job_events import publish_job_update
+    from datetime import datetime
+    from db.models import Job, JobStatus
+
+    # Jobs run one after another, the way a single local model serves them
+    for job_id in job_ids:
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            job.status = JobStatus.PROCESSING
+            job.started_at = datetime.utcnow()
+            db.commit()
+            await publish_job_update(db, job)
+
+            await asyncio.sleep(job_seconds)
+
+            job.status = JobStatus.COMPLETED
+            job.completed_at = datetime.utcnow()
+            db.commit()
+            await publish_job_update(db, job)
+        finally:
+            db.close()
+
+
+async def poll_client(job_id: int):
+    from core.admission import AdmissionController
+    from core.database import SessionLocal
+    from core.job_events import serialize_job
+    from db.models import Job
+
+    admission = await AdmissionController.get_instance()
+    while True:
+        # Same reads as GET /jobs/{id}
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            data = serialize_job(job, admission.estimate_eta(db, job))
+        finally:
+            db.close()
+        if data["status"] in ("completed", "failed"):
+            return
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+async def event_client(queue: asyncio.Queue, job_id: int):
+    while True:
+        event = await queue.get()
+        if event["type"] == "job.updated" and event["job"]["id"] == job_id and event["job"]["status"] in ("completed", "failed"):
+            return
+
+
+def create_jobs(prefix: str, clients: int):
+    from core.database import SessionLocal
+    from db.models import Job, JobStatus, User
+
+    db = SessionLocal()
+    try:
+        job_ids = []
+        for index in range(clients):
+            user = User(username=f"{prefix}{index}", email=f"{prefix}{index}@example.com", hashed_password="x")
+            db.add(user)
+            db.flush()
+            job = Job(user_id=user.id, job_type="custom-voice", status=JobStatus.PENDING, backend_type="local", input_data="", input_params={})
+            db.add(job)
+            db.flush()
+            job_ids.append((user.id, job.id))
+        db.commit()
+        return job_ids
+    finally:
+        db.close()
+
+
+async def run_mode(mode: str, clients: int, job_seconds: float, counter: QueryCounter) -> tuple[int, float]:
+    from core.job_events import JobEventBroker
+
+    jobs = create_jobs(mode, clients)
+    broker = await JobEventBroker.get_instance()
+    queues = [broker.subscribe(user_id) for user_id, _ in jobs] if mode == "events" else []
+
+    start_count = counter.count
+    start = time.perf_counter()
+    if mode == "events":
+        watchers = [event_client(queue, job_id) for queue, (_, job_id) in zip(queues, jobs)]
+    elif mode == "poll":
+        watchers = [poll_client(job_id) for _, job_id in jobs]
+    else:
+        watchers = []
+    await asyncio.gather(process_jobs([job_id for _, job_id in jobs], job_seconds), *watchers)
+    elapsed = time.perf_counter() - start
+
+    for queue, (user_id, _) in zip(queues, jobs):
+        broker.unsubscribe(user_id, queue)
+    return counter.count - start_count, elapsed
+
+
+async def run(args):
+    from sqlalchemy import event
+    from core.database import engine, init_db
+    from db import models
+
+    init_db()
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+
+    results = {}
+    for mode in ("idle", "poll", "events"):
+        results[mode] = await run_mode(mode, args.clients, args.job_seconds, counter)
+    # Processing with nobody watching is the share both modes have in common
+    processing_queries, _ = results.pop("idle")
+
+    print(f"{args.clients} clients, one job each, {args.job_seconds:.1f}s per job, {POLL_INTERVAL:.0f}s poll interval")
+    print(f"  processing alone: {processing_queries} queries")
+    for mode, (queries, elapsed) in results.items():
+        # Published events compute the job's ETA once per transition, however many clients listen
+        extra = max(queries - processing_queries, 0)
+        print(
+            f"  {mode:<7} {queries:6d} queries in {elapsed:6.1f}s, {extra} beyond processing, "
+            f"{extra / args.clients / (elapsed / 60):6.2f} per client per minute"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count database queries of clients watching job status by polling versus the /jobs/events stream"
+    )
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--job-seconds", type=float, default=0.5, help="Simulated processing time per job")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{tmp}/bench.db")
+        os.environ.setdefault("MODEL_BASE_PATH", tmp)
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+PARAMS = {
+    "language": "Auto",
+    "speaker": "Vivian",
+    "instruct": "",
+    "max_new_tokens": 2048,
+    "temperature": 0.9,
+    "top_k": 50,
+    "top_p": 1.0,
+    "repetition_penalty": 1.05,
+}
+
+
+async def measure(backend, text: str, runs: int) -> tuple[list[float], list[float], list[float]]:
+    full, first_chunk, streamed = [], [], []
+    params = {**PARAMS, "text": text}
+    for _ in range(runs):
+        start = time.perf_counter()
+        await backend.generate_custom_voice(params)
+        full.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        first = None
+        async for _chunk, _sample_rate in backend.stream("custom_voice", params):
+            if first is None:
+                first = time.perf_counter() - start
+        first_chunk.append(first)
+        streamed.append(time.perf_counter() - start)
+    return full, first_chunk, streamed
+
+
+async def run(args):
+    from core.inference_worker import InferenceWorker
+    from core.tts_service import RemoteTTSBackend
+
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = str(Path(tmp) / "worker.sock")
+        worker = InferenceWorker(socket_path, fake=True, fake_frame_delay=args.frame_delay)
+        server = await worker.start()
+        backend = RemoteTTSBackend([socket_path])
+        try:
+            full, first_chunk, streamed = await measure(backend, "x" * args.chars, args.runs)
+        finally:
+            await backend.pool.close()
+            # Let the worker notice the closed connection before the loop shuts down
+            await asyncio.sleep(0.1)
+            server.close()
+            await server.wait_closed()
+
+    print(f"{args.chars} chars, {args.frame_delay * 1000:.0f} ms per frame, {args.runs} runs (median)")
+    print(f"  complete WAV:         {statistics.median(full) * 1000:8.1f} ms")
+    print(f"  stream first chunk:   {statistics.median(first_chunk) * 1000:8.1f} ms")
+    print(f"  stream last chunk:    {statistics.median(streamed) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare time-to-first-byte of streaming and complete synthesis against a fake inference worker"
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--chars", type=int, default=120, help="Length of the synthesized text")
+    parser.add_argument("--frame-delay", type=float, default=0.02, help="Simulated decode time per codec frame")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
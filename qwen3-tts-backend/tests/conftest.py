@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+REPO_DIR = BACKEND_DIR.parent
+
+# Settings are read once at import time, so point everything at a scratch directory before any backend import
+_tmp_dir = Path(tempfile.mkdtemp(prefix="qwen-tts-tests-"))
+os.environ.setdefault("MODEL_BASE_PATH", str(_tmp_dir))
+os.environ.setdefault("MODEL_DEVICE", "cpu")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir / 'test.db'}")
+os.environ.setdefault("CACHE_DIR", str(_tmp_dir / "voice_cache"))
+os.environ.setdefault("OUTPUT_DIR", str(_tmp_dir / "outputs"))
+os.environ.setdefault("AUDIO_CACHE_DIR", str(_tmp_dir / "audio_cache"))
+os.environ.setdefault("EVENT_BUS_PATH", str(_tmp_dir / "event_bus.db"))
+os.environ.setdefault("LOG_FILE", str(_tmp_dir / "app.log"))
+
+for path in (BACKEND_DIR, REPO_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.admission import AdmissionController, estimate_cost
+from db import crud
+from db.database import Base, SessionLocal, engine
+from db.models import Job, QueuedTask, TaskStatus
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.query(QueuedTask).delete()
+    session.commit()
+    session.close()
+
+
+def _queue(db, job_id: int, text: str, status: TaskStatus = TaskStatus.QUEUED, delay: float = 0.0) -> None:
+    db.add(QueuedTask(
+        task_type="tts.custom_voice",
+        payload={"request_data": {"text": text}},
+        status=status.value,
+        model_name="custom-voice",
+        job_id=job_id,
+        available_at=datetime.utcnow() + timedelta(seconds=delay),
+    ))
+    db.commit()
+
+
+def _job(job_id: int, status: str = "pending", backend_type: str = "local") -> Job:
+    started_at = datetime.utcnow() if status == "processing" else None
+    return Job(id=job_id, status=status, backend_type=backend_type, started_at=started_at)
+
+
+def test_etas_read_the_queue_once(db, monkeypatch):
+    _queue(db, 1, "a" * 80, status=TaskStatus.LEASED)
+    _queue(db, 2, "b" * 180)
+    _queue(db, 3, "c" * 30, delay=600)
+    admission = AdmissionController()
+    throughput = admission.throughput()
+    jobs = [_job(1, "processing"), _job(2), _job(3), _job(4, "completed"), _job(5, backend_type="aliyun"), _job(6)]
+
+    calls = []
+    list_pending_model_tasks = crud.list_pending_model_tasks
+    monkeypatch.setattr(crud, "list_pending_model_tasks", lambda session: calls.append(1) or list_pending_model_tasks(session))
+
+    etas = admission.estimate_etas(db, jobs)
+
+    assert len(calls) == 1
+    assert etas[1] == pytest.approx(estimate_cost("custom-voice", "a" * 80) / throughput, abs=0.1)
+    assert etas[2] == pytest.approx((estimate_cost("custom-voice", "a" * 80) + estimate_cost("custom-voice", "b" * 180)) / throughput)
+    # A retry backing off waits longer than the work ahead of it
+    assert etas[3] == pytest.approx(600, abs=1)
+    assert etas[4] is None and etas[5] is None and etas[6] is None
+    for job in jobs:
+        assert admission.estimate_eta(db, job) == pytest.approx(etas[job.id], abs=0.1)
+
+
+def test_etas_skip_the_queue_without_active_jobs(db, monkeypatch):
+    monkeypatch.setattr(crud, "list_pending_model_tasks", lambda session: pytest.fail("queue was read"))
+
+    etas = AdmissionController().estimate_etas(db, [_job(1, "completed"), _job(2, backend_type="aliyun")])
+
+    assert etas == {1: None, 2: None}
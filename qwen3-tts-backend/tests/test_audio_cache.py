@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+
+import pytest
+
+from core.audio_cache import AudioCache, save_audio
+
+ENTRY_BYTES = 1000
+
+
+def _audio(index: int) -> bytes:
+    return bytes([index % 256]) * ENTRY_BYTES
+
+
+def _disk_bytes(cache: AudioCache) -> int:
+    return sum(path.stat().st_size for path in cache.cache_dir.glob("*.wav"))
+
+
+async def test_file_io_runs_off_the_event_loop(tmp_path, monkeypatch):
+    cache = AudioCache(str(tmp_path), 10 * ENTRY_BYTES)
+    threads = []
+    for name in ("_read", "_write"):
+        method = getattr(cache, name)
+
+        def recording(*args, method=method):
+            threads.append(threading.current_thread())
+            return method(*args)
+
+        monkeypatch.setattr(cache, name, recording)
+
+    stored = await cache.put("a", _audio(1))
+    assert await cache.get("a") == stored == _audio(1)
+    assert await cache.get("missing") is None
+
+    assert len(threads) == 3
+    assert all(thread is not threading.main_thread() for thread in threads)
+
+
+async def test_hit_does_not_touch_linked_job_outputs(tmp_path):
+    cache = AudioCache(str(tmp_path / "cache"), 3 * ENTRY_BYTES)
+    for index, key in enumerate("abc"):
+        stored = await cache.put(key, _audio(index))
+        if key == "a":
+            output = tmp_path / "job_output.wav"
+            save_audio(stored, output)
+    assert output.stat().st_ino == cache._path("a").stat().st_ino
+
+    old = time.time() - 3600
+    os.utime(output, (old, old))
+    assert await cache.get("a") is not None
+
+    # The shared inode keeps its mtime, so retention of the job output is unaffected
+    assert output.stat().st_mtime == pytest.approx(old)
+    # Recency still moved in memory: b is now the least recently used entry
+    await cache.put("d", _audio(3))
+    assert sorted(path.stem for path in cache.cache_dir.glob("*.wav")) == ["a", "c", "d"]
+    assert output.exists()
+
+
+async def test_store_under_the_bound_does_not_scan_the_directory(tmp_path, monkeypatch):
+    cache = AudioCache(str(tmp_path), 4 * ENTRY_BYTES)
+    syncs = []
+    sync_with_disk = cache._sync_with_disk
+    monkeypatch.setattr(cache, "_sync_with_disk", lambda: syncs.append(1) or sync_with_disk())
+    other = AudioCache(str(tmp_path), 4 * ENTRY_BYTES)
+    await other.put("other", _audio(9))
+
+    for index in range(4):
+        await cache.put(f"own-{index}", _audio(index))
+    assert syncs == []
+
+    # Crossing the bound reconciles first, so the other process's file counts and the oldest entry goes
+    await cache.put("own-4", _audio(4))
+    assert len(syncs) == 1
+    assert sorted(path.stem for path in tmp_path.glob("*.wav")) == ["own-1", "own-2", "own-3", "own-4"]
+    assert cache.size == _disk_bytes(cache)
+
+
+async def test_reconciles_on_a_timer(tmp_path, monkeypatch):
+    cache = AudioCache(str(tmp_path), 4 * ENTRY_BYTES)
+    other = AudioCache(str(tmp_path), 4 * ENTRY_BYTES)
+    await other.put("other", _audio(9))
+    await cache.put("own", _audio(1))
+    assert cache.size == ENTRY_BYTES
+
+    monkeypatch.setattr(AudioCache, "SYNC_INTERVAL_SECONDS", 0.0)
+    await cache.put("own", _audio(1))
+    assert cache.size == 2 * ENTRY_BYTES
+    assert set(cache._entries) == {"other", "own"}
+
+
+async def test_processes_sharing_the_directory_stay_within_the_bound(tmp_path, monkeypatch):
+    # Reconciling on every store keeps the shared bound exact
+    monkeypatch.setattr(AudioCache, "SYNC_INTERVAL_SECONDS", 0.0)
+    first = AudioCache(str(tmp_path), 4 * ENTRY_BYTES)
+    second = AudioCache(str(tmp_path), 4 * ENTRY_BYTES)
+
+    for index in range(6):
+        await first.put(f"first-{index}", _audio(index))
+        await second.put(f"second-{index}", _audio(index))
+        assert _disk_bytes(first) <= 4 * ENTRY_BYTES
+
+    # Each store saw what the other wrote; sizes agree with the files left
+    assert first.size == second.size == _disk_bytes(first)
+    assert {path.stem for path in tmp_path.glob("*.wav")} == {"first-4", "second-4", "first-5", "second-5"}
+
+
+async def test_restart_orders_entries_by_write_time(tmp_path):
+    cache = AudioCache(str(tmp_path), 3 * ENTRY_BYTES)
+    for index, key in enumerate("abc"):
+        await cache.put(key, _audio(index))
+        os.utime(cache._path(key), (1000 + index, 1000 + index))
+
+    restarted = AudioCache(str(tmp_path), 3 * ENTRY_BYTES)
+    assert list(restarted._entries) == ["a", "b", "c"]
+    await restarted.put("d", _audio(3))
+    assert not restarted._path("a").exists()
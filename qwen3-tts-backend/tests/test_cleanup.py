@@ -0,0 +1,69 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from core.cleanup import cleanup_orphaned_files
+from core.config import settings
+from db.database import Base, SessionLocal, engine
+from db.models import QueuedTask, TaskStatus
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path / "outputs"))
+    monkeypatch.setattr(settings, "CACHE_DIR", str(tmp_path / "voice_cache"))
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.query(QueuedTask).delete()
+    session.commit()
+    session.close()
+
+
+def _upload(name: str, age_hours: float) -> Path:
+    upload_dir = Path(settings.OUTPUT_DIR) / "uploads"
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    path = upload_dir / name
+    path.write_bytes(b"RIFF" + bytes(64))
+    mtime = time.time() - age_hours * 3600
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _task(db, ref_audio_path: Path, status: TaskStatus) -> None:
+    db.add(QueuedTask(
+        task_type="tts.voice_clone",
+        payload={"ref_audio_path": str(ref_audio_path), "use_voice_design": False},
+        status=status.value,
+    ))
+    db.commit()
+
+
+async def test_orphaned_uploads_are_removed_after_max_age(db):
+    queued = _upload("queued.wav", age_hours=48)
+    running = _upload("running.wav", age_hours=48)
+    failed = _upload("failed.wav", age_hours=48)
+    abandoned = _upload("abandoned.wav", age_hours=48)
+    recent = _upload("recent.wav", age_hours=0.1)
+    _task(db, queued, TaskStatus.QUEUED)
+    _task(db, running, TaskStatus.LEASED)
+    _task(db, failed, TaskStatus.FAILED)
+
+    result = await cleanup_orphaned_files(settings.DATABASE_URL)
+
+    assert result["deleted_orphans"] == 2
+    assert queued.exists() and running.exists()
+    assert not failed.exists() and not abandoned.exists()
+    # May belong to a request whose task is not enqueued yet
+    assert recent.exists()
+
+
+async def test_upload_age_threshold_is_configurable(db, monkeypatch):
+    monkeypatch.setattr(settings, "ORPHAN_UPLOAD_MAX_AGE_HOURS", 0.05)
+    upload = _upload("abandoned.wav", age_hours=0.1)
+
+    await cleanup_orphaned_files(settings.DATABASE_URL)
+
+    assert not upload.exists()
@@ -0,0 +1,197 @@
+import asyncio
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+import pytest
+
+from core import event_bus, progress_store
+from core.event_bus import MemoryEventBus, SQLiteEventBus
+
+
+@asynccontextmanager
+async def _buses(path, count: int = 2, retention_seconds: float = 60.0):
+    buses = [SQLiteEventBus(str(path), poll_interval=0.01, retention_seconds=retention_seconds) for _ in range(count)]
+    for bus in buses:
+        await bus.start()
+    try:
+        yield buses
+    finally:
+        for bus in buses:
+            await bus.stop()
+            bus._executor.shutdown(wait=True)
+
+
+def _record(bus, topic: str) -> list:
+    received = []
+    bus.subscribe(topic, received.append)
+    return received
+
+
+async def _until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+def _rows(path) -> list:
+    with sqlite3.connect(str(path)) as conn:
+        return conn.execute("SELECT topic, origin, payload FROM bus_messages ORDER BY id").fetchall()
+
+
+async def test_messages_reach_the_other_process_once(tmp_path):
+    async with _buses(tmp_path / "bus.db") as (first, second):
+        first_received = _record(first, "jobs")
+        second_received = _record(second, "jobs")
+
+        first.publish("jobs", {"n": 1})
+        second.publish("jobs", {"n": 2})
+        await _until(lambda: len(first_received) == 2 and len(second_received) == 2)
+        await asyncio.sleep(0.1)
+
+        # Own messages are dispatched locally on publish and skipped when read back
+        assert first_received == [{"n": 1}, {"n": 2}]
+        assert second_received == [{"n": 2}, {"n": 1}]
+        assert first.received == second.received == 1
+        assert {origin for _, origin, _ in _rows(tmp_path / "bus.db")} == {first.origin, second.origin}
+
+
+async def test_late_joiner_skips_the_backlog(tmp_path):
+    async with _buses(tmp_path / "bus.db", count=1) as (first,):
+        first.publish("jobs", {"n": 1})
+        await _until(lambda: first.flushes == 1)
+
+        async with _buses(tmp_path / "bus.db", count=1) as (late,):
+            received = _record(late, "jobs")
+            first.publish("jobs", {"n": 2})
+            await _until(lambda: received)
+            assert received == [{"n": 2}]
+
+
+async def test_old_messages_are_pruned(tmp_path):
+    path = tmp_path / "bus.db"
+    async with _buses(path, retention_seconds=0.2) as (first, second):
+        received = _record(second, "jobs")
+        first.publish("jobs", {"n": 1})
+        await _until(lambda: received)
+        assert len(_rows(path)) == 1
+
+        await asyncio.sleep(0.3)
+        first.publish("jobs", {"n": 2})
+        await _until(lambda: len(received) == 2)
+        await _until(lambda: len(_rows(path)) == 1)
+        assert _rows(path)[0][2] == '{"n": 2}'
+
+
+async def test_consecutive_tokens_travel_as_one_row(tmp_path):
+    path = tmp_path / "bus.db"
+    async with _buses(path) as (first, second):
+        received = _record(second, "progress")
+        # Published within one loop iteration, so they share a flush
+        first.publish("progress", {"op": "line", "key": "a", "text": "Chapter 1"})
+        for token in ("Once", " upon", " a", " time"):
+            first.publish("progress", {"op": "token", "key": "a", "text": token})
+        first.publish("progress", {"op": "token", "key": "b", "text": "other"})
+        first.publish("progress", {"op": "token", "key": "a", "text": "."})
+        first.publish("progress", {"op": "done", "key": "a"})
+        await _until(lambda: len(received) == 5)
+
+        assert received == [
+            {"op": "line", "key": "a", "text": "Chapter 1"},
+            {"op": "token", "key": "a", "text": "Once upon a time"},
+            {"op": "token", "key": "b", "text": "other"},
+            {"op": "token", "key": "a", "text": "."},
+            {"op": "done", "key": "a"},
+        ]
+        assert len(_rows(path)) == 5
+        assert first.flushes == 1
+
+
+async def test_stop_flushes_pending_messages(tmp_path):
+    path = tmp_path / "bus.db"
+    async with _buses(path, count=1) as (first,):
+        await _until(lambda: first._task is not None)
+        first.publish("jobs", {"n": 1})
+        await first.stop()
+        assert [payload for _, _, payload in _rows(path)] == ['{"n": 1}']
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    bus = MemoryEventBus()
+    # progress_store subscribed to the bus that existed when it was imported
+    bus.subscribe("progress", progress_store._apply)
+    monkeypatch.setattr(event_bus, "_bus", bus)
+    monkeypatch.setattr(progress_store, "_store", OrderedDict())
+    return bus
+
+
+async def test_waiter_wakes_once_for_a_burst_of_tokens(bus):
+    progress_store.append_line("run", "Chapter 1")
+    seq = progress_store.read("run")["seq"]
+
+    waiter = asyncio.create_task(progress_store.wait("run", since=seq, timeout=5))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    for token in ("Once", " upon", " a", " time"):
+        progress_store.append_token("run", token)
+    result = await asyncio.wait_for(waiter, 1)
+
+    # Only the extended line is returned, joined
+    assert result["lines"] == [(0, "Chapter 1Once upon a time")]
+    assert result["seq"] == seq + 4
+    assert not result["done"]
+
+
+async def test_wait_returns_at_once_with_changes_or_when_done(bus):
+    progress_store.append_line("run", "first")
+    progress_store.append_line("run", "second")
+
+    assert (await progress_store.wait("run", since=1, timeout=5))["lines"] == [(1, "second")]
+    progress_store.mark_done("run")
+    result = await asyncio.wait_for(progress_store.wait("run", since=99, timeout=5), 1)
+    assert result["done"] and result["lines"] == []
+
+    # A log nobody wrote is reported as finished
+    assert (await progress_store.wait("missing", timeout=5))["done"]
+
+
+async def test_wait_times_out_without_changes(bus):
+    progress_store.append_line("run", "first")
+    seq = progress_store.read("run")["seq"]
+
+    start = time.monotonic()
+    result = await progress_store.wait("run", since=seq, timeout=0.1)
+
+    assert time.monotonic() - start >= 0.1
+    assert result == {"seq": seq, "lines": [], "done": False}
+
+
+async def test_reset_ends_the_previous_run_for_its_waiters(bus):
+    progress_store.append_line("run", "old")
+    seq = progress_store.read("run")["seq"]
+    waiter = asyncio.create_task(progress_store.wait("run", since=seq, timeout=5))
+    await asyncio.sleep(0.01)
+
+    progress_store.reset("run")
+    result = await asyncio.wait_for(waiter, 1)
+
+    assert result["done"]
+    # Sequence numbers keep increasing across runs of the same key
+    progress_store.append_line("run", "new")
+    assert progress_store.read("run", since=seq) == {"seq": seq + 1, "lines": [(0, "new")], "done": False}
+
+
+def test_finished_logs_are_evicted_beyond_the_limit(bus):
+    for index in range(progress_store.MAX_FINISHED_LOGS + 5):
+        progress_store.append_line(f"run-{index}", "line")
+        progress_store.mark_done(f"run-{index}")
+    progress_store.append_line("running", "line")
+
+    assert len(progress_store._store) == progress_store.MAX_FINISHED_LOGS + 1
+    assert "run-0" not in progress_store._store
+    assert "running" in progress_store._store
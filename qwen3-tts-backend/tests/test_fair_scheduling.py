@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.batch_processor import TTSBatchProcessor
+from core.config import settings
+from core.inference_worker import FakeTTSModel
+from core.job_scheduler import JobScheduler
+from core.model_manager import ModelManager
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(ModelManager, "_instance", None)
+    return JobScheduler(max_wait_seconds=600, max_concurrent_jobs=2)
+
+
+async def test_scheduler_interleaves_users_within_a_variant(scheduler):
+    dispatched = []
+
+    async def run(label):
+        dispatched.append(label)
+
+    # User 1 queues a backlog before user 2 shows up
+    for index in range(6):
+        await scheduler.submit("custom-voice", index, run, f"u1-{index}", user_id=1, cost=10)
+    for index in range(2):
+        await scheduler.submit("custom-voice", 10 + index, run, f"u2-{index}", user_id=2, cost=10)
+
+    scheduler._start_worker()
+    try:
+        for _ in range(100):
+            if len(dispatched) == 8:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        scheduler._worker_task.cancel()
+
+    assert dispatched[:4] == ["u1-0", "u2-0", "u1-1", "u2-1"]
+    assert dispatched[4:] == ["u1-2", "u1-3", "u1-4", "u1-5"]
+
+
+async def test_scheduler_charges_by_cost(scheduler):
+    async def run():
+        pass
+
+    await scheduler.submit("base", 1, run, user_id=1, cost=100)
+    await scheduler.submit("base", 2, run, user_id=1, cost=100)
+    await scheduler.submit("base", 3, run, user_id=2, cost=10)
+    await scheduler.submit("base", 4, run, user_id=2, cost=10)
+
+    order = [scheduler._select_job(set()).job_id for _ in range(4)]
+
+    # User 2's short jobs finish their virtual time before user 1's long one
+    assert order == [3, 4, 1, 2]
+
+
+async def test_scheduler_still_bounds_wait_across_variants(scheduler):
+    async def run():
+        pass
+
+    scheduler.active_model = "custom-voice"
+    await scheduler.submit("voice-design", 1, run, user_id=1)
+    scheduler.queues["voice-design"][0].enqueued_at -= 1000
+    await scheduler.submit("custom-voice", 2, run, user_id=2)
+
+    assert scheduler._select_job({"custom-voice"}).job_id == 1
+    assert scheduler.forced_swaps == 1
+
+
+async def test_max_wait_forces_a_swap_away_from_a_busy_variant(monkeypatch):
+    monkeypatch.setattr(ModelManager, "_instance", None)
+    scheduler = JobScheduler(max_wait_seconds=0.05, max_concurrent_jobs=1)
+    dispatched = []
+    remaining = [20]
+
+    async def run(label):
+        dispatched.append(label)
+        await asyncio.sleep(0.01)
+        # A steady stream for the loaded variant, which is drained first
+        if label.startswith("cv") and remaining[0]:
+            remaining[0] -= 1
+            await scheduler.submit("custom-voice", 100 + remaining[0], run, f"cv-{remaining[0]}", user_id=1)
+
+    await scheduler.submit("custom-voice", 1, run, "cv-first", user_id=1)
+    scheduler._start_worker()
+    try:
+        for _ in range(100):
+            if dispatched:
+                break
+            await asyncio.sleep(0.005)
+        await scheduler.submit("voice-design", 2, run, "vd", user_id=2)
+        for _ in range(500):
+            if not scheduler.get_queue_length() and not remaining[0] and not scheduler.running_jobs:
+                break
+            await asyncio.sleep(0.01)
+        stats = await scheduler.get_stats()
+    finally:
+        scheduler._worker_task.cancel()
+
+    # The voice-design job was served once it had waited max_wait, while custom-voice jobs were still queued
+    position = dispatched.index("vd")
+    assert 1 <= position < len(dispatched) - 5
+    assert stats["forced_swaps"] == 1
+    assert stats["total_swaps"] == stats["swaps_last_hour"] == 2
+    assert stats["max_observed_wait_seconds"] >= 0.05
+    assert stats["dispatched"] == 22
+
+
+async def test_swaps_last_hour_forgets_old_swaps(scheduler):
+    now = time.time()
+    scheduler._record_swap(now - 4000)
+    scheduler._record_swap(now - 1800)
+    scheduler._record_swap(now)
+
+    stats = await scheduler.get_stats()
+
+    assert stats["total_swaps"] == 3
+    assert stats["swaps_last_hour"] == 2
+
+
+@pytest.fixture
+def batch_processor(monkeypatch):
+    monkeypatch.setattr(settings, "USAGE_FLUSH_SECONDS", 0.05)
+    fake_model = FakeTTSModel()
+    processor = TTSBatchProcessor(batch_size=4, batch_wait_time=0.01)
+
+    async def load(variant):
+        return fake_model
+
+    processor.model_loader = load
+    return processor
+
+
+def _request(text: str) -> dict:
+    params = {name: None for name in TTSBatchProcessor.SAMPLING_PARAMS}
+    params.update(text=text, language="English", speaker="Vivian", instruct="")
+    return {"mode": "custom_voice", "params": params}
+
+
+async def test_usage_is_written_off_the_event_loop(batch_processor, monkeypatch):
+    import db.crud
+
+    writes = []
+
+    def record_user_usage(db, usage):
+        writes.append((threading.current_thread(), usage))
+
+    monkeypatch.setattr(db.crud, "record_user_usage", record_user_usage)
+
+    batch_processor._start_processor()
+    try:
+        await asyncio.gather(
+            batch_processor.submit("a", _request("hello"), user_id=1),
+            batch_processor.submit("b", _request("hello world"), user_id=2),
+            batch_processor.submit("c", _request("again"), user_id=1),
+        )
+        # Nothing is written while batches run
+        assert writes == []
+
+        for _ in range(100):
+            if writes:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        batch_processor._processor_task.cancel()
+
+    assert len(writes) == 1
+    thread, usage = writes[0]
+    assert thread is not threading.main_thread()
+    assert usage[1]["requests"] == 2
+    assert usage[1]["characters"] == len("hello") + len("again")
+    assert usage[2]["requests"] == 1
+    assert await batch_processor.flush_usage() == 0
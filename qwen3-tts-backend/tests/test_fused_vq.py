@@ -0,0 +1,162 @@
+import time
+
+import pytest
+import torch
+
+from qwen_tts.core.tokenizer_12hz.modeling_qwen3_tts_tokenizer_v2 import (
+    ResidualVectorQuantizer,
+    SplitResidualVectorQuantizer,
+)
+from qwen_tts.core.tokenizer_25hz.vq.core_vq import DistributedResidualVectorQuantization
+
+NUM_QUANTIZERS = 16
+BINS = 2048
+CODEBOOK_DIM = 512
+
+
+def _randomize(module: torch.nn.Module) -> torch.nn.Module:
+    with torch.no_grad():
+        for param in module.parameters():
+            param.copy_(torch.rand_like(param) + 0.5 if param.dim() == 1 else torch.randn_like(param))
+    return module
+
+
+def _split_quantizer(**kwargs) -> SplitResidualVectorQuantizer:
+    torch.manual_seed(0)
+    quantizer = SplitResidualVectorQuantizer(
+        dimension=CODEBOOK_DIM // 2,
+        n_q=NUM_QUANTIZERS,
+        n_q_semantic=1,
+        bins=BINS,
+        input_dimension=CODEBOOK_DIM,
+        output_dimension=CODEBOOK_DIM,
+        **kwargs,
+    )
+    return _randomize(quantizer).eval()
+
+
+def _loop_decode(quantizer: torch.nn.Module, codes: torch.Tensor) -> torch.Tensor:
+    quantizer.train()
+    try:
+        with torch.no_grad():
+            return quantizer.decode(codes)
+    finally:
+        quantizer.eval()
+
+
+def _relative_error(actual: torch.Tensor, expected: torch.Tensor) -> float:
+    return ((actual - expected).norm() / expected.norm()).item()
+
+
+@pytest.mark.parametrize("shape", [(1, NUM_QUANTIZERS, 1), (2, NUM_QUANTIZERS, 75), (4, NUM_QUANTIZERS, 300)])
+def test_split_quantizer_fused_decode_matches_loop(shape):
+    quantizer = _split_quantizer()
+    codes = torch.randint(0, BINS, shape)
+
+    with torch.no_grad():
+        fused = quantizer.decode(codes)
+    expected = _loop_decode(quantizer, codes)
+
+    assert fused.shape == expected.shape == (shape[0], CODEBOOK_DIM, shape[2])
+    assert _relative_error(fused, expected) < 1e-5
+
+
+def test_split_quantizer_fused_decode_with_fewer_codebooks():
+    quantizer = _split_quantizer()
+    codes = torch.randint(0, BINS, (2, 4, 50))
+
+    with torch.no_grad():
+        fused = quantizer.decode(codes)
+
+    assert _relative_error(fused, _loop_decode(quantizer, codes)) < 1e-5
+
+
+def test_split_quantizer_fused_decode_with_different_bins():
+    quantizer = _split_quantizer()
+    quantizer.rvq_rest = _randomize(ResidualVectorQuantizer(
+        dimension=CODEBOOK_DIM // 2,
+        n_q=NUM_QUANTIZERS - 1,
+        bins=BINS // 2,
+        input_dimension=CODEBOOK_DIM,
+        output_dimension=CODEBOOK_DIM,
+        force_projection=True,
+    )).eval()
+    codes = torch.randint(0, BINS // 2, (2, NUM_QUANTIZERS, 50))
+    codes[:, 0] = torch.randint(BINS // 2, BINS, (2, 50))
+
+    with torch.no_grad():
+        fused = quantizer.decode(codes)
+
+    assert _relative_error(fused, _loop_decode(quantizer, codes)) < 1e-5
+
+
+def test_split_quantizer_fused_table_follows_weights():
+    quantizer = _split_quantizer()
+    codes = torch.randint(0, BINS, (1, NUM_QUANTIZERS, 20))
+    with torch.no_grad():
+        quantizer.decode(codes)
+        quantizer.rvq_rest.vq.layers[3]._codebook.embedding_sum.mul_(2)
+        fused = quantizer.decode(codes)
+    assert _relative_error(fused, _loop_decode(quantizer, codes)) < 1e-5
+
+    quantizer.to(torch.float64)
+    assert quantizer._fused_codebook.dtype == torch.float64
+    with torch.no_grad():
+        fused = quantizer.decode(codes)
+    assert fused.dtype == torch.float64
+    assert not any(name.startswith("_fused") for name in quantizer.state_dict())
+
+
+def _distributed_quantizer() -> DistributedResidualVectorQuantization:
+    torch.manual_seed(0)
+    quantizer = DistributedResidualVectorQuantization(
+        num_quantizers=NUM_QUANTIZERS,
+        dim=CODEBOOK_DIM,
+        codebook_dim=CODEBOOK_DIM // 4,
+        codebook_size=BINS,
+        kmeans_init=False,
+    )
+    quantizer.embed.normal_()
+    return _randomize(quantizer).eval()
+
+
+@pytest.mark.parametrize("shape", [(NUM_QUANTIZERS, 1, 1), (NUM_QUANTIZERS, 4, 300)])
+def test_distributed_quantizer_fused_decode_matches_loop(shape):
+    quantizer = _distributed_quantizer()
+    codes = torch.randint(0, BINS, shape)
+
+    with torch.no_grad():
+        fused = quantizer.decode(codes)
+    expected = _loop_decode(quantizer, codes)
+
+    assert fused.shape == expected.shape == (shape[1], shape[2], CODEBOOK_DIM)
+    assert _relative_error(fused, expected) < 1e-5
+
+
+def _best_of(func, repeats: int = 5) -> float:
+    func()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_fused_decode_benchmark():
+    quantizer = _split_quantizer()
+    codes = torch.randint(0, BINS, (4, NUM_QUANTIZERS, 300))
+    with torch.no_grad():
+        quantizer.decode(codes)
+
+    def fused():
+        with torch.no_grad():
+            quantizer.fused_decode(codes)
+
+    def loop():
+        _loop_decode(quantizer, codes)
+
+    fused_seconds = _best_of(fused)
+    loop_seconds = _best_of(loop)
+    print(f"(4, {NUM_QUANTIZERS}, 300) decode: fused {fused_seconds * 1000:.2f}ms, loop {loop_seconds * 1000:.2f}ms")
+    assert fused_seconds < loop_seconds
@@ -0,0 +1,116 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+from core.batch_processor import TTSBatchProcessor
+from core.inference_ipc import SHM_THRESHOLD_BYTES, InferenceWorkerPool
+from core.inference_worker import FakeTTSModel
+from core.tts_service import RemoteTTSBackend
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SHM_DIR = Path("/dev/shm")
+
+
+@pytest.fixture(scope="module")
+def socket_path():
+    # Unix socket paths are limited to ~100 characters, so stay out of pytest's long tmp paths
+    directory = Path(tempfile.mkdtemp(prefix="qwen-worker-"))
+    path = directory / "worker.sock"
+    # The conftest puts the repository root on sys.path for qwen_tts; the worker process needs it as well
+    pythonpath = os.pathsep.join(filter(None, [str(BACKEND_DIR.parent), os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "PYTHONPATH": pythonpath, "AUDIO_CACHE_MAX_MB": "0", "EVENT_BUS": "memory"}
+    worker = subprocess.Popen(
+        [sys.executable, "-m", "core.inference_worker", "--socket", str(path), "--fake", "--fake-frame-delay", "0.005"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while not path.exists():
+            if worker.poll() is not None or time.monotonic() > deadline:
+                pytest.fail(f"inference worker did not start (exit code {worker.poll()})")
+            time.sleep(0.1)
+        yield str(path)
+    finally:
+        worker.terminate()
+        worker.wait(timeout=10)
+
+
+def _params(text: str) -> dict:
+    params = {name: None for name in TTSBatchProcessor.SAMPLING_PARAMS}
+    params.update(text=text, language="English", speaker="Vivian", instruct="", user_id=7)
+    return params
+
+
+def _frames(audio: bytes) -> int:
+    with wave.open(io.BytesIO(audio)) as wav:
+        return wav.getnframes()
+
+
+def _wav() -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(FakeTTSModel.sample_rate)
+        wav.writeframes(b"\x00\x10" * FakeTTSModel.sample_rate)
+    return buffer.getvalue()
+
+
+def _segments() -> set:
+    return {path.name for path in SHM_DIR.iterdir()} if SHM_DIR.exists() else set()
+
+
+async def test_generate_round_trips_inline_and_through_shared_memory(socket_path):
+    backend = RemoteTTSBackend([socket_path])
+    segments = _segments()
+    try:
+        for text in ("Short.", "A much longer sentence that renders well past the inline threshold. " * 2):
+            audio, sample_rate = await backend.generate_custom_voice(_params(text))
+            assert sample_rate == FakeTTSModel.sample_rate
+            assert _frames(audio) == len(FakeTTSModel()._render_one(text))
+    finally:
+        await backend.pool.close()
+
+    # The long result went through shared memory, and the client unlinked the segment after reading it
+    assert len(audio) > SHM_THRESHOLD_BYTES
+    assert _segments() <= segments
+
+
+async def test_stream_and_prompt_round_trip(socket_path):
+    backend = RemoteTTSBackend([socket_path])
+    try:
+        text = "Streamed over the socket."
+        chunks = [chunk async for chunk, _ in backend.stream("custom_voice", _params(text))]
+        assert len(chunks) > 1
+        assert sum(len(chunk) for chunk in chunks) == 2 * len(FakeTTSModel()._render_one(text))
+
+        prompt = await backend.create_voice_clone_prompt(_wav(), ref_text="hello", x_vector_only_mode=True)
+        assert prompt == [{"ref_text": "hello", "x_vector_only_mode": True}]
+    finally:
+        await backend.pool.close()
+
+
+async def test_worker_errors_reach_the_caller(socket_path):
+    pool = InferenceWorkerPool([socket_path])
+    backend = RemoteTTSBackend([socket_path])
+    try:
+        with pytest.raises(RuntimeError, match="Unknown inference operation: transcribe"):
+            await pool.call("transcribe")
+        with pytest.raises(RuntimeError, match="voice_clone_prompt is required"):
+            async for _ in backend.stream("voice_clone", _params("Never spoken.")):
+                pass
+
+        # The connection survives failed requests
+        health = (await pool.call("health"))["health"]
+        assert health["fake"] is True
+        assert health["requests_served"] >= 1
+    finally:
+        await pool.close()
+        await backend.pool.close()
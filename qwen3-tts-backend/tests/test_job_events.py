@@ -0,0 +1,171 @@
+import asyncio
+import json
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from api import jobs as jobs_api
+from core import event_bus
+from core.config import settings
+from core.event_bus import MemoryEventBus
+from core.job_events import JobEventBroker, publish_job_deleted, publish_job_update, serialize_job
+from db.database import Base, SessionLocal, engine
+from db.models import Job, JobStatus, QueuedTask
+
+USER_ID = 1
+
+
+class _User:
+    id = USER_ID
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.query(Job).delete()
+    session.query(QueuedTask).delete()
+    session.commit()
+    session.close()
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    monkeypatch.setattr(event_bus, "_bus", MemoryEventBus())
+    monkeypatch.setattr(JobEventBroker, "_instance", None)
+    broker = JobEventBroker()
+    JobEventBroker._instance = broker
+    return broker
+
+
+@contextmanager
+def _count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _job(db, status: str = JobStatus.PENDING, output_path: str = None) -> Job:
+    job = Job(user_id=USER_ID, job_type="custom-voice", status=status, backend_type="local", output_path=output_path)
+    db.add(job)
+    db.commit()
+    return job
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+def test_download_url_does_not_check_the_file(db, monkeypatch):
+    job = _job(db, JobStatus.COMPLETED, output_path="/nowhere/result.wav")
+    monkeypatch.setattr(Path, "exists", lambda self: pytest.fail("serialize_job touched the filesystem"))
+
+    assert serialize_job(job)["download_url"] == f"/jobs/{job.id}/download"
+    assert serialize_job(_job(db, JobStatus.FAILED))["download_url"] is None
+
+
+def test_download_of_a_missing_file_is_not_found(db):
+    job = _job(db, JobStatus.COMPLETED, output_path=str(Path(settings.OUTPUT_DIR) / "gone.wav"))
+    app = FastAPI()
+    app.include_router(jobs_api.router)
+    app.dependency_overrides[jobs_api.get_user_from_bearer_token] = lambda: _User()
+
+    response = TestClient(app).get(f"/jobs/{job.id}/download")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Output file does not exist"
+
+
+@pytest.mark.parametrize("status", [JobStatus.PENDING, JobStatus.COMPLETED])
+async def test_updates_fan_out_without_queries_per_client(db, broker, status):
+    job = _job(db, status, output_path="/nowhere/result.wav")
+    db.refresh(job)
+    updates = 20
+
+    async def publish_updates(clients: int) -> int:
+        queues = [broker.subscribe(USER_ID) for _ in range(clients)]
+        with _count_queries() as statements:
+            for _ in range(updates):
+                await publish_job_update(db, job)
+        for queue in queues:
+            events = _drain(queue)
+            assert len(events) == updates
+            assert events[-1]["job"]["id"] == job.id
+            broker.unsubscribe(USER_ID, queue)
+        return len(statements)
+
+    one_client = await publish_updates(1)
+    many_clients = await publish_updates(50)
+
+    # Delivery is in memory: the queries are those of the update itself, one queue read for an active job's ETA
+    assert many_clients == one_client
+    assert one_client == (updates if status == JobStatus.PENDING else 0)
+    assert broker.get_stats()["subscribers"] == 0
+
+
+async def test_slow_subscriber_gets_a_resync(db, broker):
+    broker.queue_size = 3
+    slow = broker.subscribe(USER_ID)
+    other_user = broker.subscribe(USER_ID + 1)
+    job = _job(db, JobStatus.COMPLETED)
+
+    for _ in range(5):
+        await publish_job_update(db, job)
+    await publish_job_deleted(USER_ID, job.id)
+
+    events = _drain(slow)
+    # The backlog was replaced when the queue filled up; later events queue behind the resync
+    assert events[0] == {"type": "resync"}
+    assert events[-1] == {"type": "job.deleted", "job_id": job.id}
+    assert len(events) <= broker.queue_size
+    assert broker.resyncs >= 1
+    assert other_user.empty()
+
+
+def test_resync_reloads_the_listing_with_a_fixed_number_of_queries(db):
+    for _ in range(30):
+        _job(db)
+    for _ in range(30):
+        _job(db, JobStatus.COMPLETED, output_path="/nowhere/result.wav")
+    app = FastAPI()
+    app.include_router(jobs_api.router)
+    app.dependency_overrides[jobs_api.get_current_user] = lambda: _User()
+
+    with _count_queries() as statements:
+        response = TestClient(app).get("/jobs", params={"limit": 100})
+
+    assert response.status_code == 200
+    assert len(response.json()["jobs"]) == 60
+    # Count, page and one queue read, however many jobs are listed
+    assert len(statements) == 3
+
+
+async def test_event_stream_relays_published_events(broker, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_EVENTS_KEEPALIVE_SECONDS", 0.05)
+    response = await jobs_api.stream_job_events(current_user=_User())
+    body = response.body_iterator
+
+    assert json.loads((await body.__anext__())[len("data: "):]) == {"type": "ready"}
+    assert broker.has_subscribers(USER_ID)
+    assert await body.__anext__() == ": keepalive\n\n"
+
+    await publish_job_deleted(USER_ID, 42)
+    assert json.loads((await body.__anext__())[len("data: "):]) == {"type": "job.deleted", "job_id": 42}
+
+    await body.aclose()
+    assert not broker.has_subscribers(USER_ID)
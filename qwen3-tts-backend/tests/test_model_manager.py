@@ -0,0 +1,198 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+import torch
+from safetensors.torch import load_file
+
+from core import model_manager as model_manager_module
+from core.config import settings
+from core.model_manager import ModelManager
+from qwen_tts import Qwen3TTSModel
+
+from test_speculative_decoding import _tiny_model
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    seeds = {}
+    for seed, dirname in enumerate(ModelManager.MODEL_PATHS.values()):
+        _tiny_model(hidden_size=64, num_layers=2, seed=seed).to(torch.bfloat16).save_pretrained(tmp_path / dirname)
+        seeds[str(tmp_path / dirname)] = seed
+
+    def from_pretrained(path, device_map=None, torch_dtype=None, **kwargs):
+        # The real loader also needs a speech tokenizer and processor files; the talker weights are what the
+        # tiers move around, so build the model and read those from disk
+        model = _tiny_model(hidden_size=64, num_layers=2, seed=seeds[path]).to(torch_dtype)
+        model.load_state_dict(load_file(Path(path) / "model.safetensors"), strict=False)
+        return Qwen3TTSModel(model=model.to(device_map).eval(), processor=None)
+
+    monkeypatch.setattr(settings, "MODEL_BASE_PATH", str(tmp_path))
+    monkeypatch.setattr(model_manager_module.Qwen3TTSModel, "from_pretrained", from_pretrained)
+    monkeypatch.setattr(ModelManager, "_instance", None)
+    manager = ModelManager()
+
+    # Room for one variant on the "device"; a CPU-only host parks the others in its RAM tier
+    footprint = manager._estimate_footprint("base", manager._resolve_model_path("base"))
+    manager.memory_budget_bytes = int(footprint * 1.5)
+    yield manager
+    manager._executor.shutdown(wait=True)
+
+
+def _snapshot(tts: Qwen3TTSModel) -> dict:
+    return {name: tensor.clone() for name, tensor in tts.model.state_dict().items()}
+
+
+async def test_evicted_model_is_parked_and_promoted_faster_than_loaded(manager):
+    custom_voice = await manager.load_model("custom-voice")
+    weights = _snapshot(custom_voice)
+
+    await manager.load_model("voice-design")
+    assert list(manager.models) == ["voice-design"]
+    assert list(manager.parked) == ["custom-voice"]
+    assert manager.get_model_stats()["custom-voice"]["tier"] == "host"
+
+    promoted = await manager.load_model("custom-voice")
+    assert promoted is custom_voice
+    assert list(manager.parked) == ["voice-design"]
+
+    stats = manager.get_model_stats()["custom-voice"]
+    assert stats["loads"] == 1
+    assert stats["promotions"] == 1
+    assert stats["demotions"] == 1
+    assert stats["last_promote_seconds"] < stats["last_load_seconds"]
+    for name, tensor in promoted.model.state_dict().items():
+        assert torch.equal(tensor, weights[name]), name
+
+
+def test_cpu_host_has_a_ram_tier(manager):
+    assert manager.device.type == "cpu"
+    assert manager.host_budget_bytes > 0
+
+
+async def test_parked_model_is_dropped_past_host_budget(manager):
+    manager.host_budget_bytes = manager.memory_budget_bytes
+
+    await manager.load_model("custom-voice")
+    await manager.load_model("voice-design")
+    await manager.load_model("base")
+
+    assert list(manager.models) == ["base"]
+    assert list(manager.parked) == ["voice-design"]
+    assert manager.get_model_stats()["custom-voice"]["tier"] == "disk"
+
+
+async def test_dropped_model_is_read_back_from_its_checkpoint(manager, monkeypatch):
+    manager.host_budget_bytes = manager.memory_budget_bytes
+    custom_voice = await manager.load_model("custom-voice")
+    weights = _snapshot(custom_voice)
+    await manager.load_model("voice-design")
+    await manager.load_model("base")
+    assert all(tensor.is_meta for tensor in custom_voice.model.state_dict().values())
+
+    # The cold tier reads the mmap'd safetensors into the kept model, not through from_pretrained
+    monkeypatch.setattr(model_manager_module.Qwen3TTSModel, "from_pretrained", lambda *args, **kwargs: pytest.fail())
+    start = time.perf_counter()
+    reloaded = await manager.load_model("custom-voice")
+    cold_seconds = time.perf_counter() - start
+
+    assert reloaded is custom_voice
+    stats = manager.get_model_stats()["custom-voice"]
+    assert stats["loads"] == 2 and stats["cold_loads"] == 1
+    for name, tensor in reloaded.model.state_dict().items():
+        assert torch.equal(tensor, weights[name]), name
+
+    # base went to the RAM tier to make room, and voice-design was dropped to disk for it
+    assert list(manager.parked) == ["base"]
+    start = time.perf_counter()
+    await manager.load_model("base")
+    promote_seconds = time.perf_counter() - start
+    assert manager.get_model_stats()["base"]["promotions"] == 1
+    assert promote_seconds < cold_seconds
+
+
+async def test_model_in_use_is_not_evicted(manager):
+    async with manager.use_model("custom-voice") as custom_voice:
+        parameters = {name: param for name, param in custom_voice.model.named_parameters()}
+        load = asyncio.create_task(manager.load_model("voice-design"))
+        await asyncio.sleep(0.2)
+
+        # The new variant waits for the device instead of moving weights that are being generated with
+        assert not load.done()
+        assert list(manager.models) == ["custom-voice"]
+        assert manager.get_model_stats()["custom-voice"]["in_use"] == 1
+        for name, param in custom_voice.model.named_parameters():
+            assert param is parameters[name], name
+
+    await asyncio.wait_for(load, timeout=10)
+    assert list(manager.models) == ["voice-design"]
+    assert list(manager.parked) == ["custom-voice"]
+    assert manager.get_model_stats()["custom-voice"]["in_use"] == 0
+
+
+async def test_model_is_pinned_before_it_finishes_loading(manager):
+    await manager.load_model("custom-voice")
+
+    async def use_base():
+        async with manager.use_model("base") as tts:
+            await asyncio.sleep(0.2)
+            return tts
+
+    # voice-design's load must not evict base between base's load and its use
+    use = asyncio.create_task(use_base())
+    await asyncio.sleep(0)
+    load = asyncio.create_task(manager.load_model("voice-design"))
+
+    base = await asyncio.wait_for(use, timeout=10)
+    assert base.device == manager.device
+    await asyncio.wait_for(load, timeout=10)
+    assert "voice-design" in manager.models
+
+
+async def test_pin_is_released_when_use_fails(manager):
+    with pytest.raises(RuntimeError):
+        async with manager.use_model("custom-voice"):
+            raise RuntimeError("generation failed")
+
+    assert manager.get_model_stats()["custom-voice"]["in_use"] == 0
+    await manager.load_model("voice-design")
+    assert list(manager.parked) == ["custom-voice"]
+
+
+async def test_nested_use_of_a_second_variant_goes_over_budget(manager):
+    async with manager.use_model("custom-voice") as custom_voice:
+        # Waiting for custom-voice's pin here would wait for this very block to end
+        async with manager.use_model("voice-design") as voice_design:
+            assert list(manager.models) == ["custom-voice", "voice-design"]
+            assert manager._resident_bytes() > manager.memory_budget_bytes
+            assert await asyncio.wait_for(manager.load_model("custom-voice"), timeout=1) is custom_voice
+        assert voice_design.device == manager.device
+
+    # Back within the budget with the next load once the pins are gone
+    await manager.load_model("base")
+    assert list(manager.models) == ["base"]
+
+
+async def test_waiting_for_a_pinned_model_does_not_hold_the_load_lock(manager, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_PIN_WAIT_SECONDS", 0.5)
+    release = asyncio.Event()
+
+    async def hold_custom_voice():
+        async with manager.use_model("custom-voice"):
+            await release.wait()
+
+    holder = asyncio.create_task(hold_custom_voice())
+    await asyncio.sleep(0.05)
+    load = asyncio.create_task(manager.load_model("voice-design"))
+    await asyncio.sleep(0.1)
+
+    assert not load.done()
+    assert not manager._load_lock.locked()
+    await asyncio.wait_for(manager.unload_model("base"), timeout=1)
+
+    # Still pinned after the wait: the load goes over the budget instead of waiting forever
+    await asyncio.wait_for(load, timeout=2)
+    assert list(manager.models) == ["custom-voice", "voice-design"]
+    release.set()
+    await holder
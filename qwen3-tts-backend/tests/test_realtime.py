@@ -0,0 +1,196 @@
+import asyncio
+import base64
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from api import realtime
+from core.audio_cache import AudioCache
+from core.batch_processor import TTSBatchProcessor
+from core.inference_worker import FakeTTSModel
+from core.realtime_tts import RealtimeSession
+from core.security import create_access_token
+from core.tts_service import LocalTTSBackend, TTSServiceFactory
+from db.database import Base, SessionLocal, engine
+from db.models import User
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    # Caching off, so repeated sentences are synthesized again
+    monkeypatch.setattr(AudioCache, "_instance", AudioCache(str(tmp_path / "audio_cache"), 0))
+    fake_model = FakeTTSModel(frame_delay=0.001)
+    processor = TTSBatchProcessor(batch_size=4, batch_wait_time=0.01)
+
+    async def load(variant):
+        return fake_model
+
+    processor.model_loader = load
+    backend = LocalTTSBackend()
+    backend.batch_processor = processor
+    return backend
+
+
+class _Client:
+    def __init__(self):
+        self.events = []
+        self.received = asyncio.Event()
+
+    async def send(self, event):
+        self.events.append(event)
+        self.received.set()
+
+    async def wait_for(self, event_type: str, count: int = 1, timeout: float = 10):
+        async def wait():
+            while len(self.of_type(event_type)) < count:
+                self.received.clear()
+                await self.received.wait()
+        await asyncio.wait_for(wait(), timeout)
+
+    def of_type(self, event_type: str):
+        return [event for event in self.events if event["type"] == event_type]
+
+
+@asynccontextmanager
+async def _session(backend):
+    client = _Client()
+    session = RealtimeSession(backend, client.send, user_id=7, max_pending=3)
+    await session.start()
+    try:
+        yield session, client
+    finally:
+        await session.close()
+
+
+def _audio(client: _Client, response_id: str) -> bytes:
+    return b"".join(
+        base64.b64decode(event["delta"])
+        for event in client.of_type("response.audio.delta") if event["response_id"] == response_id
+    )
+
+
+async def test_sentences_are_spoken_in_order(backend):
+    async with _session(backend) as (session, client):
+        await session.handle({"type": "input_text_buffer.append", "text": "Hello there. How are"})
+        await session.handle({"type": "input_text_buffer.append", "text": " you?"})
+        await session.handle({"type": "session.finish"})
+        await client.wait_for("session.finished")
+
+        assert [event["text"] for event in client.of_type("response.created")] == ["Hello there.", "How are you?"]
+        assert [event["status"] for event in client.of_type("response.done")] == ["completed", "completed"]
+        # 16-bit samples of the fake model's tone for each sentence
+        for response_id, sentence in (("resp_1", "Hello there."), ("resp_2", "How are you?")):
+            assert len(_audio(client, response_id)) == 2 * len(FakeTTSModel()._render_one(sentence))
+
+
+@pytest.mark.parametrize("session_update", [
+    {"temperature": "x"},
+    {"max_new_tokens": "1024"},
+    {"speaker": 3},
+    {"mode": "karaoke"},
+])
+async def test_invalid_session_update_is_reported_and_session_survives(backend, session_update):
+    async with _session(backend) as (session, client):
+        await session.handle({"type": "session.update", "session": session_update})
+
+        errors = client.of_type("error")
+        assert len(errors) == 1
+        assert errors[0]["error"]["code"] == "invalid_request"
+        assert errors[0]["error"]["event_type"] == "session.update"
+        assert session.config["temperature"] == 0.9
+
+        await session.handle({"type": "input_text_buffer.append", "text": "Still here."})
+        await session.handle({"type": "input_text_buffer.commit"})
+        await client.wait_for("response.done")
+        assert client.of_type("response.done")[0]["status"] == "completed"
+
+
+async def test_non_string_text_is_rejected(backend):
+    async with _session(backend) as (session, client):
+        await session.handle({"type": "input_text_buffer.append", "text": ["Hello."]})
+
+        assert client.of_type("error")[0]["error"]["code"] == "invalid_request"
+        assert session.buffer == ""
+
+
+async def test_append_beyond_max_pending_is_rejected_whole(backend):
+    async with _session(backend) as (session, client):
+        await session.handle({"type": "input_text_buffer.append", "text": "One. Two. Three. Four. Five."})
+
+        assert client.of_type("error")[0]["error"]["code"] == "input_text_buffer.full"
+        await session.handle({"type": "input_text_buffer.append", "text": "One. Two."})
+        await session.handle({"type": "input_text_buffer.commit"})
+        await client.wait_for("response.done", count=2)
+        assert [event["text"] for event in client.of_type("response.created")] == ["One.", "Two."]
+
+
+async def test_cancel_interrupts_the_running_response(backend):
+    async with _session(backend) as (session, client):
+        await session.handle({"type": "input_text_buffer.append", "text": "A rather long sentence to speak. Next."})
+        await client.wait_for("response.audio.delta")
+
+        await session.handle({"type": "response.cancel"})
+        await client.wait_for("response.done")
+        await asyncio.sleep(0.1)
+
+        assert client.of_type("response.done")[0]["status"] == "cancelled"
+        # The queued sentence was dropped with it
+        assert len(client.of_type("response.created")) == 1
+
+
+@pytest.fixture
+def user():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(username="realtime", email="realtime@example.com", hashed_password="x", can_use_local_model=True)
+    db.add(user)
+    db.commit()
+    yield user
+    db.delete(user)
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def client(backend, monkeypatch):
+    monkeypatch.setattr(TTSServiceFactory, "_local_backend", backend)
+    monkeypatch.setattr(realtime, "AUTH_TIMEOUT_SECONDS", 0.5)
+    app = FastAPI()
+    app.include_router(realtime.router)
+    return TestClient(app)
+
+
+def test_websocket_authenticates_with_first_event(client, user):
+    token = create_access_token({"sub": user.username})
+    with client.websocket_connect("/realtime/tts") as websocket:
+        websocket.send_json({"type": "session.authenticate", "token": token})
+        assert websocket.receive_json()["type"] == "session.created"
+
+        websocket.send_json({"type": "session.update", "session": {"temperature": "x"}})
+        assert websocket.receive_json()["error"]["code"] == "invalid_request"
+        websocket.send_json({"type": "input_text_buffer.append", "text": "Hi."})
+        websocket.send_json({"type": "session.finish"})
+        events = []
+        while not events or events[-1]["type"] != "session.finished":
+            events.append(websocket.receive_json())
+        assert [event["status"] for event in events if event["type"] == "response.done"] == ["completed"]
+
+
+@pytest.mark.parametrize("first_event", [
+    None,
+    {"type": "session.authenticate", "token": "not-a-jwt"},
+    {"type": "session.update", "session": {}},
+])
+def test_websocket_rejects_missing_or_bad_authentication(client, user, first_event):
+    # A token in the query string is no longer accepted
+    token = create_access_token({"sub": user.username})
+    with client.websocket_connect(f"/realtime/tts?token={token}") as websocket:
+        if first_event is not None:
+            websocket.send_json(first_event)
+        assert websocket.receive_json()["error"]["code"] == "unauthorized"
+        with pytest.raises(WebSocketDisconnect) as excinfo:
+            websocket.receive_json()
+        assert excinfo.value.code == 1008
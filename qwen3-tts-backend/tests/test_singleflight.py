@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from core.audio_cache import AudioCache
+from core.batch_processor import TTSBatchProcessor
+from core.inference_worker import FakeTTSModel
+from core.singleflight import SingleFlight
+from core.tts_service import LocalTTSBackend
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(AudioCache, "_instance", AudioCache(str(tmp_path / "audio_cache"), 0))
+    fake_model = FakeTTSModel()
+    processor = TTSBatchProcessor(batch_size=4, batch_wait_time=0.01)
+
+    async def load(variant):
+        return fake_model
+
+    processor.model_loader = load
+    backend = LocalTTSBackend()
+    backend.batch_processor = processor
+    return backend
+
+
+def _params(user_id: int, priority: str) -> dict:
+    params = {name: None for name in TTSBatchProcessor.SAMPLING_PARAMS}
+    params.update(
+        text="one shared sentence", language="English", speaker="Vivian", instruct="",
+        user_id=user_id, priority=priority
+    )
+    return params
+
+
+async def _wait_queued(processor: TTSBatchProcessor) -> None:
+    for _ in range(100):
+        if processor.queue:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("nothing was queued")
+
+
+async def test_follower_promotes_queued_work_and_shares_usage(backend):
+    processor = backend.batch_processor
+    leader = asyncio.create_task(backend.generate_custom_voice(_params(1, "bulk")))
+    await _wait_queued(processor)
+    assert processor.queue[0].priority == "bulk"
+
+    follower = asyncio.create_task(backend.generate_custom_voice(_params(2, "interactive")))
+    await asyncio.sleep(0.05)
+
+    # Still one request, now in the follower's class and listing both users
+    assert len(processor.queue) == 1
+    assert processor.queue[0].priority == "interactive"
+    assert processor.queue[0].data["user_ids"] == [1, 2]
+
+    processor._start_processor()
+    try:
+        (leader_audio, _), (follower_audio, _) = await asyncio.wait_for(asyncio.gather(leader, follower), 10)
+    finally:
+        processor._processor_task.cancel()
+
+    assert leader_audio == follower_audio
+    assert processor.total_requests_batched == 1
+    assert processor.user_device_seconds[1] == pytest.approx(processor.user_device_seconds[2])
+    assert processor.user_device_seconds[1] > 0
+    for user_id in (1, 2):
+        assert processor._pending_usage[user_id]["requests"] == 1
+        assert processor._pending_usage[user_id]["characters"] == len("one shared sentence")
+
+
+async def test_callers_joining_before_submission_set_the_priority(backend):
+    processor = backend.batch_processor
+    calls = asyncio.gather(
+        backend.generate_custom_voice(_params(1, "bulk")),
+        backend.generate_custom_voice(_params(2, "preview")),
+    )
+    await _wait_queued(processor)
+
+    request = processor.queue[0]
+    assert request.priority == "preview"
+    assert request.user_id == 2
+
+    processor._start_processor()
+    try:
+        await asyncio.wait_for(calls, 10)
+    finally:
+        processor._processor_task.cancel()
+
+
+async def test_promote_never_demotes(backend):
+    processor = backend.batch_processor
+    task = asyncio.create_task(backend.generate_custom_voice(_params(1, "interactive")))
+    await _wait_queued(processor)
+    request_id = processor.queue[0].request_id
+
+    assert not await processor.promote(request_id, "bulk")
+    assert processor.queue[0].priority == "interactive"
+    assert not await processor.promote("unknown", "interactive")
+
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+async def test_singleflight_reports_joining_callers():
+    group = SingleFlight("test")
+    release = asyncio.Event()
+    joined = []
+
+    async def work(shared_token):
+        shared_token.on_join = joined.append
+        await release.wait()
+        return list(shared_token.callers)
+
+    first = asyncio.create_task(group.do("key", work, caller="a"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(group.do("key", work, caller="b"))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == await second == ["a", "b"]
+    assert joined == ["b"]
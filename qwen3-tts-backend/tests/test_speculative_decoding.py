@@ -0,0 +1,163 @@
+import pytest
+import torch
+
+from qwen_tts.core.models.configuration_qwen3_tts import Qwen3TTSConfig
+from qwen_tts.core.models.modeling_qwen3_tts import Qwen3TTSForConditionalGeneration
+
+CODEC_BASE = 1100
+
+
+def _tiny_model(hidden_size: int, num_layers: int, seed: int) -> Qwen3TTSForConditionalGeneration:
+    torch.manual_seed(seed)
+    code_predictor_config = dict(
+        vocab_size=64, hidden_size=32, intermediate_size=64, num_hidden_layers=1,
+        num_attention_heads=2, num_key_value_heads=1, head_dim=16, num_code_groups=4,
+    )
+    talker_config = dict(
+        code_predictor_config=code_predictor_config,
+        vocab_size=CODEC_BASE + 64, hidden_size=hidden_size, intermediate_size=2 * hidden_size,
+        num_hidden_layers=num_layers, num_attention_heads=4, num_key_value_heads=2, head_dim=hidden_size // 4,
+        num_code_groups=4, text_hidden_size=32, text_vocab_size=200,
+        codec_eos_token_id=CODEC_BASE + 10, codec_think_id=CODEC_BASE + 11, codec_nothink_id=CODEC_BASE + 12,
+        codec_think_bos_id=CODEC_BASE + 13, codec_think_eos_id=CODEC_BASE + 14, codec_pad_id=CODEC_BASE + 15,
+        codec_bos_id=CODEC_BASE + 16, spk_id={}, spk_is_dialect={}, codec_language_id={"english": CODEC_BASE + 20},
+        rope_scaling={"mrope_section": [2, 1, 1], "interleaved": True, "rope_type": "default"},
+    )
+    config = Qwen3TTSConfig(
+        talker_config=talker_config, tts_model_type="voice_design",
+        tts_pad_token_id=197, tts_bos_token_id=198, tts_eos_token_id=199,
+    )
+    return Qwen3TTSForConditionalGeneration(config).eval().float()
+
+
+@pytest.fixture(scope="module")
+def target():
+    return _tiny_model(hidden_size=64, num_layers=3, seed=0)
+
+
+@pytest.fixture(scope="module")
+def draft():
+    return _tiny_model(hidden_size=32, num_layers=1, seed=1)
+
+
+def _perturbed_copy(model: Qwen3TTSForConditionalGeneration, noise: float) -> Qwen3TTSForConditionalGeneration:
+    """A draft that agrees with `model` more often the smaller `noise` is."""
+    copy = _tiny_model(hidden_size=model.config.talker_config.hidden_size,
+                       num_layers=model.config.talker_config.num_hidden_layers, seed=0)
+    copy.load_state_dict(model.state_dict())
+    torch.manual_seed(3)
+    with torch.no_grad():
+        for param in copy.talker.parameters():
+            if param.numel() > 1:
+                param.add_(torch.randn_like(param) * noise * param.std())
+    return copy
+
+
+def _greedy_kwargs(max_new_tokens: int = 40) -> dict:
+    torch.manual_seed(5)
+    return dict(
+        input_ids=[torch.randint(0, 190, (1, 20))],
+        languages=["english"],
+        do_sample=False,
+        subtalker_dosample=False,
+        max_new_tokens=max_new_tokens,
+    )
+
+
+def _assert_same_output(expected, actual):
+    (expected_codes,), (expected_hidden,) = expected
+    (actual_codes,), (actual_hidden,) = actual
+    assert torch.equal(actual_codes, expected_codes)
+    assert actual_hidden.shape == expected_hidden.shape
+    assert torch.allclose(actual_hidden, expected_hidden, atol=1e-4)
+
+
+@pytest.mark.parametrize("num_draft_frames", [1, 3, 6])
+def test_speculative_matches_greedy_with_unrelated_draft(target, draft, num_draft_frames):
+    kwargs = _greedy_kwargs()
+    expected = target.generate(**kwargs)
+
+    actual = target.generate(draft_model=draft, num_draft_frames=num_draft_frames, **kwargs)
+
+    _assert_same_output(expected, actual)
+    stats = target.speculative_stats
+    assert 0 <= stats["accepted_frames"] <= stats["proposed_frames"]
+    assert stats["acceptance_rate"] == pytest.approx(stats["accepted_frames"] / stats["proposed_frames"])
+
+
+def test_speculative_accepts_every_frame_of_identical_draft(target):
+    kwargs = _greedy_kwargs()
+    expected = target.generate(**kwargs)
+
+    actual = target.generate(draft_model=target, num_draft_frames=4, **kwargs)
+
+    _assert_same_output(expected, actual)
+    stats = target.speculative_stats
+    assert stats["acceptance_rate"] == 1.0
+    # Each round verifies up to 4 proposals plus the target's own next frame
+    assert stats["rounds"] <= expected[0][0].shape[0] // 4 + 1
+
+
+def test_speculative_matches_greedy_when_eos_ends_early(target, draft):
+    eos_token_id = target.config.talker_config.codec_eos_token_id
+    weight = target.talker.codec_head.weight
+    original = weight.detach().clone()
+    with torch.no_grad():
+        # Make eos likely enough to end the sequence well before max_new_tokens
+        weight[eos_token_id] = (original[eos_token_id] + original[:CODEC_BASE].mean(0)) * 4.0
+    try:
+        kwargs = _greedy_kwargs(max_new_tokens=200)
+        expected = target.generate(**kwargs)
+        assert expected[0][0].shape[0] < 199
+
+        for draft_model in (draft, target):
+            _assert_same_output(expected, target.generate(draft_model=draft_model, num_draft_frames=3, **kwargs))
+    finally:
+        with torch.no_grad():
+            weight.copy_(original)
+
+
+@pytest.mark.parametrize("noise", [0.005, 0.1])
+def test_speculative_matches_greedy_with_close_draft(target, noise):
+    kwargs = _greedy_kwargs(max_new_tokens=60)
+    expected = target.generate(**kwargs)
+
+    actual = target.generate(draft_model=_perturbed_copy(target, noise), num_draft_frames=4, **kwargs)
+
+    _assert_same_output(expected, actual)
+    assert 0.0 < target.speculative_stats["acceptance_rate"] < 1.0
+
+
+def test_speculative_acceptance_rate(target):
+    kwargs = _greedy_kwargs(max_new_tokens=60)
+    rates = {}
+    for noise in (0.005, 0.02, 0.1):
+        draft_model = _perturbed_copy(target, noise)
+        for num_draft_frames in (2, 4):
+            target.generate(draft_model=draft_model, num_draft_frames=num_draft_frames, **kwargs)
+            rates[noise, num_draft_frames] = target.speculative_stats["acceptance_rate"]
+    print("acceptance rate: " + ", ".join(f"noise={noise} k={k}: {rate:.2f}" for (noise, k), rate in rates.items()))
+
+    # A draft closer to the target gets more of its frames accepted
+    for num_draft_frames in (2, 4):
+        assert rates[0.005, num_draft_frames] > rates[0.02, num_draft_frames] > rates[0.1, num_draft_frames]
+    assert rates[0.005, 4] > 0.8
+
+
+def test_sampling_falls_back_to_standard_decoding(target, draft):
+    kwargs = _greedy_kwargs(max_new_tokens=10)
+    kwargs["do_sample"] = True
+    target.speculative_stats = None
+
+    codes, _ = target.generate(draft_model=draft, **kwargs)
+
+    assert target.speculative_stats is None
+    assert codes[0].shape[1] == target.config.talker_config.num_code_groups
+
+
+def test_incompatible_draft_is_rejected(target):
+    incompatible = _tiny_model(hidden_size=32, num_layers=1, seed=2)
+    incompatible.config.talker_config.codec_eos_token_id = CODEC_BASE + 9
+
+    with pytest.raises(ValueError, match="codec_eos_token_id"):
+        target.generate(draft_model=incompatible, **_greedy_kwargs(max_new_tokens=5))
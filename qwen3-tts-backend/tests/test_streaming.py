@@ -0,0 +1,231 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+import api.tts as tts_api
+from core.audio_cache import AudioCache
+from core.batch_processor import TTSBatchProcessor
+from core.config import settings
+from core.inference_worker import FakeTTSModel
+from core.tts_service import LocalTTSBackend
+from db.database import Base, SessionLocal, engine
+from db.models import Job, JobStatus
+from qwen_tts import Qwen3TTSModel
+
+from test_speculative_decoding import _tiny_model
+
+UPSAMPLE = 4
+
+
+class _Processor:
+    def __call__(self, text, padding=False):
+        return {"input_ids": [[ord(char) % 190 for char in item][:40] for item in text]}
+
+
+class _RecordingTokenizer:
+    """Decodes each frame to `UPSAMPLE` copies of its first code and records every decode call."""
+
+    def __init__(self):
+        self.decoded_lengths = []
+
+    def get_model_type(self):
+        return "qwen3_tts_tokenizer_12hz"
+
+    def get_decode_upsample_rate(self):
+        return UPSAMPLE
+
+    def get_output_sample_rate(self):
+        return 24000
+
+    def decode(self, items):
+        self.decoded_lengths.extend(len(item["audio_codes"]) for item in items)
+        return [np.repeat(item["audio_codes"][:, 0].float().numpy(), UPSAMPLE) for item in items], 24000
+
+
+@pytest.fixture(scope="module")
+def tts():
+    model = _tiny_model(hidden_size=64, num_layers=2, seed=0)
+    model.load_speech_tokenizer(_RecordingTokenizer())
+    return Qwen3TTSModel(model=model, processor=_Processor())
+
+
+def test_generate_stream_decodes_each_frame_once(tts):
+    kwargs = dict(instruct="", language="english", do_sample=False, subtalker_dosample=False, max_new_tokens=30)
+    (codes,), sample_rate = tts.generate_voice_design(text="hello there", decode=False, **kwargs)
+    assert sample_rate is None
+    assert tts.model.speech_tokenizer.decoded_lengths == []
+
+    chunks = list(tts.generate_stream("voice_design", "hello there", chunk_frames=8, left_context_frames=4, **kwargs))
+
+    # Only the chunk decodes ran: no full-length decode of the whole result after streaming
+    decoded = tts.model.speech_tokenizer.decoded_lengths
+    assert len(decoded) == len(chunks) == -(-len(codes) // 8)
+    assert max(decoded) <= 8 + 4
+    stitched = np.concatenate([chunk for chunk, _ in chunks])
+    assert np.array_equal(stitched, np.repeat(codes[:, 0].float().numpy(), UPSAMPLE))
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(AudioCache, "_instance", AudioCache(str(tmp_path / "audio_cache"), 10 * 1024**2))
+    fake_model = FakeTTSModel()
+    calls = []
+    generate_stream = fake_model.generate_stream
+
+    def counting_generate_stream(*args, **kwargs):
+        calls.append(args)
+        return generate_stream(*args, **kwargs)
+
+    fake_model.generate_stream = counting_generate_stream
+    fake_model.stream_calls = calls
+
+    processor = TTSBatchProcessor(batch_size=4, batch_wait_time=0.01)
+
+    async def load(variant):
+        return fake_model
+
+    processor.model_loader = load
+    backend = LocalTTSBackend()
+    backend.batch_processor = processor
+    backend.fake_model = fake_model
+    return backend
+
+
+def _params(text: str = "a streamed sentence") -> dict:
+    params = {name: None for name in TTSBatchProcessor.SAMPLING_PARAMS}
+    params.update(text=text, language="English", speaker="Vivian", instruct="", user_id=7)
+    return params
+
+
+async def _collect(chunks) -> bytes:
+    return b"".join([pcm async for pcm, _ in chunks])
+
+
+async def test_stream_is_cached_and_charged_to_the_user(backend):
+    first = await _collect(backend.stream("custom_voice", _params()))
+
+    assert len(backend.fake_model.stream_calls) == 1
+    assert backend.batch_processor.user_device_seconds[7] > 0
+    assert backend.batch_processor._user_finish["interactive", 7] > 0
+    assert backend.batch_processor._pending_usage[7]["characters"] == len("a streamed sentence")
+    assert AudioCache._instance.get_stats()["entries"] == 1
+
+    # Served from the cache without touching the model
+    second = await _collect(backend.stream("custom_voice", _params()))
+    assert second == first
+    assert len(backend.fake_model.stream_calls) == 1
+
+    # And a queued request with the same inputs is a hit as well
+    audio, _ = await backend.generate_custom_voice(_params())
+    assert audio[44:] == first
+
+
+async def test_abandoned_stream_is_not_cached(backend):
+    chunks = backend.stream("custom_voice", _params("a long text " * 20))
+    async for _ in chunks:
+        break
+    await chunks.aclose()
+
+    assert AudioCache._instance.get_stats()["entries"] == 0
+    assert backend.batch_processor.user_device_seconds[7] > 0
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.query(Job).delete()
+    session.commit()
+    session.close()
+
+
+class _Backend:
+    def __init__(self, chunks: int, error: Exception = None):
+        self.chunks = chunks
+        self.error = error
+
+    async def stream(self, mode, params, voice_clone_prompt=None):
+        for _ in range(self.chunks):
+            await asyncio.sleep(0)
+            yield b"\x00\x01" * 100, 24000
+        if self.error is not None:
+            raise self.error
+
+
+def _streaming_job(db) -> int:
+    job = Job(user_id=1, job_type="custom-voice", status=JobStatus.PENDING, backend_type="local", input_data="")
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def _job(db, job_id: int):
+    db.expire_all()
+    return db.query(Job).filter(Job.id == job_id).first()
+
+
+async def test_stream_job_completes(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+    threads = []
+    write_pcm_wav = tts_api.write_pcm_wav
+
+    def recording_write(*args):
+        threads.append(threading.current_thread())
+        return write_pcm_wav(*args)
+
+    monkeypatch.setattr(tts_api, "write_pcm_wav", recording_write)
+    job_id = _streaming_job(db)
+
+    response = tts_api._stream_job(job_id, _Backend(3), "custom_voice", {"text": "hi"}, "pcm")
+    body = b"".join([chunk async for chunk in response.body_iterator])
+
+    assert len(body) == 3 * 200
+    job = _job(db, job_id)
+    assert job.status == JobStatus.COMPLETED
+    assert job.output_path.startswith(str(tmp_path))
+    # The result file is written off the event loop
+    assert threads and threads[0] is not threading.main_thread()
+
+
+async def test_client_disconnect_drops_the_job_instead_of_failing_it(db, monkeypatch):
+    deleted = []
+
+    async def publish_job_deleted(user_id, job_id):
+        deleted.append(job_id)
+
+    monkeypatch.setattr(tts_api, "publish_job_deleted", publish_job_deleted)
+    job_id = _streaming_job(db)
+
+    response = tts_api._stream_job(job_id, _Backend(10), "custom_voice", {"text": "hi"}, "pcm")
+    body = response.body_iterator
+    await body.__anext__()
+    await body.aclose()
+
+    assert _job(db, job_id) is None
+    assert deleted == [job_id]
+
+
+async def test_stream_error_fails_the_job(db):
+    job_id = _streaming_job(db)
+
+    response = tts_api._stream_job(job_id, _Backend(1, RuntimeError("decoder crashed")), "custom_voice", {"text": "hi"}, "pcm")
+    with pytest.raises(RuntimeError):
+        async for _ in response.body_iterator:
+            pass
+
+    job = _job(db, job_id)
+    assert job.status == JobStatus.FAILED
+    assert job.error_message == "decoder crashed"
+
+
+async def test_stream_of_deleted_job_ends_quietly(db):
+    job_id = _streaming_job(db)
+    db.query(Job).filter(Job.id == job_id).delete()
+    db.commit()
+
+    response = tts_api._stream_job(job_id, _Backend(3), "custom_voice", {"text": "hi"}, "pcm")
+
+    assert [chunk async for chunk in response.body_iterator] == []
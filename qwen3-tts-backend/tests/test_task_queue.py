@@ -0,0 +1,63 @@
+import pytest
+
+from core import task_queue
+from core.task_queue import LeasedTask, NonRetryableError, TaskQueue
+from db import crud
+from db.database import Base, SessionLocal, engine
+from db.models import QueuedTask, TaskStatus
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.query(QueuedTask).delete()
+    session.commit()
+    session.close()
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    monkeypatch.setattr(task_queue, "_handlers", {})
+    return TaskQueue()
+
+
+async def _run_once(db, queue: TaskQueue, error: Exception):
+    failures = []
+
+    async def handler(**payload):
+        raise error
+
+    async def on_failure(payload, message, will_retry):
+        failures.append(will_retry)
+
+    task_queue.register_task_handler("test.fail", handler, on_failure)
+    crud.enqueue_task(db, "test.fail", {}, max_attempts=3)
+    (task,) = crud.claim_tasks(db, queue.worker_id, queue.lease_seconds, 1)
+    await queue._execute(LeasedTask(task.id, task.task_type, {}, None, None, task.attempts))
+
+    db.expire_all()
+    return db.query(QueuedTask).filter(QueuedTask.id == task.id).one(), failures
+
+
+@pytest.mark.parametrize("error", [
+    NonRetryableError("Voice design 3 has no prepared clone prompt"),
+    ValueError("Text cannot be empty"),
+    FileNotFoundError("ref.wav"),
+])
+async def test_bad_input_fails_without_retry(db, queue, error):
+    task, failures = await _run_once(db, queue, error)
+
+    assert task.status == TaskStatus.FAILED
+    assert task.attempts == 1
+    assert failures == [False]
+    assert queue.counters["failed"] == 1 and queue.counters["retried"] == 0
+
+
+async def test_infrastructure_error_is_retried(db, queue):
+    task, failures = await _run_once(db, queue, RuntimeError("CUDA out of memory"))
+
+    assert task.status == TaskStatus.QUEUED
+    assert failures == [True]
+    assert queue.counters["retried"] == 1
@@ -1,5 +1,6 @@
 import base64
 import io
+import struct
 from pathlib import Path
 import numpy as np
 import soundfile as sf
@@ -111,3 +112,28 @@ def save_audio_file(
 
     sf.write(str(output_path), audio_array, sample_rate, format='WAV', subtype='PCM_16')
     return str(output_path)
+
+
+def streaming_wav_header(sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    # Length fields are unknown while streaming; 0xFFFFFFFF tells players to read until the connection ends
+    unknown_size = 0xFFFFFFFF
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', unknown_size, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate,
+        sample_rate * channels * sample_width, channels * sample_width, sample_width * 8,
+        b'data', unknown_size
+    )
+
+
+def write_pcm_wav(pcm: bytes, sample_rate: int, output_path: str | Path) -> str:
+    import wave
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(output_path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return str(output_path)
@@ -110,6 +110,10 @@ def validate_generation_params(params: dict) -> dict:
     if not 1.0 <= validated['repetition_penalty'] <= 2.0:
         raise ValueError("repetition_penalty must be between 1.0 and 2.0")
 
+    validated['seed'] = params.get('seed')
+    if validated['seed'] is not None and not 0 <= validated['seed'] <= 2**32 - 1:
+        raise ValueError("seed must be between 0 and 4294967295")
+
     return validated
 
 
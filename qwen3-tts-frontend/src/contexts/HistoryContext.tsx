@@ -1,7 +1,8 @@
-import { createContext, useContext, useState, useEffect, useCallback, useMemo, type ReactNode } from 'react'
+import { createContext, useContext, useState, useEffect, useCallback, useMemo, useRef, type ReactNode } from 'react'
 import { jobApi } from '@/lib/api'
 import type { Job } from '@/types/job'
 import { toast } from 'sonner'
+import { subscribeJobEvents } from '@/lib/jobEvents'
 
 interface HistoryContextType {
   jobs: Job[]
@@ -26,6 +27,7 @@ export function HistoryProvider({ children }: { children: ReactNode }) {
   const [error, setError] = useState<string | null>(null)
   const [skip, setSkip] = useState(0)
   const limit = 20
+  const jobsRef = useRef<Job[]>([])
 
   const hasMore = jobs.length < total
 
@@ -94,6 +96,36 @@ export function HistoryProvider({ children }: { children: ReactNode }) {
     loadJobs(0, false)
   }, [loadJobs])
 
+  useEffect(() => {
+    jobsRef.current = jobs
+  }, [jobs])
+
+  useEffect(() => {
+    return subscribeJobEvents((event) => {
+      const current = jobsRef.current
+      if (event.type === 'job.updated') {
+        const updated = event.job
+        if (current.some(job => job.id === updated.id)) {
+          setJobs(prev => prev.map(job => (job.id === updated.id ? updated : job)))
+        } else if (current.length === 0 || updated.id > current[0].id) {
+          // Only jobs newer than the loaded page are new; older ones belong to pages not loaded yet
+          jobsRef.current = [updated, ...current]
+          setJobs(prev => [updated, ...prev.filter(job => job.id !== updated.id)])
+          setTotal(prev => prev + 1)
+        }
+      } else if (event.type === 'job.deleted') {
+        if (current.some(job => job.id === event.job_id)) {
+          jobsRef.current = current.filter(job => job.id !== event.job_id)
+          setJobs(prev => prev.filter(job => job.id !== event.job_id))
+          setTotal(prev => prev - 1)
+        }
+      } else if (event.type === 'resync') {
+        setSkip(0)
+        loadJobs(0, false)
+      }
+    })
+  }, [loadJobs])
+
   const value = useMemo(
     () => ({
       jobs,
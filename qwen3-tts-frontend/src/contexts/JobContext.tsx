@@ -4,6 +4,7 @@ import { jobApi } from '@/lib/api'
 import type { Job, JobStatus } from '@/types/job'
 import { POLL_INTERVAL } from '@/lib/constants'
 import { useHistoryContext } from '@/contexts/HistoryContext'
+import { subscribeJobEvents, isJobEventsConnected } from '@/lib/jobEvents'
 
 interface JobContextType {
   currentJob: Job | null
@@ -25,6 +26,7 @@ export function JobProvider({ children }: { children: ReactNode }) {
   const [elapsedTime, setElapsedTime] = useState(0)
 
   const { refresh: historyRefresh } = useHistoryContext()
+  const jobIdRef = useRef<number | null>(null)
   const pollIntervalRef = useRef<ReturnType<typeof setInterval> | null>(null)
   const timeIntervalRef = useRef<ReturnType<typeof setInterval> | null>(null)
 
@@ -41,6 +43,7 @@ export function JobProvider({ children }: { children: ReactNode }) {
 
   const stopJob = useCallback(() => {
     clearIntervals()
+    jobIdRef.current = null
     setCurrentJob(null)
     setStatus(null)
     setError(null)
@@ -58,48 +61,72 @@ export function JobProvider({ children }: { children: ReactNode }) {
     setElapsedTime(0)
   }, [])
 
+  const applyJob = useCallback((job: Job) => {
+    if (job.id !== jobIdRef.current) return
+    setCurrentJob(job)
+    setStatus(job.status)
+
+    if (job.status === 'completed' || job.status === 'failed') {
+      jobIdRef.current = null
+      clearIntervals()
+      if (job.status === 'completed') {
+        toast.success('任务完成！')
+      } else {
+        setError(job.error_message || '任务失败')
+        toast.error(job.error_message || '任务失败')
+      }
+      // The history list follows job events itself; reload it only when they are unavailable
+      if (!isJobEventsConnected()) {
+        try {
+          historyRefresh()
+        } catch {}
+      }
+    }
+  }, [historyRefresh, clearIntervals])
+
+  const fetchJob = useCallback(async (jobId: number) => {
+    try {
+      applyJob(await jobApi.getJob(jobId))
+    } catch (error: any) {
+      if (jobId !== jobIdRef.current) return
+      jobIdRef.current = null
+      clearIntervals()
+      const message = error.response?.data?.detail || '获取任务状态失败'
+      setError(message)
+      toast.error(message)
+    }
+  }, [applyJob, clearIntervals])
+
   const startJob = useCallback((jobId: number) => {
     clearIntervals()
+    jobIdRef.current = jobId
     // Reset state for new job
     setCurrentJob(null)
     setStatus('pending')
     setError(null)
     setElapsedTime(0)
 
-    const poll = async () => {
-      try {
-        const job = await jobApi.getJob(jobId)
-        setCurrentJob(job)
-        setStatus(job.status)
-
-        if (job.status === 'completed') {
-          clearIntervals()
-          toast.success('任务完成！')
-          try {
-            historyRefresh()
-          } catch {}
-        } else if (job.status === 'failed') {
-          clearIntervals()
-          setError(job.error_message || '任务失败')
-          toast.error(job.error_message || '任务失败')
-          try {
-            historyRefresh()
-          } catch {}
-        }
-      } catch (error: any) {
-        clearIntervals()
-        const message = error.response?.data?.detail || '获取任务状态失败'
-        setError(message)
-        toast.error(message)
+    fetchJob(jobId)
+    // Status changes arrive as job events; poll only while the event stream is down
+    pollIntervalRef.current = setInterval(() => {
+      if (!isJobEventsConnected()) {
+        fetchJob(jobId)
       }
-    }
-
-    poll()
-    pollIntervalRef.current = setInterval(poll, POLL_INTERVAL)
+    }, POLL_INTERVAL)
     timeIntervalRef.current = setInterval(() => {
       setElapsedTime((prev) => prev + 1)
     }, 1000)
-  }, [historyRefresh, clearIntervals])
+  }, [fetchJob, clearIntervals])
+
+  useEffect(() => {
+    return subscribeJobEvents((event) => {
+      if (event.type === 'job.updated') {
+        applyJob(event.job)
+      } else if (event.type === 'resync' && jobIdRef.current !== null) {
+        fetchJob(jobIdRef.current)
+      }
+    })
+  }, [applyJob, fetchJob])
 
   useEffect(() => {
     return () => {
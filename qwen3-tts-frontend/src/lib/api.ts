@@ -316,7 +316,7 @@ const normalizeJobType = (jobType: string): JobType => {
   return typeMap[jobType] || jobType as JobType
 }
 
-const normalizeJob = (job: any): Job => {
+export const normalizeJob = (job: any): Job => {
   let parameters = job.input_params || job.parameters || {}
 
   if (typeof parameters === 'string') {
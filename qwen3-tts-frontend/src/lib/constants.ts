@@ -19,6 +19,7 @@ export const API_ENDPOINTS = {
     GET: (id: number) => `/jobs/${id}`,
     DELETE: (id: number) => `/jobs/${id}`,
     AUDIO: (id: number) => `/jobs/${id}/download`,
+    EVENTS: '/jobs/events',
   },
   USERS: {
     LIST: '/users',
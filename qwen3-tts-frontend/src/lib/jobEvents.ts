@@ -0,0 +1,125 @@
+import type { Job } from '@/types/job'
+import { normalizeJob } from '@/lib/api'
+import { API_ENDPOINTS } from '@/lib/constants'
+
+export type JobEvent =
+  | { type: 'ready' }
+  | { type: 'resync' }
+  | { type: 'job.updated'; job: Job }
+  | { type: 'job.deleted'; job_id: number }
+
+type JobEventListener = (event: JobEvent) => void
+
+const RECONNECT_MIN_DELAY = 1000
+const RECONNECT_MAX_DELAY = 30000
+
+const listeners = new Set<JobEventListener>()
+let controller: AbortController | null = null
+let reconnectTimer: ReturnType<typeof setTimeout> | null = null
+let reconnectDelay = RECONNECT_MIN_DELAY
+let hasConnected = false
+let connected = false
+
+const emit = (event: JobEvent) => {
+  listeners.forEach((listener) => listener(event))
+}
+
+const handleMessage = (data: string) => {
+  const msg = JSON.parse(data)
+  if (msg.type === 'ready') {
+    connected = true
+    reconnectDelay = RECONNECT_MIN_DELAY
+    // Events may have been missed while the stream was down
+    emit(hasConnected ? { type: 'resync' } : { type: 'ready' })
+    hasConnected = true
+  } else if (msg.type === 'job.updated') {
+    emit({ type: 'job.updated', job: normalizeJob(msg.job) })
+  } else if (msg.type === 'job.deleted' || msg.type === 'resync') {
+    emit(msg)
+  }
+}
+
+const scheduleReconnect = () => {
+  connected = false
+  if (listeners.size === 0 || reconnectTimer) return
+  reconnectTimer = setTimeout(() => {
+    reconnectTimer = null
+    connect()
+  }, reconnectDelay)
+  reconnectDelay = Math.min(reconnectDelay * 2, RECONNECT_MAX_DELAY)
+}
+
+const connect = () => {
+  const token = localStorage.getItem('token')
+  if (!token) return
+
+  const apiBase = (import.meta.env.VITE_API_URL as string) || ''
+  const current = new AbortController()
+  controller = current
+
+  fetch(`${apiBase}${API_ENDPOINTS.JOBS.EVENTS}`, {
+    headers: { Authorization: `Bearer ${token}` },
+    signal: current.signal,
+  }).then(async (res) => {
+    if (res.status === 401) {
+      connected = false
+      return
+    }
+    const reader = res.body?.getReader()
+    if (!res.ok || !reader) throw new Error(`Job events unavailable (${res.status})`)
+
+    const decoder = new TextDecoder()
+    let buffer = ''
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+      const parts = buffer.split('\n\n')
+      buffer = parts.pop() ?? ''
+      for (const part of parts) {
+        const line = part.trim()
+        if (!line.startsWith('data: ')) continue
+        try {
+          handleMessage(line.slice(6))
+        } catch {}
+      }
+    }
+    throw new Error('Job events stream closed')
+  }).catch(() => {
+    if (controller === current && !current.signal.aborted) {
+      scheduleReconnect()
+    }
+  })
+}
+
+const disconnect = () => {
+  if (reconnectTimer) {
+    clearTimeout(reconnectTimer)
+    reconnectTimer = null
+  }
+  controller?.abort()
+  controller = null
+  connected = false
+  hasConnected = false
+  reconnectDelay = RECONNECT_MIN_DELAY
+}
+
+export function subscribeJobEvents(listener: JobEventListener): () => void {
+  listeners.add(listener)
+  if (listeners.size === 1) {
+    connect()
+  } else if (connected) {
+    listener({ type: 'ready' })
+  }
+
+  return () => {
+    listeners.delete(listener)
+    if (listeners.size === 0) {
+      disconnect()
+    }
+  }
+}
+
+export function isJobEventsConnected(): boolean {
+  return connected
+}
@@ -11,6 +11,7 @@ export interface Job {
   error_message?: string
   audio_url?: string
   download_url?: string
+  eta_seconds?: number | null
   parameters: Record<string, any>
 }
 
@@ -18,6 +19,7 @@ export interface JobCreateResponse {
   job_id: number
   status: string
   message: string
+  eta_seconds?: number | null
 }
 
 export interface JobListResponse {
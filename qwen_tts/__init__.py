@@ -18,7 +18,46 @@
 qwen_tts: Qwen-TTS package.
 """
 
-from .inference.qwen3_tts_model import Qwen3TTSModel, VoiceClonePromptItem
-from .inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["__version__"]
\ No newline at end of file
+if TYPE_CHECKING:
+    from .inference.qwen3_tts_model import (
+        Qwen3TTSModel,
+        VoiceClonePromptItem,
+        load_voice_clone_prompt,
+        save_voice_clone_prompt,
+    )
+    from .inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
+
+# Public attributes are resolved on first access so that `import qwen_tts` does not pull in
+# torch / transformers / librosa until a model or tokenizer is actually used.
+_LAZY_ATTRIBUTES = {
+    "Qwen3TTSModel": ".inference.qwen3_tts_model",
+    "VoiceClonePromptItem": ".inference.qwen3_tts_model",
+    "load_voice_clone_prompt": ".inference.qwen3_tts_model",
+    "save_voice_clone_prompt": ".inference.qwen3_tts_model",
+    "Qwen3TTSTokenizer": ".inference.qwen3_tts_tokenizer",
+}
+
+__all__ = [
+    "__version__",
+    "Qwen3TTSModel",
+    "VoiceClonePromptItem",
+    "Qwen3TTSTokenizer",
+    "load_voice_clone_prompt",
+    "save_voice_clone_prompt",
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
\ No newline at end of file
@@ -20,14 +20,14 @@ A gradio demo for Qwen3 TTS models.
 import argparse
 import os
 import tempfile
-from dataclasses import asdict
 from typing import Any, Dict, List, Optional, Tuple
 
 import gradio as gr
 import numpy as np
 import torch
 
-from .. import Qwen3TTSModel, VoiceClonePromptItem
+from .. import Qwen3TTSModel, load_voice_clone_prompt, save_voice_clone_prompt
+from ..inference.qwen3_tts_model import voice_clone_prompt_items
 
 
 def _title_case_display(s: str) -> str:
@@ -513,12 +513,9 @@ Upload a previously saved voice file, then synthesize new text.
                                 ref_text=(ref_txt.strip() if ref_txt else None),
                                 x_vector_only_mode=bool(use_xvec),
                             )
-                            payload = {
-                                "items": [asdict(it) for it in items],
-                            }
-                            fd, out_path = tempfile.mkstemp(prefix="voice_clone_prompt_", suffix=".pt")
+                            fd, out_path = tempfile.mkstemp(prefix="voice_clone_prompt_", suffix=".safetensors")
                             os.close(fd)
-                            torch.save(payload, out_path)
+                            save_voice_clone_prompt(items, out_path)
                             return out_path, "Finished. (生成完成)"
                         except Exception as e:
                             return None, f"{type(e).__name__}: {e}"
@@ -531,36 +528,18 @@ Upload a previously saved voice file, then synthesize new text.
                                 return None, "Target text is required (必须填写待合成文本)."
 
                             path = getattr(file_obj, "name", None) or getattr(file_obj, "path", None) or str(file_obj)
-                            payload = torch.load(path, map_location="cpu", weights_only=True)
-                            if not isinstance(payload, dict) or "items" not in payload:
-                                return None, "Invalid file format (文件格式不正确)."
-
-                            items_raw = payload["items"]
-                            if not isinstance(items_raw, list) or len(items_raw) == 0:
-                                return None, "Empty voice items (音色为空)."
-
-                            items: List[VoiceClonePromptItem] = []
-                            for d in items_raw:
-                                if not isinstance(d, dict):
+                            if path.endswith(".safetensors"):
+                                items = load_voice_clone_prompt(path)
+                            else:
+                                # Voice files saved by earlier versions of this demo
+                                payload = torch.load(path, map_location="cpu", weights_only=True)
+                                if not isinstance(payload, dict) or "items" not in payload:
+                                    return None, "Invalid file format (文件格式不正确)."
+                                if not isinstance(payload["items"], list):
                                     return None, "Invalid item format in file (文件内部格式错误)."
-                                ref_code = d.get("ref_code", None)
-                                if ref_code is not None and not torch.is_tensor(ref_code):
-                                    ref_code = torch.tensor(ref_code)
-                                ref_spk = d.get("ref_spk_embedding", None)
-                                if ref_spk is None:
-                                    return None, "Missing ref_spk_embedding (缺少说话人向量)."
-                                if not torch.is_tensor(ref_spk):
-                                    ref_spk = torch.tensor(ref_spk)
-
-                                items.append(
-                                    VoiceClonePromptItem(
-                                        ref_code=ref_code,
-                                        ref_spk_embedding=ref_spk,
-                                        x_vector_only_mode=bool(d.get("x_vector_only_mode", False)),
-                                        icl_mode=bool(d.get("icl_mode", not bool(d.get("x_vector_only_mode", False)))),
-                                        ref_text=d.get("ref_text", None),
-                                    )
-                                )
+                                items = voice_clone_prompt_items(payload["items"])
+                            if len(items) == 0:
+                                return None, "Empty voice items (音色为空)."
 
                             language = lang_map.get(lang_disp, "Auto")
                             kwargs = _gen_common_kwargs()
@@ -13,7 +13,33 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from .tokenizer_25hz.configuration_qwen3_tts_tokenizer_v1 import Qwen3TTSTokenizerV1Config
-from .tokenizer_25hz.modeling_qwen3_tts_tokenizer_v1 import Qwen3TTSTokenizerV1Model
-from .tokenizer_12hz.configuration_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2Config
-from .tokenizer_12hz.modeling_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2Model
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .tokenizer_25hz.configuration_qwen3_tts_tokenizer_v1 import Qwen3TTSTokenizerV1Config
+    from .tokenizer_25hz.modeling_qwen3_tts_tokenizer_v1 import Qwen3TTSTokenizerV1Model
+    from .tokenizer_12hz.configuration_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2Config
+    from .tokenizer_12hz.modeling_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2Model
+
+# The 25Hz (V1) tokenizer depends on sox, onnxruntime and torchaudio, so its modules are only
+# imported when one of its classes is first accessed, e.g. when a V1 tokenizer checkpoint is loaded.
+_LAZY_ATTRIBUTES = {
+    "Qwen3TTSTokenizerV1Config": ".tokenizer_25hz.configuration_qwen3_tts_tokenizer_v1",
+    "Qwen3TTSTokenizerV1Model": ".tokenizer_25hz.modeling_qwen3_tts_tokenizer_v1",
+    "Qwen3TTSTokenizerV2Config": ".tokenizer_12hz.configuration_qwen3_tts_tokenizer_v2",
+    "Qwen3TTSTokenizerV2Model": ".tokenizer_12hz.modeling_qwen3_tts_tokenizer_v2",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
\ No newline at end of file
@@ -27,7 +27,11 @@ from torch import nn
 from torch.nn import functional as F
 from transformers.activations import ACT2FN
 from transformers.cache_utils import Cache, DynamicCache
-from transformers.generation import GenerationMixin
+from transformers.generation import (GenerationMixin, LogitsProcessorList,
+                                     MinNewTokensLengthLogitsProcessor,
+                                     RepetitionPenaltyLogitsProcessor,
+                                     StoppingCriteria, StoppingCriteriaList,
+                                     SuppressTokensLogitsProcessor)
 from transformers.integrations import use_kernel_forward_from_hub
 from transformers.masking_utils import (create_causal_mask,
                                         create_sliding_window_causal_mask)
@@ -43,6 +47,7 @@ from transformers.processing_utils import Unpack
 from transformers.utils import can_return_tuple, logging
 from transformers.utils.hub import cached_file
 
+from ...inference.module_registry import shared_module_registry
 from ...inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
 from .configuration_qwen3_tts import (Qwen3TTSConfig,
                                       Qwen3TTSSpeakerEncoderConfig,
@@ -1653,6 +1658,7 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         subtalker_top_p=None,
         subtalker_top_k=None,
         subtalker_temperature=None,
+        frame_callback=None,
         **kwargs,
     ) -> CausalLMOutputWithPast:
         r"""
@@ -1660,6 +1666,8 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
             Labels for computing the masked language modeling loss. Indices should either be in `[0, ...,
             config.vocab_size]` or -100 (see `input_ids` docstring). Tokens with indices set to `-100` are ignored
             (masked), the loss is only computed for the tokens with labels in `[0, ..., config.vocab_size]`.
+        frame_callback (`Callable`, *optional*):
+            Called with the `(batch_size, num_code_groups)` codes of each frame as soon as they are complete.
         ```"""
         # Prefill
         if inputs_embeds is not None and inputs_embeds.shape[1] > 1:
@@ -1679,6 +1687,8 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
                 return_dict_in_generate=True,
             )
             codec_ids = torch.cat((input_ids, predictor_result.sequences), dim=-1)
+            if frame_callback is not None:
+                frame_callback(codec_ids)
             codec_hiddens = torch.cat(
                 [last_id_hidden]
                 + [self.code_predictor.get_input_embeddings()[i](predictor_result.sequences[..., i:i+1]) for i in range(self.config.num_code_groups - 1)],
@@ -1810,6 +1820,107 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         return model_kwargs
 
 
+class _CancellationCriteria(StoppingCriteria):
+    """
+    Stops the batch rows whose cancellation token (any object with an `is_set()` method, such as a
+    `threading.Event`) has been set. The other rows keep decoding; `generate` stops once every row is finished.
+    """
+
+    def __init__(self, cancel_tokens: list):
+        self.cancel_tokens = cancel_tokens
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        cancelled = [token is not None and token.is_set() for token in self.cancel_tokens]
+        return torch.tensor(cancelled, dtype=torch.bool, device=input_ids.device)
+
+
+class _SpeculativeTalkerState:
+    """
+    Decoding state of one talker (target or draft) during speculative decoding.
+
+    The state owns a KV cache holding the prefill prompt followed by the first `fed` frames. Frames are fed in
+    one forward pass each time `feed` is called, and `rewind` drops cached frames that were rejected. Only batch
+    size 1 without padding is supported, so rope positions are equal to cache positions.
+    """
+
+    def __init__(self, model: "Qwen3TTSForConditionalGeneration", trailing_text_hidden, tts_pad_embed):
+        self.model = model
+        self.talker = model.talker
+        self.trailing_text_hidden = trailing_text_hidden
+        self.tts_pad_embed = tts_pad_embed
+        self.past_key_values = DynamicCache()
+        self.prompt_length = 0
+        self.fed = 0
+        self.last_hidden = None
+        self.last_logits = None
+
+    def _forward(self, inputs_embeds):
+        start = self.prompt_length + self.fed
+        cache_position = torch.arange(start, start + inputs_embeds.shape[1], device=inputs_embeds.device)
+        position_ids = cache_position.view(1, 1, -1).expand(3, inputs_embeds.shape[0], -1)
+        outputs = self.talker.model(
+            inputs_embeds=inputs_embeds,
+            position_ids=position_ids,
+            past_key_values=self.past_key_values,
+            use_cache=True,
+            cache_position=cache_position,
+        )
+        hidden_states = outputs.last_hidden_state
+        logits = self.talker.codec_head(hidden_states).float()
+        self.last_hidden = hidden_states[:, -1:]
+        self.last_logits = logits[:, -1]
+        return hidden_states, logits
+
+    def prefill(self, inputs_embeds):
+        hidden_states, logits = self._forward(inputs_embeds)
+        self.prompt_length = inputs_embeds.shape[1]
+        return hidden_states, logits
+
+    def frame_embeds(self, frames: torch.Tensor, first_step: int) -> torch.Tensor:
+        """Input embeddings `[1, N, D]` for `N` consecutive frames starting at decoding step `first_step`."""
+        num_code_groups = self.talker.config.num_code_groups
+        codec_hiddens = torch.cat(
+            [self.talker.get_input_embeddings()(frames[:, :1])]
+            + [self.talker.code_predictor.get_input_embeddings()[i](frames[:, i + 1:i + 2])
+               for i in range(num_code_groups - 1)],
+            dim=1,
+        )
+        inputs_embeds = codec_hiddens.sum(1).unsqueeze(0)
+        steps = torch.arange(first_step, first_step + frames.shape[0], device=frames.device)
+        text_length = self.trailing_text_hidden.shape[1]
+        text_hidden = self.trailing_text_hidden[:, steps.clamp(max=text_length - 1)]
+        text_hidden = torch.where(
+            (steps < text_length).view(1, -1, 1), text_hidden, self.tts_pad_embed.expand_as(text_hidden)
+        )
+        return inputs_embeds + text_hidden
+
+    def feed(self, frames: torch.Tensor):
+        """Append `frames[self.fed:]` to the cache and return their hidden states and first-codebook logits."""
+        new_frames = frames[self.fed:]
+        hidden_states, logits = self._forward(self.frame_embeds(new_frames, self.fed))
+        self.fed = frames.shape[0]
+        return hidden_states, logits
+
+    def rewind(self, num_frames: int):
+        if num_frames < self.fed:
+            self.past_key_values.crop(self.prompt_length + num_frames)
+            self.fed = num_frames
+            self.last_hidden = None
+            self.last_logits = None
+
+    def predict_frames(self, past_hidden: torch.Tensor, first_codes: torch.Tensor, **subtalker_kwargs) -> torch.Tensor:
+        """Greedy residual codes for `N` frames at once, from `past_hidden` `[N, 1, D]` and `first_codes` `[N, 1]`."""
+        predictor_result = self.talker.code_predictor.generate(
+            inputs_embeds=torch.cat((past_hidden, self.talker.get_input_embeddings()(first_codes)), dim=1),
+            max_new_tokens=self.talker.config.num_code_groups - 1,
+            do_sample=False,
+            output_hidden_states=True,
+            return_dict_in_generate=True,
+            **subtalker_kwargs,
+        )
+        return torch.cat((first_codes, predictor_result.sequences), dim=-1)
+
+
 class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin):
     config_class = Qwen3TTSConfig
 
@@ -1872,6 +1983,8 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         requested_attn_implementation = kwargs.pop("attn_implementation", None)
         if requested_attn_implementation is None and config and config._attn_implementation:
             requested_attn_implementation = config._attn_implementation
+        # Share the speech tokenizer and byte-identical weights with other loaded variants
+        share_weights = kwargs.pop("share_weights", True)
 
         model = super().from_pretrained(
             pretrained_model_name_or_path,
@@ -1912,11 +2025,23 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         if speech_tokenizer_path is None:
             raise ValueError(f"""{pretrained_model_name_or_path}/{speech_tokenizer_path} not exists""")
         speech_tokenizer_dir = os.path.dirname(speech_tokenizer_path)
-        speech_tokenizer = Qwen3TTSTokenizer.from_pretrained(
-            speech_tokenizer_dir,
-            *model_args,
-            **kwargs,
-        )
+        if share_weights:
+            speech_tokenizer_key = (
+                shared_module_registry.fingerprint_directory(speech_tokenizer_dir),
+                repr(model_args),
+                repr(sorted(kwargs.items(), key=lambda item: item[0])),
+            )
+            speech_tokenizer = shared_module_registry.get_or_create(
+                speech_tokenizer_key,
+                lambda: Qwen3TTSTokenizer.from_pretrained(speech_tokenizer_dir, *model_args, **kwargs),
+            )
+            shared_module_registry.share_parameters(model)
+        else:
+            speech_tokenizer = Qwen3TTSTokenizer.from_pretrained(
+                speech_tokenizer_dir,
+                *model_args,
+                **kwargs,
+            )
         model.load_speech_tokenizer(speech_tokenizer)
 
         generate_config_path = cached_file(
@@ -1973,11 +2098,17 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         tts_pad_embed: torch.Tensor,
         tts_eos_embed: torch.Tensor,
         non_streaming_mode: bool,
+        ref_embed: Optional[torch.Tensor] = None,
     ):
         # text embed (ref id + text id + eos) 1 T1 D
-        text_embed = self.talker.text_projection(
-            self.talker.get_text_embeddings()(torch.cat([ref_id, text_id], 
-                                                            dim=-1)))
+        if ref_embed is None:
+            text_embed = self.talker.text_projection(
+                self.talker.get_text_embeddings()(torch.cat([ref_id, text_id], 
+                                                                dim=-1)))
+        else:
+            # text_projection is applied per token, so a precomputed ref embed can be concatenated as is
+            text_embed = torch.cat([ref_embed,
+                                    self.talker.text_projection(self.talker.get_text_embeddings()(text_id))], dim=1)
         text_embed = torch.cat([text_embed, tts_eos_embed], dim=1)
         # codec embed (codec bos + codec) 1 T2 D
         codec_embed = []
@@ -2018,53 +2149,25 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                 text_embed = torch.cat([text_embed] + [tts_pad_embed] * (codec_lens - text_lens), dim=1)
                 return text_embed + codec_embed, tts_pad_embed
 
-    @torch.no_grad()
-    def generate(
+    def _build_talker_inputs(
         self,
-        input_ids: Optional[list[torch.Tensor]] = None,
-        instruct_ids: Optional[list[torch.Tensor]] = None,
-        ref_ids: Optional[list[torch.Tensor]] = None,
-        voice_clone_prompt: list[dict] = None,
-        languages: list[str] = None,
-        speakers: list[str] = None,
-        non_streaming_mode = False,
-        max_new_tokens: int = 4096,
-        do_sample: bool = True,
-        top_k: int = 50,
-        top_p: float = 1.0,
-        temperature: float = 0.9,
-        subtalker_dosample: bool = True,
-        subtalker_top_k: int = 50,
-        subtalker_top_p: float = 1.0,
-        subtalker_temperature: float = 0.9,
-        eos_token_id: Optional[int] = None,
-        repetition_penalty: float = 1.05,
-        **kwargs,
+        input_ids: list[torch.Tensor],
+        instruct_ids: Optional[list[torch.Tensor]],
+        ref_ids: Optional[list[torch.Tensor]],
+        voice_clone_prompt: Optional[dict],
+        languages: list[str],
+        speakers: Optional[list[str]],
+        non_streaming_mode: bool,
+        instruct_embeds: Optional[list[torch.Tensor]] = None,
+        ref_embeds: Optional[list[torch.Tensor]] = None,
     ):
-        talker_kwargs = {
-            "max_new_tokens": max_new_tokens,
-            "min_new_tokens": 2,
-            "do_sample": do_sample,
-            "top_k": top_k,
-            "top_p": top_p,
-            "temperature": temperature,
-            "subtalker_dosample": subtalker_dosample, 
-            "subtalker_top_k": subtalker_top_k,
-            "subtalker_top_p": subtalker_top_p,
-            "subtalker_temperature": subtalker_temperature,
-            "eos_token_id": eos_token_id
-            if eos_token_id is not None
-            else self.config.talker_config.codec_eos_token_id,
-            "repetition_penalty": repetition_penalty,
-            "suppress_tokens": [
-                i
-                for i in range(self.config.talker_config.vocab_size - 1024, self.config.talker_config.vocab_size)
-                if i not in (self.config.talker_config.codec_eos_token_id,)
-            ],
-            "output_hidden_states": getattr(kwargs, "output_hidden_states", True),
-            "return_dict_in_generate": getattr(kwargs, "return_dict_in_generate", True)
-        }
-        
+        """
+        Build the left-padded talker prefill embeddings for a batch of requests.
+
+        Returns:
+            `(talker_input_embeds, talker_attention_mask, trailing_text_hiddens, tts_pad_embed)`, i.e. the
+            inputs expected by `Qwen3TTSTalkerForConditionalGeneration.generate`.
+        """
         talker_input_embeds = [[] for _ in range(len(input_ids))]
 
         voice_clone_spk_embeds = None
@@ -2075,7 +2178,9 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         # instruct text prompt generate
         if instruct_ids is not None:
             for index, instruct_id in enumerate(instruct_ids):
-                if instruct_id is not None:
+                if instruct_embeds is not None and instruct_embeds[index] is not None:
+                    talker_input_embeds[index].append(instruct_embeds[index])
+                elif instruct_id is not None:
                     talker_input_embeds[index].append(self.talker.text_projection(
                                                   self.talker.get_text_embeddings()(instruct_id)))
 
@@ -2193,6 +2298,7 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                     tts_pad_embed=tts_pad_embed,
                     tts_eos_embed=tts_eos_embed,
                     non_streaming_mode=non_streaming_mode,
+                    ref_embed=ref_embeds[index][:, 3:-2] if ref_embeds is not None and ref_embeds[index] is not None else None,
                 )
                 talker_input_embed = torch.cat([talker_input_embed, icl_input_embed], dim=1)
             else:
@@ -2268,6 +2374,291 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         padded_hiddens[padding_mask] = pad_embedding_vector
         trailing_text_hiddens = padded_hiddens
 
+
+        return talker_input_embeds, talker_attention_mask, trailing_text_hiddens, tts_pad_embed
+
+    def _check_draft_model(self, draft_model: "Qwen3TTSForConditionalGeneration"):
+        target_config, draft_config = self.config.talker_config, draft_model.config.talker_config
+        for name in ("vocab_size", "num_code_groups", "text_vocab_size", "codec_eos_token_id"):
+            if getattr(target_config, name, None) != getattr(draft_config, name, None):
+                raise ValueError(
+                    f"Draft model is not compatible: talker `{name}` is {getattr(draft_config, name, None)}, "
+                    f"expected {getattr(target_config, name, None)}"
+                )
+
+    def _speculative_generate(
+        self,
+        draft_model: "Qwen3TTSForConditionalGeneration",
+        target_inputs: tuple,
+        draft_inputs: tuple,
+        num_draft_frames: int,
+        max_new_tokens: int,
+        eos_token_id: int,
+        repetition_penalty: float,
+        suppress_tokens: list[int],
+        subtalker_kwargs: dict,
+        cancel_token=None,
+    ):
+        """
+        Greedy speculative decoding of a single sequence.
+
+        Each round the draft talker proposes up to `num_draft_frames` frames autoregressively. The target talker
+        scores all of them in a single forward pass and predicts the residual codes of the candidate frames in one
+        batched code-predictor call. The longest prefix of frames on which both talkers agree is kept, followed by
+        the target's own frame at the first disagreement, so the output is the target's greedy decode.
+        `cancel_token` is checked before every round.
+
+        Returns:
+            `(codes, hidden_states, stats)` with `codes` of shape `[num_frames, num_code_groups]`,
+            `hidden_states` of shape `[num_frames, hidden_size]` and acceptance statistics in `stats`.
+        """
+        talker_input_embeds, trailing_text_hidden, tts_pad_embed = target_inputs
+        device = talker_input_embeds.device
+        logits_processor = LogitsProcessorList()
+        if repetition_penalty is not None and repetition_penalty != 1.0:
+            logits_processor.append(RepetitionPenaltyLogitsProcessor(penalty=repetition_penalty))
+        logits_processor.append(MinNewTokensLengthLogitsProcessor(0, 2, eos_token_id, device=device))
+        logits_processor.append(SuppressTokensLogitsProcessor(suppress_tokens, device=device))
+
+        def select(logits, history):
+            return int(logits_processor(history, logits.view(1, -1).clone()).argmax(dim=-1))
+
+        target = _SpeculativeTalkerState(self, trailing_text_hidden, tts_pad_embed)
+        draft = _SpeculativeTalkerState(draft_model, *draft_inputs[1:])
+        target.prefill(talker_input_embeds)
+        draft.prefill(draft_inputs[0])
+
+        num_code_groups = self.config.talker_config.num_code_groups
+        frames = torch.empty((0, num_code_groups), dtype=torch.long, device=device)
+        history = torch.empty((1, 0), dtype=torch.long, device=device)
+        hidden_states = []
+        max_frames = max(max_new_tokens - 1, 0)
+        proposed = accepted = rounds = 0
+        finished = False
+
+        while not finished and frames.shape[0] < max_frames:
+            if cancel_token is not None and cancel_token.is_set():
+                break
+            rounds += 1
+            num_frames = frames.shape[0]
+
+            # draft: propose up to k frames
+            draft_frames = frames
+            draft_history = history
+            for _ in range(min(num_draft_frames, max_frames - num_frames)):
+                if draft.fed < draft_frames.shape[0]:
+                    draft.feed(draft_frames)
+                code = select(draft.last_logits, draft_history)
+                if code == eos_token_id:
+                    break
+                first_code = torch.tensor([[code]], dtype=torch.long, device=device)
+                frame = draft.predict_frames(draft.last_hidden, first_code, **subtalker_kwargs)
+                draft_frames = torch.cat([draft_frames, frame], dim=0)
+                draft_history = torch.cat([draft_history, first_code], dim=1)
+            proposals = draft_frames[num_frames:]
+            proposed += proposals.shape[0]
+
+            # target: score pending and proposed frames in one forward
+            # prev_hidden[:, i] is the target hidden state after frame `base + i`
+            prev_hidden, prev_logits = [], []
+            base = target.fed
+            if target.last_hidden is not None:
+                prev_hidden.append(target.last_hidden)
+                prev_logits.append(target.last_logits.unsqueeze(1))
+                base -= 1
+            if target.fed < draft_frames.shape[0]:
+                new_hidden, new_logits = target.feed(draft_frames)
+                prev_hidden.append(new_hidden)
+                prev_logits.append(new_logits)
+            prev_hidden = torch.cat(prev_hidden, dim=1)
+            prev_logits = torch.cat(prev_logits, dim=1)
+            offset = num_frames - 1 - base
+
+            first_codes = []
+            candidate_history = history
+            for j in range(proposals.shape[0] + 1):
+                if num_frames + j >= max_frames:
+                    break
+                code = select(prev_logits[:, offset + j], candidate_history)
+                if code == eos_token_id:
+                    finished = True
+                    break
+                first_codes.append(code)
+                candidate_history = torch.cat(
+                    [candidate_history, torch.tensor([[code]], dtype=torch.long, device=device)], dim=1
+                )
+                if j >= proposals.shape[0] or code != int(proposals[j, 0]):
+                    break
+
+            num_matched = 0
+            if first_codes:
+                candidates = self._speculative_predict_frames(
+                    target, prev_hidden[0, offset:offset + len(first_codes)], first_codes, subtalker_kwargs
+                )
+                for j in range(candidates.shape[0]):
+                    frames = torch.cat([frames, candidates[j:j + 1]], dim=0)
+                    history = torch.cat([history, candidates[j:j + 1, :1]], dim=1)
+                    hidden_states.append(prev_hidden[0, offset + j])
+                    if j < proposals.shape[0] and torch.equal(candidates[j], proposals[j]):
+                        num_matched += 1
+                    else:
+                        # frames after a disagreement were conditioned on a wrong frame
+                        finished = False
+                        break
+            accepted += num_matched
+
+            target.rewind(num_frames + num_matched)
+            draft.rewind(num_frames + num_matched)
+
+        if hidden_states:
+            hidden_states = torch.stack(hidden_states, dim=0)
+        else:
+            hidden_states = torch.empty((0, self.config.talker_config.hidden_size), device=device)
+        stats = {
+            "rounds": rounds,
+            "proposed_frames": proposed,
+            "accepted_frames": accepted,
+            "acceptance_rate": accepted / proposed if proposed else 0.0,
+        }
+        return frames, hidden_states, stats
+
+    def _speculative_predict_frames(self, target, past_hidden, first_codes, subtalker_kwargs):
+        first_codes = torch.tensor(first_codes, dtype=torch.long, device=past_hidden.device).view(-1, 1)
+        return target.predict_frames(past_hidden.unsqueeze(1), first_codes, **subtalker_kwargs)
+
+    @torch.no_grad()
+    def generate(
+        self,
+        input_ids: Optional[list[torch.Tensor]] = None,
+        instruct_ids: Optional[list[torch.Tensor]] = None,
+        ref_ids: Optional[list[torch.Tensor]] = None,
+        voice_clone_prompt: list[dict] = None,
+        languages: list[str] = None,
+        speakers: list[str] = None,
+        non_streaming_mode = False,
+        max_new_tokens: int = 4096,
+        do_sample: bool = True,
+        top_k: int = 50,
+        top_p: float = 1.0,
+        temperature: float = 0.9,
+        subtalker_dosample: bool = True,
+        subtalker_top_k: int = 50,
+        subtalker_top_p: float = 1.0,
+        subtalker_temperature: float = 0.9,
+        eos_token_id: Optional[int] = None,
+        repetition_penalty: float = 1.05,
+        instruct_embeds: Optional[list[torch.Tensor]] = None,
+        ref_embeds: Optional[list[torch.Tensor]] = None,
+        draft_model: Optional["Qwen3TTSForConditionalGeneration"] = None,
+        num_draft_frames: int = 4,
+        draft_voice_clone_prompt: Optional[dict] = None,
+        frame_callback: Optional[Callable[[Optional[torch.Tensor]], None]] = None,
+        cancel_tokens: Optional[list] = None,
+        **kwargs,
+    ):
+        """
+        `instruct_embeds` / `ref_embeds` optionally carry `text_projection(text_embedding(ids))` already computed
+        for the matching `instruct_ids` / `ref_ids` entries, so callers can reuse them across requests.
+
+        When `draft_model` is given (a smaller, config-compatible checkpoint such as the 0.6B variant), greedy
+        decoding of a single sequence uses speculative decoding: the draft proposes `num_draft_frames` frames
+        per round and this model verifies them in one forward pass. `draft_voice_clone_prompt` must be passed
+        for voice cloning when the draft uses a different speaker embedding size. Acceptance statistics of the
+        last call are stored in `self.speculative_stats`.
+
+        `frame_callback` receives the `(batch_size, num_code_groups)` codes of every frame while the talker is still
+        decoding, then `None` once decoding has finished. Speculative decoding reports its frames after the fact.
+
+        `cancel_tokens` holds one cancellation token per sample (an object with an `is_set()` method such as a
+        `threading.Event`, or `None`). It is checked at every decoding step: a cancelled sample stops decoding while
+        the rest of the batch continues unaffected, and `None` is returned in place of its codes and hidden states.
+        """
+        talker_kwargs = {
+            "max_new_tokens": max_new_tokens,
+            "min_new_tokens": 2,
+            "do_sample": do_sample,
+            "top_k": top_k,
+            "top_p": top_p,
+            "temperature": temperature,
+            "subtalker_dosample": subtalker_dosample, 
+            "subtalker_top_k": subtalker_top_k,
+            "subtalker_top_p": subtalker_top_p,
+            "subtalker_temperature": subtalker_temperature,
+            "eos_token_id": eos_token_id
+            if eos_token_id is not None
+            else self.config.talker_config.codec_eos_token_id,
+            "repetition_penalty": repetition_penalty,
+            "suppress_tokens": [
+                i
+                for i in range(self.config.talker_config.vocab_size - 1024, self.config.talker_config.vocab_size)
+                if i not in (self.config.talker_config.codec_eos_token_id,)
+            ],
+            "output_hidden_states": getattr(kwargs, "output_hidden_states", True),
+            "return_dict_in_generate": getattr(kwargs, "return_dict_in_generate", True)
+        }
+        if frame_callback is not None:
+            talker_kwargs["frame_callback"] = frame_callback
+        if cancel_tokens is not None:
+            if len(cancel_tokens) != len(input_ids):
+                raise ValueError(f"Batch size mismatch: cancel_tokens={len(cancel_tokens)}, input_ids={len(input_ids)}")
+            talker_kwargs["stopping_criteria"] = StoppingCriteriaList([_CancellationCriteria(cancel_tokens)])
+        
+        talker_input_embeds, talker_attention_mask, trailing_text_hiddens, tts_pad_embed = self._build_talker_inputs(
+            input_ids=input_ids,
+            instruct_ids=instruct_ids,
+            ref_ids=ref_ids,
+            voice_clone_prompt=voice_clone_prompt,
+            languages=languages,
+            speakers=speakers,
+            non_streaming_mode=non_streaming_mode,
+            instruct_embeds=instruct_embeds,
+            ref_embeds=ref_embeds,
+        )
+
+        if draft_model is not None:
+            if do_sample or subtalker_dosample or len(input_ids) != 1:
+                logger.warning_once(
+                    "Speculative decoding only supports greedy decoding (`do_sample=False`, "
+                    "`subtalker_dosample=False`) of a single sequence, falling back to standard decoding."
+                )
+            else:
+                self._check_draft_model(draft_model)
+                cancel_token = cancel_tokens[0] if cancel_tokens is not None else None
+                draft_input_embeds, _, draft_trailing_text_hiddens, draft_tts_pad_embed = draft_model._build_talker_inputs(
+                    input_ids=input_ids,
+                    instruct_ids=instruct_ids,
+                    ref_ids=ref_ids,
+                    voice_clone_prompt=draft_voice_clone_prompt if draft_voice_clone_prompt is not None else voice_clone_prompt,
+                    languages=languages,
+                    speakers=speakers,
+                    non_streaming_mode=non_streaming_mode,
+                )
+                talker_codes, talker_hidden_states, self.speculative_stats = self._speculative_generate(
+                    draft_model=draft_model,
+                    target_inputs=(talker_input_embeds, trailing_text_hiddens, tts_pad_embed),
+                    draft_inputs=(draft_input_embeds, draft_trailing_text_hiddens, draft_tts_pad_embed),
+                    num_draft_frames=num_draft_frames,
+                    max_new_tokens=max_new_tokens,
+                    eos_token_id=talker_kwargs["eos_token_id"],
+                    repetition_penalty=repetition_penalty,
+                    suppress_tokens=talker_kwargs["suppress_tokens"],
+                    subtalker_kwargs={
+                        "top_k": subtalker_top_k,
+                        "top_p": subtalker_top_p,
+                        "temperature": subtalker_temperature,
+                    },
+                    cancel_token=cancel_token,
+                )
+                if cancel_token is not None and cancel_token.is_set():
+                    if frame_callback is not None:
+                        frame_callback(None)
+                    return [None], [None]
+                if frame_callback is not None:
+                    for frame in talker_codes:
+                        frame_callback(frame.unsqueeze(0))
+                    frame_callback(None)
+                return [talker_codes], [talker_hidden_states]
+
         # forward
         talker_result = self.talker.generate(
             inputs_embeds=talker_input_embeds,
@@ -2276,6 +2667,13 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
             tts_pad_embed=tts_pad_embed,
             **talker_kwargs,
         )
+        if frame_callback is not None:
+            frame_callback(None)
+
+        # Rows stopped by cancellation end without an eos code, so their output is incomplete
+        cancelled = [token is not None and token.is_set() for token in cancel_tokens or ()]
+        if cancelled and all(cancelled):
+            return [None] * len(cancelled), [None] * len(cancelled)
 
         talker_codes = torch.stack([hid[-1] for hid in talker_result.hidden_states if hid[-1] is not None], dim=1)
         talker_hidden_states = torch.cat([hid[0][-1][:, -1:] for hid in talker_result.hidden_states], dim=1)[:, :-1]
@@ -2288,6 +2686,11 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         
         talker_codes_list = [talker_codes[i, :length, ] for i, length in enumerate(effective_lengths)]
         talker_hidden_states_list = [talker_hidden_states[i, :length, :] for i, length in enumerate(effective_lengths)]
+
+        for i, is_cancelled in enumerate(cancelled):
+            if is_cancelled:
+                talker_codes_list[i] = None
+                talker_hidden_states_list[i] = None
         
         return talker_codes_list, talker_hidden_states_list
 
@@ -16,7 +16,7 @@
 
 import math
 from dataclasses import dataclass
-from typing import Callable, Optional, Union, List
+from typing import Callable, Optional, Tuple, Union, List
 
 import numpy as np
 import torch
@@ -776,6 +776,20 @@ class ResidualVectorQuantizer(nn.Module):
         quantized = self.output_proj(quantized)
         return quantized
 
+    def fused_codebook(self) -> torch.Tensor:
+        """Returns the `(n_q * bins, output_dimension)` table of every layer's codebook with `project_out` and
+        `output_proj` already applied, so that row `q * bins + code` is the contribution of `code` in layer `q`."""
+        tables = []
+        for layer in self.vq.layers:
+            codebook = layer._codebook
+            embedding = codebook.embedding_sum / codebook.cluster_usage.clamp(min=codebook.epsilon)[:, None]
+            tables.append(layer.project_out(embedding))
+        table = torch.cat(tables, dim=0)
+        if isinstance(self.output_proj, nn.Conv1d):
+            # 1x1 conv without bias is linear, so it distributes over the residual sum.
+            table = F.linear(table, self.output_proj.weight.squeeze(-1))
+        return table
+
 
 class SplitResidualVectorQuantizer(nn.Module):
     """Residual Vector Quantizer with separate projections for the first quantizer and the rest.
@@ -811,15 +825,51 @@ class SplitResidualVectorQuantizer(nn.Module):
             q_dropout=q_dropout,
             **kwargs,
         )
+        # Non-persistent buffers, so the derived table follows the module when it is moved and never enters
+        # the state dict.
+        self.register_buffer("_fused_codebook", None, persistent=False)
+        self.register_buffer("_fused_offsets", None, persistent=False)
+        self._fused_key = None
+
+    def _fused_table(self) -> Tuple[torch.Tensor, torch.Tensor]:
+        # Rebuilt whenever the weights move, change dtype or are modified in place (e.g. `load_state_dict`).
+        params = list(self.parameters())
+        key = (params[0].device, params[0].dtype, tuple(p._version for p in params))
+        if self._fused_codebook is None or self._fused_key != key:
+            with torch.no_grad():
+                self._fused_codebook = torch.cat(
+                    [self.rvq_first.fused_codebook(), self.rvq_rest.fused_codebook()], dim=0
+                )
+            # Row offset of each layer's codebook in the table; the two quantizers may use different bins.
+            sizes = [layer.codebook_size for rvq in (self.rvq_first, self.rvq_rest) for layer in rvq.vq.layers]
+            self._fused_offsets = torch.tensor([0] + sizes[:-1], device=params[0].device).cumsum(0)
+            self._fused_key = key
+        return self._fused_codebook, self._fused_offsets
 
     def decode(self, codes: torch.Tensor) -> torch.Tensor:
         """Decode the given codes to the quantized representation."""
         # codes is [B, K, T], with T frames, K nb of codebooks.
+        if not self.training:
+            return self.fused_decode(codes)
         quantized = self.rvq_first.decode(codes[:, : self.n_q_semantic])
         if codes.shape[1] > self.n_q_semantic:
             quantized += self.rvq_rest.decode(codes[:, self.n_q_semantic :])
         return quantized
 
+    def fused_decode(self, codes: torch.Tensor) -> torch.Tensor:
+        """Decode all codebooks with a single gather over the concatenated, pre-projected codebooks.
+
+        Equivalent to the per-layer loop in `decode`, but issues one embedding lookup and one reduction
+        instead of one lookup, projection and add per quantizer layer.
+        """
+        table, offsets = self._fused_table()
+        batch_size, num_layers, num_frames = codes.shape
+        offsets = offsets[:num_layers].to(codes.device, codes.dtype)
+        # One bag of `num_layers` rows per frame; `embedding_bag` reduces without materializing each layer.
+        indices = (codes + offsets[None, :, None]).transpose(1, 2).reshape(batch_size * num_frames, num_layers)
+        quantized = F.embedding_bag(indices, table, mode="sum")
+        return quantized.view(batch_size, num_frames, -1).transpose(1, 2)
+
 
 class Qwen3TTSTokenizerV2Decoder(Qwen3TTSTokenizerV2DecoderPreTrainedModel):
     def __init__(self, config: Qwen3TTSTokenizerV2DecoderConfig):
@@ -384,6 +384,9 @@ class DistributedResidualVectorQuantization(nn.Module):
 
         self.quantize_dropout = quantize_dropout
         self.rand_num_quant = rand_num_quant
+        # Non-persistent, so the derived table follows the module when it is moved and stays out of the state dict
+        self.register_buffer("_fused_codebook", None, persistent=False)
+        self._fused_key = None
 
     def forward(self, x, n_q: tp.Optional[int] = None):
         quantized_out = torch.zeros_like(x)
@@ -460,7 +463,34 @@ class DistributedResidualVectorQuantization(nn.Module):
         out_indices = torch.stack(all_indices)
         return out_indices
 
+    def fused_codebook(self) -> torch.Tensor:
+        """Concatenate all codebooks, with `project_out` pre-applied, into one (n_q * codebook_size, dim) table.
+        Row `i * codebook_size + j` is the output of `self.layers[i].decode` for index `j`.
+        """
+        # Keyed on the buffer/parameter versions so EMA updates or a reloaded state dict rebuild the table.
+        tensors = [self.embed] + list(self.parameters())
+        key = (self.embed.device, self.embed.dtype, tuple(t._version for t in tensors))
+        if self._fused_codebook is None or self._fused_key != key:
+            with torch.no_grad():
+                self._fused_codebook = torch.cat(
+                    [layer.project_out(self.embed[i]) for i, layer in enumerate(self.layers)], dim=0
+                )
+            self._fused_key = key
+        return self._fused_codebook
+
+    def fused_decode(self, q_indices: torch.Tensor) -> torch.Tensor:
+        """Single-gather equivalent of the per-layer `decode` loop."""
+        table = self.fused_codebook()
+        n_q, codebook_size = q_indices.shape[0], self.embed.shape[1]
+        offsets = torch.arange(n_q, device=q_indices.device, dtype=q_indices.dtype) * codebook_size
+        offsets = offsets.view(n_q, *([1] * (q_indices.dim() - 1)))
+        bags = rearrange(q_indices + offsets, "q ... -> (...) q")
+        quantized = F.embedding_bag(bags, table, mode="sum")
+        return quantized.view(*q_indices.shape[1:], -1)
+
     def decode(self, q_indices: torch.Tensor) -> torch.Tensor:
+        if not self.training:
+            return self.fused_decode(q_indices)
         quantized_out = torch.tensor(0.0, device=q_indices.device)
         for i, indices in enumerate(q_indices):
             layer = self.layers[i]
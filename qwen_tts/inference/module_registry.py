@@ -0,0 +1,177 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+import torch
+from torch import nn
+
+_HASH_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+class SharedModuleRegistry:
+    """
+    Process-wide registry that lets co-loaded Qwen3-TTS variants share byte-identical weights.
+
+    Two mechanisms are provided:
+
+    - `get_or_create(key, factory)` shares whole objects (e.g. the speech tokenizer) keyed by a content hash of
+      the files they are loaded from, see `fingerprint_directory`.
+    - `share_parameters(module)` replaces large parameters of a freshly loaded model with an already resident
+      parameter holding exactly the same bytes on the same device, so identical submodules (text embeddings,
+      speaker encoder, ...) are stored once.
+
+    Entries are held through weak references: once every model using a shared object or tensor is released,
+    the memory is freed as usual. Shared parameters are the same `nn.Parameter` objects, so a model holding
+    them must not be moved to another device or dtype on its own.
+    """
+
+    def __init__(self, min_numel: int = 1 << 20):
+        self.min_numel = min_numel
+        self._lock = threading.Lock()
+        self._objects: "weakref.WeakValueDictionary[Hashable, Any]" = weakref.WeakValueDictionary()
+        self._parameters: Dict[Tuple, List[weakref.ref]] = {}
+        self._file_hashes: Dict[Tuple[str, int, int], str] = {}
+        self.object_hits = 0
+        self.shared_parameters = 0
+        self.shared_bytes = 0
+
+    def fingerprint_file(self, path: str) -> str:
+        """
+        Content hash of one file.
+
+        Files in the Hugging Face cache are symlinks to blobs named after their hash, which is used directly.
+        Other files are hashed once per (path, size, mtime).
+        """
+        real_path = os.path.realpath(path)
+        parent = os.path.basename(os.path.dirname(real_path))
+        if parent == "blobs":
+            return os.path.basename(real_path)
+
+        stat = os.stat(real_path)
+        cache_key = (real_path, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._file_hashes.get(cache_key)
+        if digest is not None:
+            return digest
+
+        sha = hashlib.sha256()
+        with open(real_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        with self._lock:
+            self._file_hashes[cache_key] = digest
+        return digest
+
+    def fingerprint_directory(self, directory: str) -> str:
+        """Content hash of all files below `directory`, independent of its location on disk."""
+        sha = hashlib.sha256()
+        for root, dirs, files in os.walk(directory, followlinks=True):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                sha.update(os.path.relpath(path, directory).encode("utf-8"))
+                sha.update(self.fingerprint_file(path).encode("utf-8"))
+        return sha.hexdigest()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the live object registered under `key`, or build it with `factory` and register it.
+
+        The lock is not held while `factory` runs, so two concurrent first loads of the same key may both load;
+        the first one to finish is kept and returned to both callers.
+        """
+        with self._lock:
+            obj = self._objects.get(key)
+            if obj is not None:
+                self.object_hits += 1
+                return obj
+        obj = factory()
+        with self._lock:
+            existing = self._objects.get(key)
+            if existing is not None:
+                self.object_hits += 1
+                return existing
+            self._objects[key] = obj
+        return obj
+
+    @staticmethod
+    def _parameter_key(param: torch.Tensor) -> Tuple:
+        # Cheap on-device fingerprint; candidates are confirmed with `torch.equal` before sharing.
+        data = param.detach()
+        summary = data.float().sum().item(), data.float().abs().sum().item()
+        return (str(data.device), data.dtype, tuple(data.shape), summary)
+
+    @torch.no_grad()
+    def share_parameters(self, module: nn.Module) -> int:
+        """
+        Point parameters of `module` at byte-identical parameters already registered by other models.
+
+        Only parameters with at least `min_numel` elements are considered. Parameters that have no twin yet are
+        registered for later models.
+
+        Returns:
+            int: Number of bytes freed by sharing.
+        """
+        replacements: Dict[int, nn.Parameter] = {}
+        saved = 0
+        for param in module.parameters():
+            if id(param) in replacements or param.numel() < self.min_numel:
+                continue
+            key = self._parameter_key(param)
+            with self._lock:
+                refs = self._parameters.setdefault(key, [])
+                refs[:] = [ref for ref in refs if ref() is not None]
+                candidates = [ref() for ref in refs]
+            match = next(
+                (c for c in candidates if c is not None and c is not param and torch.equal(c, param)),
+                None,
+            )
+            if match is None:
+                with self._lock:
+                    self._parameters[key].append(weakref.ref(param))
+                continue
+            replacements[id(param)] = match
+            saved += param.numel() * param.element_size()
+
+        if not replacements:
+            return 0
+
+        for submodule in module.modules():
+            for name, param in list(submodule._parameters.items()):
+                if param is not None and id(param) in replacements:
+                    submodule._parameters[name] = replacements[id(param)]
+
+        with self._lock:
+            self.shared_parameters += len(replacements)
+            self.shared_bytes += saved
+        return saved
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "shared_objects": len(self._objects),
+                "object_hits": self.object_hits,
+                "shared_parameters": self.shared_parameters,
+                "shared_bytes": self.shared_bytes,
+            }
+
+
+shared_module_registry = SharedModuleRegistry()
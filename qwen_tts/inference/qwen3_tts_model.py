@@ -15,9 +15,14 @@
 # limitations under the License.
 import base64
 import io
+import json
+import os
+import queue
+import threading
 import urllib.request
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import librosa
@@ -51,6 +56,176 @@ class VoiceClonePromptItem:
     ref_text: Optional[str] = None
 
 
+VOICE_CLONE_PROMPT_FORMAT = "qwen3-tts-voice-clone-prompt"
+VOICE_CLONE_PROMPT_VERSION = 1
+
+_SAFETENSORS_DTYPES = {
+    "F64": torch.float64, "F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16,
+    "I64": torch.int64, "I32": torch.int32, "I16": torch.int16, "I8": torch.int8,
+    "U8": torch.uint8, "BOOL": torch.bool,
+}
+
+
+def save_voice_clone_prompt(items: Union[VoiceClonePromptItem, List[VoiceClonePromptItem]], path: str) -> None:
+    """
+    Write voice clone prompt items to a safetensors file: the `ref_code` and `ref_spk_embedding` tensors of
+    each item, with `ref_text` and the mode flags in the header. Nothing is pickled, so loading runs no code.
+    """
+    from safetensors.torch import save_file
+
+    if isinstance(items, VoiceClonePromptItem):
+        items = [items]
+    tensors = {}
+    entries = []
+    for i, item in enumerate(items):
+        if item.ref_code is not None:
+            tensors[f"{i}.ref_code"] = item.ref_code.detach().cpu().contiguous()
+        tensors[f"{i}.ref_spk_embedding"] = item.ref_spk_embedding.detach().cpu().contiguous()
+        entries.append({
+            "ref_text": item.ref_text,
+            "x_vector_only_mode": bool(item.x_vector_only_mode),
+            "icl_mode": bool(item.icl_mode),
+        })
+
+    tmp_path = f"{path}.tmp"
+    save_file(tensors, tmp_path, metadata={
+        "format": VOICE_CLONE_PROMPT_FORMAT,
+        "version": str(VOICE_CLONE_PROMPT_VERSION),
+        "items": json.dumps(entries, ensure_ascii=False),
+    })
+    os.replace(tmp_path, path)
+
+
+def load_voice_clone_prompt(path: str, device: Optional[Union[str, torch.device]] = None) -> List[VoiceClonePromptItem]:
+    """
+    Read a file written by `save_voice_clone_prompt`. The tensors are views of a private memory map of the file,
+    so nothing is read or copied until they are used, written to or moved to `device`.
+    """
+    path = str(path)
+    with open(path, "rb") as f:
+        header_size = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_size))
+    metadata = header.pop("__metadata__", None) or {}
+    if metadata.get("format") != VOICE_CLONE_PROMPT_FORMAT:
+        raise ValueError(f"{path} is not a voice clone prompt file")
+    if int(metadata.get("version", 0)) > VOICE_CLONE_PROMPT_VERSION:
+        raise ValueError(f"{path} uses voice clone prompt format version {metadata['version']}, which is newer than supported")
+
+    data_start = 8 + header_size
+    aligned = all(
+        (data_start + info["data_offsets"][0]) % torch.empty(0, dtype=_SAFETENSORS_DTYPES[info["dtype"]]).element_size() == 0
+        for info in header.values()
+    )
+    if aligned:
+        storage = torch.UntypedStorage.from_file(path, shared=False, nbytes=os.path.getsize(path))
+
+        def get_tensor(name):
+            info = header[name]
+            tensor = torch.empty(0, dtype=_SAFETENSORS_DTYPES[info["dtype"]])
+            offset = (data_start + info["data_offsets"][0]) // tensor.element_size()
+            return tensor.set_(storage, offset, info["shape"])
+    else:
+        from safetensors.torch import load_file
+        tensors = load_file(path)
+        get_tensor = tensors.__getitem__
+
+    items = []
+    for i, entry in enumerate(json.loads(metadata["items"])):
+        ref_code = get_tensor(f"{i}.ref_code") if f"{i}.ref_code" in header else None
+        ref_spk_embedding = get_tensor(f"{i}.ref_spk_embedding")
+        if device is not None:
+            ref_code = ref_code.to(device) if ref_code is not None else None
+            ref_spk_embedding = ref_spk_embedding.to(device)
+        items.append(VoiceClonePromptItem(
+            ref_code=ref_code,
+            ref_spk_embedding=ref_spk_embedding,
+            x_vector_only_mode=entry["x_vector_only_mode"],
+            icl_mode=entry["icl_mode"],
+            ref_text=entry["ref_text"],
+        ))
+    return items
+
+
+def voice_clone_prompt_items(prompt: Any) -> List[VoiceClonePromptItem]:
+    """
+    Convert the voice clone prompt layouts of older saved files to a list of `VoiceClonePromptItem`: items or
+    `asdict` items (also under an "items" key), the `voice_clone_prompt` dict of lists, or a bare speaker
+    embedding as saved for x-vector-only prompts.
+    """
+    def as_tensor(value):
+        return value if value is None or torch.is_tensor(value) else torch.as_tensor(np.asarray(value))
+
+    def from_fields(fields: Dict[str, Any]) -> VoiceClonePromptItem:
+        if fields.get("ref_spk_embedding") is None:
+            raise ValueError("Voice clone prompt item is missing ref_spk_embedding")
+        x_vector_only_mode = bool(fields.get("x_vector_only_mode", False))
+        return VoiceClonePromptItem(
+            ref_code=as_tensor(fields.get("ref_code")),
+            ref_spk_embedding=as_tensor(fields["ref_spk_embedding"]),
+            x_vector_only_mode=x_vector_only_mode,
+            icl_mode=bool(fields.get("icl_mode", not x_vector_only_mode)),
+            ref_text=fields.get("ref_text"),
+        )
+
+    if isinstance(prompt, VoiceClonePromptItem):
+        return [prompt]
+    if torch.is_tensor(prompt) or isinstance(prompt, np.ndarray):
+        return [from_fields({"ref_spk_embedding": prompt, "x_vector_only_mode": True})]
+    if isinstance(prompt, dict):
+        if "items" in prompt:
+            return voice_clone_prompt_items(prompt["items"])
+        if isinstance(prompt.get("ref_spk_embedding"), (list, tuple)):
+            count = len(prompt["ref_spk_embedding"])
+            return [
+                from_fields({key: value[i] for key, value in prompt.items() if isinstance(value, (list, tuple))})
+                for i in range(count)
+            ]
+        return [from_fields(prompt)]
+    if isinstance(prompt, (list, tuple)):
+        return [
+            item if isinstance(item, VoiceClonePromptItem) else voice_clone_prompt_items(item)[0]
+            for item in prompt
+        ]
+    raise ValueError(f"Unsupported voice clone prompt type: {type(prompt).__name__}")
+
+
+class _TextPromptCache:
+    """
+    Bounded LRU keyed by the exact role-wrapped prompt string (see `_build_instruct_text` / `_build_ref_text`).
+
+    Each entry holds the tokenized ids and, once computed, the projected text embedding
+    `text_projection(text_embedding(ids))`, so repeated instructs / reference texts skip both steps.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, torch.Tensor]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, torch.Tensor]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: Dict[str, torch.Tensor]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class Qwen3TTSModel:
     """
     A HuggingFace-style wrapper for Qwen3 TTS models (CustomVoice/VoiceDesign/Base) that provides:
@@ -59,6 +234,7 @@ class Qwen3TTSModel:
           * CustomVoice: generate_custom_voice()
           * VoiceDesign: generate_voice_design()
           * Base: generate_voice_clone() + create_voice_clone_prompt()
+          * any of the above, chunk by chunk while decoding: generate_stream()
       - consistent output: (wavs: List[np.ndarray], sample_rate: int)
 
     Notes:
@@ -67,10 +243,17 @@ class Qwen3TTSModel:
           model.get_supported_languages(), model.get_supported_speakers()
     """
 
-    def __init__(self, model: Qwen3TTSForConditionalGeneration, processor, generate_defaults: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        model: Qwen3TTSForConditionalGeneration,
+        processor,
+        generate_defaults: Optional[Dict[str, Any]] = None,
+        text_cache_size: int = 256,
+    ):
         self.model = model
         self.processor = processor
         self.generate_defaults = generate_defaults or {}
+        self._text_prompt_cache = _TextPromptCache(text_cache_size)
 
         self.device = getattr(model, "device", None)
         if self.device is None:
@@ -100,6 +283,7 @@ class Qwen3TTSModel:
             **kwargs:
                 Forwarded as-is into `AutoModel.from_pretrained(...)`.
                 Typical examples: device_map="cuda:0", dtype=torch.bfloat16, attn_implementation="flash_attention_2".
+                `text_cache_size` is consumed here and bounds the instruct / ref-text prompt cache (0 disables it).
 
         Returns:
             Qwen3TTSModel:
@@ -109,6 +293,7 @@ class Qwen3TTSModel:
         AutoModel.register(Qwen3TTSConfig, Qwen3TTSForConditionalGeneration)
         AutoProcessor.register(Qwen3TTSConfig, Qwen3TTSProcessor)
 
+        text_cache_size = kwargs.pop("text_cache_size", 256)
         model = AutoModel.from_pretrained(pretrained_model_name_or_path, **kwargs)
         if not isinstance(model, Qwen3TTSForConditionalGeneration):
             raise TypeError(
@@ -118,7 +303,7 @@ class Qwen3TTSModel:
         processor = AutoProcessor.from_pretrained(pretrained_model_name_or_path, fix_mistral_regex=True,)
 
         generate_defaults = model.generate_config
-        return cls(model=model, processor=processor, generate_defaults=generate_defaults)
+        return cls(model=model, processor=processor, generate_defaults=generate_defaults, text_cache_size=text_cache_size)
 
     def _supported_languages_set(self) -> Optional[set]:
         langs = getattr(self.model, "get_supported_languages", None)
@@ -266,6 +451,30 @@ class Qwen3TTSModel:
     def _ensure_list(self, x: MaybeList) -> List[Any]:
         return x if isinstance(x, list) else [x]
 
+    def _expand_cancel_tokens(self, cancel_token: MaybeList, batch_size: int) -> Optional[List[Any]]:
+        if cancel_token is None:
+            return None
+        tokens = self._ensure_list(cancel_token)
+        if len(tokens) == 1 and batch_size > 1:
+            tokens = tokens * batch_size
+        if len(tokens) != batch_size:
+            raise ValueError(f"Batch size mismatch: cancel_token={len(tokens)}, text={batch_size}")
+        return tokens
+
+    def _decode_codes(self, codes_list: List[Optional[torch.Tensor]]) -> Tuple[List[Optional[np.ndarray]], int]:
+        """
+        Decode the codec codes of each sample. Cancelled samples (`None` codes) are skipped and decode to `None`.
+        """
+        speech_tokenizer = self.model.speech_tokenizer
+        live = [i for i, codes in enumerate(codes_list) if codes is not None]
+        wavs: List[Optional[np.ndarray]] = [None] * len(codes_list)
+        if not live:
+            return wavs, speech_tokenizer.get_output_sample_rate()
+        decoded, fs = speech_tokenizer.decode([{"audio_codes": codes_list[i]} for i in live])
+        for i, wav in zip(live, decoded):
+            wavs[i] = wav
+        return wavs, fs
+
     def _build_assistant_text(self, text: str) -> str:
         return f"<|im_start|>assistant\n{text}<|im_end|>\n<|im_start|>assistant\n"
 
@@ -276,13 +485,56 @@ class Qwen3TTSModel:
         return f"<|im_start|>user\n{instruct}<|im_end|>\n"
 
     def _tokenize_texts(self, texts: List[str]) -> List[torch.Tensor]:
-        input_ids = []
-        for text in texts:
-            input = self.processor(text=text, return_tensors="pt", padding=True)
-            input_id = input["input_ids"].to(self.device)
-            input_id = input_id.unsqueeze(0) if input_id.dim() == 1 else input_id
-            input_ids.append(input_id)
-        return input_ids
+        """
+        Tokenize all texts with one batched processor call.
+
+        Returns:
+            List[torch.Tensor]: One (1, T_i) id tensor per text, on the model device, without padding.
+        """
+        if not texts:
+            return []
+        encoded = self.processor(text=list(texts), padding=False)
+        return [
+            torch.tensor(ids, dtype=torch.long, device=self.device).unsqueeze(0)
+            for ids in encoded["input_ids"]
+        ]
+
+    def _embed_text_ids(self, input_id: torch.Tensor) -> torch.Tensor:
+        talker = self.model.talker
+        return talker.text_projection(talker.get_text_embeddings()(input_id.to(talker.device)))
+
+    def _tokenize_prompt_texts(
+        self, prompt_texts: List[Optional[str]]
+    ) -> Tuple[List[Optional[torch.Tensor]], List[Optional[torch.Tensor]]]:
+        """
+        Tokenize and embed role-wrapped instruct / reference texts through the prompt cache.
+
+        Entries that are None stay None. Cache misses are tokenized together in one batch.
+
+        Returns:
+            Tuple[List[Optional[torch.Tensor]], List[Optional[torch.Tensor]]]:
+                (ids, projected text embeddings), aligned with `prompt_texts`.
+        """
+        entries: Dict[str, Dict[str, torch.Tensor]] = {}
+        for text in prompt_texts:
+            if text is not None and text not in entries:
+                entry = self._text_prompt_cache.get(text)
+                if entry is not None:
+                    entries[text] = entry
+
+        missing = [t for t in dict.fromkeys(prompt_texts) if t is not None and t not in entries]
+        for text, input_id in zip(missing, self._tokenize_texts(missing)):
+            entry = {"ids": input_id, "embed": self._embed_text_ids(input_id)}
+            self._text_prompt_cache.put(text, entry)
+            entries[text] = entry
+
+        ids = [entries[t]["ids"] if t is not None else None for t in prompt_texts]
+        embeds = [entries[t]["embed"] if t is not None else None for t in prompt_texts]
+        return ids, embeds
+
+    def clear_text_cache(self) -> None:
+        """Drop all cached prompt tokenizations and embeddings."""
+        self._text_prompt_cache.clear()
 
     def _merge_generate_kwargs(
         self,
@@ -476,6 +728,8 @@ class Qwen3TTSModel:
         x_vector_only_mode: Union[bool, List[bool]] = False,
         voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
         non_streaming_mode: bool = False,
+        cancel_token: Optional[MaybeList] = None,
+        decode: bool = True,
         **kwargs,
     ) -> Tuple[List[np.ndarray], int]:
         """
@@ -533,6 +787,13 @@ class Qwen3TTSModel:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
+            cancel_token:
+                Optional cancellation token(s) with an `is_set()` method such as `threading.Event`, one per sample
+                or one for the whole batch. Once set, the sample stops decoding at the next step without affecting
+                the rest of the batch, and `None` is returned in place of its waveform.
+            decode:
+                Whether to decode the codec codes to waveforms. When False, the generated codes are returned in
+                place of the waveforms with a `None` sample rate, e.g. for callers that decode frames themselves.
             **kwargs:
                 Any other keyword arguments supported by HuggingFace Transformers `generate()` can be passed.
                 They will be forwarded to the underlying `Qwen3TTSForConditionalGeneration.generate(...)`.
@@ -589,40 +850,43 @@ class Qwen3TTSModel:
         input_ids = self._tokenize_texts(input_texts)
 
         ref_ids = None
+        ref_embeds = None
         if ref_texts_for_ids is not None:
-            ref_ids = []
-            for i, rt in enumerate(ref_texts_for_ids):
-                if rt is None or rt == "":
-                    ref_ids.append(None)
-                else:
-                    ref_tok = self._tokenize_texts([self._build_ref_text(rt)])[0]
-                    ref_ids.append(ref_tok)
+            ref_ids, ref_embeds = self._tokenize_prompt_texts(
+                [None if rt is None or rt == "" else self._build_ref_text(rt) for rt in ref_texts_for_ids]
+            )
 
+        cancel_tokens = self._expand_cancel_tokens(cancel_token, len(texts))
         gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
         talker_codes_list, _ = self.model.generate(
             input_ids=input_ids,
             ref_ids=ref_ids,
+            ref_embeds=ref_embeds,
             voice_clone_prompt=voice_clone_prompt_dict,
             languages=languages,
             non_streaming_mode=non_streaming_mode,
+            cancel_tokens=cancel_tokens,
             **gen_kwargs,
         )
 
+        if not decode:
+            return talker_codes_list, None
+
         codes_for_decode = []
         for i, codes in enumerate(talker_codes_list):
             ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
-            if ref_code_list is not None and ref_code_list[i] is not None:
+            if codes is not None and ref_code_list is not None and ref_code_list[i] is not None:
                 codes_for_decode.append(torch.cat([ref_code_list[i].to(codes.device), codes], dim=0))
             else:
                 codes_for_decode.append(codes)
 
-        wavs_all, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in codes_for_decode])
+        wavs_all, fs = self._decode_codes(codes_for_decode)
 
         wavs_out: List[np.ndarray] = []
         for i, wav in enumerate(wavs_all):
             ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
-            if ref_code_list is not None and ref_code_list[i] is not None:
+            if wav is not None and ref_code_list is not None and ref_code_list[i] is not None:
                 ref_len = int(ref_code_list[i].shape[0])
                 total_len = int(codes_for_decode[i].shape[0])
                 cut = int(ref_len / max(total_len, 1) * wav.shape[0])
@@ -640,6 +904,8 @@ class Qwen3TTSModel:
         instruct: Union[str, List[str]],
         language: Union[str, List[str]] = None,
         non_streaming_mode: bool = True,
+        cancel_token: Optional[MaybeList] = None,
+        decode: bool = True,
         **kwargs,
     ) -> Tuple[List[np.ndarray], int]:
         """
@@ -675,6 +941,13 @@ class Qwen3TTSModel:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
+            cancel_token:
+                Optional cancellation token(s) with an `is_set()` method such as `threading.Event`, one per sample
+                or one for the whole batch. Once set, the sample stops decoding at the next step without affecting
+                the rest of the batch, and `None` is returned in place of its waveform.
+            decode:
+                Whether to decode the codec codes to waveforms. When False, the generated codes are returned in
+                place of the waveforms with a `None` sample rate, e.g. for callers that decode frames themselves.
             **kwargs:
                 Any other keyword arguments supported by HuggingFace Transformers `generate()` can be passed.
                 They will be forwarded to the underlying `Qwen3TTSForConditionalGeneration.generate(...)`.
@@ -707,25 +980,26 @@ class Qwen3TTSModel:
 
         input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
 
-        instruct_ids: List[Optional[torch.Tensor]] = []
-        for ins in instructs:
-            if ins is None or ins == "":
-                instruct_ids.append(None)
-            else:
-                instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
+        instruct_ids, instruct_embeds = self._tokenize_prompt_texts(
+            [None if ins is None or ins == "" else self._build_instruct_text(ins) for ins in instructs]
+        )
 
+        cancel_tokens = self._expand_cancel_tokens(cancel_token, len(texts))
         gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
         talker_codes_list, _ = self.model.generate(
             input_ids=input_ids,
             instruct_ids=instruct_ids,
+            instruct_embeds=instruct_embeds,
             languages=languages,
             non_streaming_mode=non_streaming_mode,
+            cancel_tokens=cancel_tokens,
             **gen_kwargs,
         )
 
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
-        return wavs, fs
+        if not decode:
+            return talker_codes_list, None
+        return self._decode_codes(talker_codes_list)
 
     # custom voice model
     @torch.no_grad()
@@ -736,6 +1010,8 @@ class Qwen3TTSModel:
         language: Union[str, List[str]] = None,
         instruct: Optional[Union[str, List[str]]] = None,
         non_streaming_mode: bool = True,
+        cancel_token: Optional[MaybeList] = None,
+        decode: bool = True,
         **kwargs,
     ) -> Tuple[List[np.ndarray], int]:
         """
@@ -773,6 +1049,13 @@ class Qwen3TTSModel:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
+            cancel_token:
+                Optional cancellation token(s) with an `is_set()` method such as `threading.Event`, one per sample
+                or one for the whole batch. Once set, the sample stops decoding at the next step without affecting
+                the rest of the batch, and `None` is returned in place of its waveform.
+            decode:
+                Whether to decode the codec codes to waveforms. When False, the generated codes are returned in
+                place of the waveforms with a `None` sample rate, e.g. for callers that decode frames themselves.
             **kwargs:
                 Any other keyword arguments supported by HuggingFace Transformers `generate()` can be passed.
                 They will be forwarded to the underlying `Qwen3TTSForConditionalGeneration.generate(...)`.
@@ -817,27 +1100,113 @@ class Qwen3TTSModel:
 
         input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
 
-        instruct_ids: List[Optional[torch.Tensor]] = []
-        for ins in instructs:
-            if ins is None or ins == "":
-                instruct_ids.append(None)
-            else:
-                instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
+        instruct_ids, instruct_embeds = self._tokenize_prompt_texts(
+            [None if ins is None or ins == "" else self._build_instruct_text(ins) for ins in instructs]
+        )
 
+        cancel_tokens = self._expand_cancel_tokens(cancel_token, len(texts))
         gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
         talker_codes_list, _ = self.model.generate(
             input_ids=input_ids,
             instruct_ids=instruct_ids,
+            instruct_embeds=instruct_embeds,
             languages=languages,
             speakers=speakers,
             non_streaming_mode=non_streaming_mode,
+            cancel_tokens=cancel_tokens,
             **gen_kwargs,
         )
 
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
-        return wavs, fs
+        if not decode:
+            return talker_codes_list, None
+        return self._decode_codes(talker_codes_list)
 
+    def generate_stream(
+        self,
+        mode: str,
+        text: str,
+        chunk_frames: int = 12,
+        left_context_frames: int = 25,
+        cancel_token: Optional[Any] = None,
+        **kwargs,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Synthesize a single text and yield audio chunks while the talker is still decoding.
+
+        Generation runs in a background thread and reports codec frames as they are produced. Every
+        `chunk_frames` frames are decoded together with up to `left_context_frames` preceding frames, and only
+        the new samples are yielded, which matches how the 12Hz tokenizer's `chunked_decode` stitches chunks.
+
+        Args:
+            mode:
+                "custom_voice", "voice_design" or "voice_clone", selecting the matching `generate_*` method.
+            text:
+                Text to synthesize. Streaming handles one sample at a time.
+            chunk_frames:
+                Number of codec frames per yielded chunk (12 frames are one second at 12Hz).
+            left_context_frames:
+                Previously decoded frames fed to the decoder again for continuity at chunk boundaries.
+            cancel_token:
+                Optional cancellation token such as `threading.Event`. Setting it stops decoding and ends the
+                stream. Closing the generator early sets it as well, so an abandoned stream frees the device.
+            **kwargs:
+                Forwarded to the `generate_*` method, e.g. speaker / language / instruct / voice_clone_prompt and
+                sampling parameters.
+
+        Yields:
+            Tuple[np.ndarray, int]:
+                (1-D float32 chunk, sample_rate)
+        """
+        if mode not in ("custom_voice", "voice_design", "voice_clone"):
+            raise ValueError(f"Unknown generation mode: {mode}")
+        if not isinstance(text, str):
+            raise ValueError("generate_stream() synthesizes a single text")
+        speech_tokenizer = self.model.speech_tokenizer
+        if speech_tokenizer.get_model_type() != "qwen3_tts_tokenizer_12hz":
+            raise ValueError("Streaming decode requires the 12Hz speech tokenizer")
+
+        if cancel_token is None:
+            cancel_token = threading.Event()
+        frames: "queue.Queue[Optional[torch.Tensor]]" = queue.Queue()
+        errors: List[BaseException] = []
+
+        def _run():
+            try:
+                # The frames were decoded chunk by chunk as they arrived, so skip the full-length decode
+                getattr(self, f"generate_{mode}")(
+                    text=text, frame_callback=frames.put, cancel_token=cancel_token, decode=False, **kwargs
+                )
+            except BaseException as e:
+                errors.append(e)
+                frames.put(None)
+
+        worker = threading.Thread(target=_run, name="qwen3-tts-stream", daemon=True)
+        worker.start()
+
+        upsample = speech_tokenizer.get_decode_upsample_rate()
+        codes: List[torch.Tensor] = []
+        emitted = 0
+        finished = False
+        try:
+            while not finished:
+                frame = frames.get()
+                if frame is None:
+                    finished = True
+                else:
+                    codes.append(frame[0])
+
+                if len(codes) - emitted >= chunk_frames or (finished and len(codes) > emitted):
+                    start = max(emitted - left_context_frames, 0)
+                    wavs, fs = speech_tokenizer.decode([{"audio_codes": torch.stack(codes[start:])}])
+                    yield wavs[0][(emitted - start) * upsample:], fs
+                    emitted = len(codes)
+        finally:
+            if not finished:
+                cancel_token.set()
+
+        if errors:
+            raise errors[0]
 
     def get_supported_speakers(self) -> Optional[List[str]]:
         """
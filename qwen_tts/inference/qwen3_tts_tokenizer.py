@@ -28,7 +28,6 @@ from transformers import AutoConfig, AutoFeatureExtractor, AutoModel
 
 from ..core import (
     Qwen3TTSTokenizerV1Config,
-    Qwen3TTSTokenizerV1Model,
     Qwen3TTSTokenizerV2Config,
     Qwen3TTSTokenizerV2Model,
 )
@@ -79,11 +78,16 @@ class Qwen3TTSTokenizer:
         inst = cls()
 
         AutoConfig.register("qwen3_tts_tokenizer_25hz", Qwen3TTSTokenizerV1Config)
-        AutoModel.register(Qwen3TTSTokenizerV1Config, Qwen3TTSTokenizerV1Model)
 
         AutoConfig.register("qwen3_tts_tokenizer_12hz", Qwen3TTSTokenizerV2Config)
         AutoModel.register(Qwen3TTSTokenizerV2Config, Qwen3TTSTokenizerV2Model)
 
+        # The 25Hz modeling stack (sox, onnxruntime, whisper encoder) is only imported for V1 checkpoints.
+        if isinstance(AutoConfig.from_pretrained(pretrained_model_name_or_path), Qwen3TTSTokenizerV1Config):
+            from ..core import Qwen3TTSTokenizerV1Model
+
+            AutoModel.register(Qwen3TTSTokenizerV1Config, Qwen3TTSTokenizerV1Model)
+
         inst.feature_extractor = AutoFeatureExtractor.from_pretrained(pretrained_model_name_or_path)
         inst.model = AutoModel.from_pretrained(pretrained_model_name_or_path, **kwargs)
         inst.config = inst.model.config